@@ -5,21 +5,32 @@ import re
 import sys
 import time
 import copy
-import yaml
 import getpass
 import datetime
 import argparse
+
+sys.path.append(os.environ['LICENSE_MONITOR_INSTALL_PATH'])
+from common import common
+
+# Record import time of the modules below, it is reported on startup log.
+IMPORT_TIME_RECORDER = common.ImportTimeRecorder()
+IMPORT_TIME_RECORDER.start()
+
+import yaml
 import qdarkstyle
 
-from PyQt5.QtWidgets import QApplication, QWidget, QMainWindow, QAction, qApp, QTabWidget, QFrame, QGridLayout, QTableWidget, QTableWidgetItem, QPushButton, QLabel, QMessageBox, QLineEdit, QComboBox, QHeaderView, QDateEdit, QFileDialog, QMenu
+from PyQt5.QtWidgets import QApplication, QWidget, QMainWindow, QAction, qApp, QTabWidget, QFrame, QGridLayout, QTableWidget, QTableWidgetItem, QTableView, QPushButton, QLabel, QMessageBox, QLineEdit, QComboBox, QHeaderView, QDateEdit, QFileDialog, QMenu
 from PyQt5.QtGui import QIcon, QBrush, QFont
-from PyQt5.QtCore import Qt, QThread, QDate
+from PyQt5.QtCore import Qt, QThread, QDate, QTimer, QEvent
 
-sys.path.append(os.environ['LICENSE_MONITOR_INSTALL_PATH'])
-from common import common
 from common import common_pyqt5
 from common import common_license
+from common import common_license_record
 from common import common_sqlite3
+from common import common_cost
+from common import common_license_db
+
+ShowMessage = common.load_tool_module('message').ShowMessage
 
 # Import local config file if exists.
 local_config_dir = str(os.environ['HOME']) + '/.licenseMonitor/config'
@@ -31,6 +42,11 @@ if os.path.exists(local_config):
 else:
     from config import config
 
+# License log window imports config too, so it is loaded after config.
+show_license_log_info = common.load_tool_module('show_license_log_info')
+
+IMPORT_TIME_RECORDER.stop()
+
 os.environ['PYTHONUNBUFFERED'] = '1'
 VERSION = 'V1.3.2'
 VERSION_DATE = '2024.10.08'
@@ -65,6 +81,10 @@ def read_args():
                         action='store_true',
                         default=False,
                         help='Enable dark mode on the main interface.')
+    parser.add_argument("--live",
+                        action='store_true',
+                        default=False,
+                        help='Always get license info with lmstat, instead of the license snapshot published by license_sample.')
 
     args = parser.parse_args()
 
@@ -76,14 +96,14 @@ def read_args():
     if args.user and (not args.tab):
         args.tab = 'USAGE'
 
-    return args.feature, args.user, args.tab, args.dark_mode
+    return args.feature, args.user, args.tab, args.dark_mode, args.live
 
 
 class MainWindow(QMainWindow):
     """
     Main window of licenseMonitor.
     """
-    def __init__(self, specified_feature, specified_user, specified_tab, dark_mode):
+    def __init__(self, specified_feature, specified_user, specified_tab, dark_mode, live=False):
         super().__init__()
 
         # Get administrator list, check admin permission.
@@ -100,14 +120,32 @@ class MainWindow(QMainWindow):
 
         # Initialization for class variables.
         self.dark_mode = dark_mode
+        self.live = live
         self.license_dic = {}
+        self.license_record_index = common_license_record.LicenseRecordIndex({})
+        self.feature_trigram_index = common.TrigramIndex()
+        self.product_trigram_index = common.TrigramIndex()
+        self.product_feature_file_mtime = 0
         self.license_dic_second = 0
+        self.license_snapshot_mtime = 0
+        self.license_dic_done_function_list = []
+        self.auto_refresh_timer = None
+        self.auto_refresh_pending = False
+        self.auto_refresh_tab_list = []
+        self.load_thread_list = []
+        self.load_generation_dic = {}
         self.db_dic = {}
+        self.db_file_catalog_dic = {}
+        self.db_catalog_dic = {}
+        self.db_catalog_file_mtime = 0
+        self.query_cache = common.LruCache(int(float(config.query_cache_size) * 1024 * 1024) if hasattr(config, 'query_cache_size') else 200 * 1024 * 1024)
+        self.db_read_max_workers = int(config.db_read_max_workers) if hasattr(config, 'db_read_max_workers') else 8
         self.feature_product_dic = {}
         self.product_feature_dic = {}
         self.project_list = []
         self.project_setting_dic = {}
         self.project_setting_create_second_list = []
+        self.project_resolver = common_cost.ProjectResolver()
         self.feature_record_dic = {}
         self.enable_utilization_detail = False
         self.enable_utilization_product = False
@@ -116,24 +154,30 @@ class MainWindow(QMainWindow):
         self.enable_cost_product = False
         self.enable_cost_log_search = False
 
-        # Instantiate class ShowLicenseLogInfo.
-        self.my_show_license_log_file = ShowLicenseLogInfo()
+        # License log windows (tools/show_license_log_info.py) are shown on current process.
+        self.license_log_window_list = []
 
         # Generate GUI.
         self.init_ui()
 
         # Pre-set feature.
         if specified_feature:
+            self.init_tab(self.feature_tab)
+            self.init_tab(self.expires_tab)
+            self.init_tab(self.usage_tab)
             self.feature_tab_feature_line.setText(specified_feature)
             self.expires_tab_feature_line.setText(specified_feature)
             self.usage_tab_feature_line.setText(specified_feature)
 
             if ('all' in self.administrator_list) or ('ALL' in self.administrator_list) or (USER in self.administrator_list):
+                self.init_tab(self.utilization_tab)
+                self.init_tab(self.cost_tab)
                 self.utilization_tab_feature_line.setText(specified_feature)
                 self.cost_tab_feature_line.setText(specified_feature)
 
         # Pre-set user.
         if specified_user:
+            self.init_tab(self.usage_tab)
             self.usage_tab_user_line.setText(specified_user)
 
         # For pre-set feature or pre-set user, update tab.
@@ -155,41 +199,173 @@ class MainWindow(QMainWindow):
         # For pre-set tab.
         self.switch_tab(specified_tab)
 
-    def get_license_dic(self, force=False):
+    def check_license_dic_expired(self, force=False):
         """
-        Get license_dic based on config/LM_LICENSE_FILE.
+        Not update license_dic repeatedly in config.fresh_interval seconds, return True if license_dic should be updated.
         """
-        # Not update license_dic repeatedly in config.fresh_interval seconds.
         current_second = int(time.time())
 
         if not force:
             if hasattr(config, 'fresh_interval') and config.fresh_interval:
                 if current_second - self.license_dic_second <= int(config.fresh_interval):
-                    return
+                    return False
 
         self.license_dic_second = current_second
 
-        common.bprint('Load license info ...', date_format='%Y-%m-%d %H:%M:%S')
+        return True
 
-        # Print loading license informaiton message with GUI.
-        my_show_message = ShowMessage('Info', 'Loading license info, please wait a moment ...')
-        my_show_message.start()
+    def get_license_dic(self, force=False):
+        """
+        Get license_dic based on config/LM_LICENSE_FILE.
+        """
+        if self.check_license_dic_expired(force):
+            # Print loading license informaiton message with GUI.
+            my_show_message = ShowMessage('Info', 'Loading license info, please wait a moment ...')
+            my_show_message.start()
 
-        # Get self.license_dic.
-        LM_LICENSE_FILE_file = str(os.environ['LICENSE_MONITOR_INSTALL_PATH']) + '/config/LM_LICENSE_FILE'
+            self.set_license_info(self.load_license_info())
 
-        if os.path.exists(LM_LICENSE_FILE_file) and (('all' in self.administrator_list) or ('ALL' in self.administrator_list) or (USER in self.administrator_list)):
-            os.environ['LM_LICENSE_FILE'] = ''
+            # Print loading license informaiton message with GUI. (END)
+            my_show_message.terminate()
 
-            with open(LM_LICENSE_FILE_file, 'r') as LLF:
-                for line in LLF.readlines():
-                    line = line.strip()
+    def update_license_dic(self, done_function):
+        """
+        Load license_dic on background thread if it is expired, then call done_function(get_license_info=False).
+        Return False if license_dic is still fresh (nothing is loaded).
+        """
+        if self.get_load_thread_list('license'):
+            # License info is being loaded, done_function is called after loading.
+            if done_function not in self.license_dic_done_function_list:
+                self.license_dic_done_function_list.append(done_function)
 
-                    if (not re.match(r'^\s*$', line)) and (not re.match(r'^\s*#.*$', line)):
-                        if os.environ['LM_LICENSE_FILE']:
-                            os.environ['LM_LICENSE_FILE'] = str(os.environ['LM_LICENSE_FILE']) + ':' + str(line)
-                        else:
-                            os.environ['LM_LICENSE_FILE'] = str(line)
+            return True
+
+        if not self.check_license_dic_expired():
+            return False
+
+        self.license_dic_done_function_list = [done_function, ]
+        self.start_load_thread('license', 'Loading license info, please wait a moment ...', self.load_license_info, (), self.finish_update_license_dic)
+
+        return True
+
+    def finish_update_license_dic(self, license_info):
+        """
+        Save license info loaded on background thread, then update the tabs which are waiting for it.
+        """
+        self.set_license_info(license_info)
+        done_function_list = self.license_dic_done_function_list
+        self.license_dic_done_function_list = []
+
+        for done_function in done_function_list:
+            done_function(get_license_info=False)
+
+    def start_auto_refresh_timer(self):
+        """
+        Reload license info from license snapshot (published by license_sample) every config.fresh_interval seconds.
+        Auto refresh only reads license snapshot, so it is disabled on live mode or without snapshot (lmstat is not run by idle GUI).
+        """
+        if self.live or (not hasattr(config, 'fresh_interval')) or (not config.fresh_interval) or (not common_license.get_license_snapshot_file(config)):
+            return
+
+        self.auto_refresh_timer = QTimer(self)
+        self.auto_refresh_timer.timeout.connect(self.auto_refresh)
+        self.auto_refresh_timer.start(int(config.fresh_interval) * 1000)
+
+    def auto_refresh(self):
+        """
+        Reload license info on background thread if license snapshot is updated, then refresh the current tab.
+        It is paused while the window is hidden or minimized.
+        """
+        if (not self.isVisible()) or self.isMinimized():
+            self.auto_refresh_pending = True
+            return
+
+        self.auto_refresh_pending = False
+
+        if self.get_load_thread_list('license'):
+            return
+
+        # Nothing to do if license snapshot is not updated since last loading or last auto refresh (the snapshot may be not usable).
+        snapshot_file = common_license.get_license_snapshot_file(config)
+
+        if (not os.path.exists(snapshot_file)) or (os.path.getmtime(snapshot_file) <= max(self.license_dic_second, self.license_snapshot_mtime)):
+            return
+
+        self.license_snapshot_mtime = os.path.getmtime(snapshot_file)
+        self.license_dic_done_function_list = []
+        self.start_load_thread('license', '', self.load_license_info, (True, ), self.finish_auto_refresh)
+
+    def finish_auto_refresh(self, license_info):
+        """
+        Save auto refreshed license info, refresh the current tab, and the other license tabs are refreshed when they are shown.
+        """
+        if license_info is None:
+            # License snapshot is not usable (license_dic_second is kept), the tabs which are waiting for license info load it normally.
+            done_function_list = self.license_dic_done_function_list
+            self.license_dic_done_function_list = []
+
+            for done_function in done_function_list:
+                done_function()
+
+            return
+
+        self.license_dic_second = int(time.time())
+        self.auto_refresh_tab_list = [self.server_tab, self.feature_tab, self.expires_tab, self.usage_tab]
+        self.finish_update_license_dic(license_info)
+        self.refresh_auto_refresh_tab()
+
+    def refresh_auto_refresh_tab(self, index=None):
+        """
+        Refresh the current tab with the latest license info if it is not refreshed since auto refresh.
+        """
+        current_tab = self.main_tab.currentWidget()
+
+        if current_tab not in self.auto_refresh_tab_list:
+            return
+
+        self.auto_refresh_tab_list.remove(current_tab)
+
+        if current_tab == self.server_tab:
+            self.gen_server_tab_table()
+        elif current_tab == self.feature_tab:
+            self.filter_feature_tab_license_feature(get_license_info=False)
+        elif current_tab == self.expires_tab:
+            self.filter_expires_tab_license_feature(get_license_info=False)
+        elif current_tab == self.usage_tab:
+            self.filter_usage_tab_license_feature(get_license_info=False)
+
+    def changeEvent(self, event):
+        """
+        Run the paused auto refresh when the window is restored.
+        """
+        super().changeEvent(event)
+
+        if (event.type() == QEvent.WindowStateChange) and self.auto_refresh_pending and (not self.isMinimized()):
+            self.auto_refresh()
+
+    def showEvent(self, event):
+        """
+        Run the paused auto refresh when the window is shown again.
+        """
+        super().showEvent(event)
+
+        if self.auto_refresh_pending:
+            self.auto_refresh()
+
+    def load_license_info(self, snapshot_only=False, load_thread=None):
+        """
+        Load license info (license_dic and its LicenseRecordIndex), it can run on background thread.
+        With snapshot_only, license info is only loaded from license snapshot, return None if the snapshot is not usable.
+        """
+        common.bprint('Load license info ...', date_format='%Y-%m-%d %H:%M:%S')
+
+        # Get license_dic.
+        LM_LICENSE_FILE_file = str(os.environ['LICENSE_MONITOR_INSTALL_PATH']) + '/config/LM_LICENSE_FILE'
+
+        if os.path.exists(LM_LICENSE_FILE_file) and (('all' in self.administrator_list) or ('ALL' in self.administrator_list) or (USER in self.administrator_list)):
+            license_server_list = common_license.parse_lm_license_file(LM_LICENSE_FILE_file)
+        else:
+            license_server_list = [license_server for license_server in os.environ.get('LM_LICENSE_FILE', '').split(':') if license_server]
 
         if not hasattr(config, 'lmstat_path'):
             config.lmstat_path = ''
@@ -200,15 +376,111 @@ class MainWindow(QMainWindow):
         if not hasattr(config, 'lmstat_bsub_command'):
             config.lmstat_bsub_command = ''
 
-        my_get_license_info = common_license.GetLicenseInfo(lmstat_path=config.lmstat_path, bsub_command=config.lmstat_bsub_command)
-        self.license_dic = my_get_license_info.get_license_info()
+        if not hasattr(config, 'lmstat_max_workers'):
+            config.lmstat_max_workers = 16
 
-        # Print loading license informaiton message with GUI. (END)
-        my_show_message.terminate()
+        if not hasattr(config, 'lmstat_timeout'):
+            config.lmstat_timeout = 60
+
+        # Read license server failure state from license_sample (only license_sample updates it).
+        server_state_file = ''
+
+        if hasattr(config, 'db_path') and config.db_path:
+            server_state_file = str(config.db_path) + '/license_server_state.json'
+
+        # Load license info from license snapshot (published by license_sample) if it is fresh enough.
+        snapshot_file = ''
+        fresh_interval = 0
+
+        if (not self.live) and hasattr(config, 'fresh_interval') and config.fresh_interval:
+            snapshot_file = common_license.get_license_snapshot_file(config)
+            fresh_interval = int(config.fresh_interval)
+
+        my_get_license_info = common_license.GetLicenseInfo(lmstat_path=config.lmstat_path, bsub_command=config.lmstat_bsub_command, license_servers=license_server_list, max_workers=config.lmstat_max_workers, timeout=config.lmstat_timeout, server_state_file=server_state_file, server_state_readonly=True, snapshot_file=snapshot_file, fresh_interval=fresh_interval)
+
+        if snapshot_only:
+            license_dic = my_get_license_info.load_license_snapshot()
+
+            if license_dic is None:
+                common.bprint('License snapshot is missing, out of date or incomplete, skip loading license info.', date_format='%Y-%m-%d %H:%M:%S')
+                return None
+        else:
+            license_dic = my_get_license_info.get_license_info()
+
+        # Keep license info as compact records (integer counts, pre-parsed start time, no raw lmstat lines), they can still be read like license_dic.
+        license_dic = common_license_record.get_license_record_dic(license_dic)
+
+        # Index license records once, FEATURE/EXPIRES/USAGE tabs are filtered with the index.
+        license_record_index = common_license_record.LicenseRecordIndex(license_dic)
+
+        return license_dic, license_record_index
+
+    def set_license_info(self, license_info):
+        """
+        Save license info (from self.load_license_info) into self.license_dic/self.license_record_index.
+        """
+        (self.license_dic, self.license_record_index) = license_info
+
+        # Feature names are fuzzy matched with trigram index, it is shared with feature completers and db feature names.
+        self.feature_trigram_index = self.license_record_index.get_trigram_index('feature')
 
         if not self.license_dic:
             common.bprint('Not find any valid license information.', date_format='%Y-%m-%d %H:%M:%S', level='Warning')
 
+    def start_load_thread(self, name, message, function, args, done_function):
+        """
+        Run function(*args, load_thread=<LoadInfo>) on background thread, then call done_function(result) on GUI thread.
+        The unfinished load with the same name is cancelled, its result is dropped even if it arrives later.
+        """
+        self.cancel_load_thread(name)
+        self.load_generation_dic[name] = self.load_generation_dic.get(name, 0) + 1
+
+        my_load_info = LoadInfo(name, self.load_generation_dic[name], function, args, done_function)
+        my_load_info.finished.connect(self.finish_load_thread)
+        self.load_thread_list.append(my_load_info)
+
+        # Print loading informaiton message with GUI.
+        if message:
+            my_load_info.show_message = ShowMessage('Info', message)
+            my_load_info.show_message.start()
+
+        my_load_info.start()
+
+    def get_load_thread_list(self, name):
+        """
+        Get the running (not cancelled) load threads with specified name.
+        """
+        return [load_thread for load_thread in self.load_thread_list if (load_thread.name == name) and (not load_thread.cancelled)]
+
+    def cancel_load_thread(self, name):
+        """
+        Cancel the running load threads with specified name, they stop as soon as possible and their results are dropped.
+        """
+        for load_thread in self.get_load_thread_list(name):
+            load_thread.cancel()
+
+            if load_thread.show_message:
+                load_thread.show_message.terminate()
+                load_thread.show_message = None
+
+    def finish_load_thread(self):
+        """
+        Post-process finished load thread, only the result of the latest load is used.
+        """
+        load_thread = self.sender()
+        load_thread.wait()
+
+        if load_thread in self.load_thread_list:
+            self.load_thread_list.remove(load_thread)
+
+        if load_thread.show_message:
+            load_thread.show_message.terminate()
+
+        if load_thread.cancelled or (load_thread.generation != self.load_generation_dic.get(load_thread.name)):
+            common.bprint('Drop outdated ' + str(load_thread.name) + ' info.', date_format='%Y-%m-%d %H:%M:%S')
+        elif load_thread.result_ready:
+            load_thread.done_function(load_thread.result)
+
     def get_license_server_list(self, license_dic={}):
         """
         Get all license_server on specified license_dic.
@@ -321,16 +593,20 @@ class MainWindow(QMainWindow):
         self.update_product_feature_info()
         self.product_list = self.get_product_list()
 
-        # Generate the sub-tabs
-        self.gen_server_tab()
-        self.gen_feature_tab()
-        self.gen_expires_tab()
-        self.gen_usage_tab()
+        # Generate the sub-tabs on first activation.
+        self.tab_gen_function_dic = {
+                                     self.server_tab: self.gen_server_tab,
+                                     self.feature_tab: self.gen_feature_tab,
+                                     self.expires_tab: self.gen_expires_tab,
+                                     self.usage_tab: self.gen_usage_tab,
+                                    }
 
         if ('all' in self.administrator_list) or ('ALL' in self.administrator_list) or (USER in self.administrator_list):
-            self.gen_curve_tab()
-            self.gen_utilization_tab()
-            self.gen_cost_tab()
+            self.tab_gen_function_dic[self.curve_tab] = self.gen_curve_tab
+            self.tab_gen_function_dic[self.utilization_tab] = self.gen_utilization_tab
+            self.tab_gen_function_dic[self.cost_tab] = self.gen_cost_tab
+
+        self.main_tab.currentChanged.connect(lambda: self.init_tab(self.main_tab.currentWidget()))
 
         # Show main window
         common_pyqt5.auto_resize(self, 1200, 580)
@@ -341,6 +617,10 @@ class MainWindow(QMainWindow):
         if self.dark_mode:
             self.setStyleSheet(qdarkstyle.load_stylesheet_pyqt5())
 
+        # Refresh license info automatically.
+        self.main_tab.currentChanged.connect(self.refresh_auto_refresh_tab)
+        self.start_auto_refresh_timer()
+
     def switch_tab(self, specified_tab):
         """
         Switch to the specified Tab.
@@ -353,12 +633,24 @@ class MainWindow(QMainWindow):
                   }
 
         if ('all' in self.administrator_list) or ('ALL' in self.administrator_list) or (USER in self.administrator_list):
-            tab_dic['CURVE'] = self.curve_tab,
-            tab_dic['UTILIZATION'] = self.utilization_tab,
-            tab_dic['COST'] = self.cost_tab,
+            tab_dic['CURVE'] = self.curve_tab
+            tab_dic['UTILIZATION'] = self.utilization_tab
+            tab_dic['COST'] = self.cost_tab
 
+        self.init_tab(tab_dic[specified_tab])
         self.main_tab.setCurrentWidget(tab_dic[specified_tab])
 
+    def init_tab(self, tab):
+        """
+        Generate the specified tab if it is not generated yet (tabs are generated on first activation).
+        """
+        if tab in self.tab_gen_function_dic:
+            self.tab_gen_function_dic.pop(tab)()
+
+            # New generated tab already shows the latest license info.
+            if tab in self.auto_refresh_tab_list:
+                self.auto_refresh_tab_list.remove(tab)
+
     def gen_menubar(self):
         """
         Generate menubar.
@@ -462,6 +754,8 @@ class MainWindow(QMainWindow):
         """
         Show detail information for utilization curve on UTILIZATION tab.
         """
+        self.init_tab(self.utilization_tab)
+
         if state:
             self.enable_utilization_detail = True
             self.utilization_tab_begin_date_edit.setDate(QDate.currentDate().addDays(-7))
@@ -489,26 +783,33 @@ class MainWindow(QMainWindow):
 
     def update_product_feature_info(self):
         """
-        Update self.feature_product_dic with config/others/product_feature.yaml.
+        Update self.feature_product_dic with config/others/product_feature.yaml, it is only re-parsed after the file is modified.
         """
         product_feature_file = str(os.environ['LICENSE_MONITOR_INSTALL_PATH']) + '/config/others/product_feature.yaml'
 
-        if os.path.exists(product_feature_file):
+        if os.path.exists(product_feature_file) and (os.path.getmtime(product_feature_file) != self.product_feature_file_mtime):
+            self.product_feature_file_mtime = os.path.getmtime(product_feature_file)
             common.bprint('Parse config/others/product_feature.yaml', date_format='%Y-%m-%d %H:%M:%S')
 
             with open(product_feature_file, 'r') as PFF:
-                self.feature_product_dic = yaml.load(PFF, Loader=yaml.FullLoader)
+                feature_product_dic = yaml.load(PFF, Loader=yaml.FullLoader)
+
+                # Get product_feature_dic based on feature_product_dic.
+                product_feature_dic = {}
 
-                # Get self.product_feature_dic based on self.feature_product_dic.
-                self.product_feature_dic = {}
+                for vendor_daemon in feature_product_dic.keys():
+                    product_feature_dic.setdefault(vendor_daemon, {})
 
-                for vendor_daemon in self.feature_product_dic.keys():
-                    self.product_feature_dic.setdefault(vendor_daemon, {})
+                    for feature in feature_product_dic[vendor_daemon].keys():
+                        for product in feature_product_dic[vendor_daemon][feature]:
+                            product_feature_dic[vendor_daemon].setdefault(product, [])
+                            product_feature_dic[vendor_daemon][product].append(feature)
 
-                    for feature in self.feature_product_dic[vendor_daemon].keys():
-                        for product in self.feature_product_dic[vendor_daemon][feature]:
-                            self.product_feature_dic[vendor_daemon].setdefault(product, [])
-                            self.product_feature_dic[vendor_daemon][product].append(feature)
+                # It may be called by background threads, so save the new info at once.
+                (self.feature_product_dic, self.product_feature_dic) = (feature_product_dic, product_feature_dic)
+
+                # Product names are fuzzy matched with trigram index.
+                self.product_trigram_index = common.TrigramIndex(self.get_product_list())
 
     def get_product_list(self):
         """
@@ -531,11 +832,12 @@ class MainWindow(QMainWindow):
         product_utilization_dic = {}
         specified_license_product = self.utilization_tab_product_line.text().strip()
         self.update_product_feature_info()
+        matched_product_set = self.product_trigram_index.search(specified_license_product)
 
         for vendor_daemon in self.feature_product_dic.keys():
             for feature in self.feature_product_dic[vendor_daemon].keys():
                 for product in self.feature_product_dic[vendor_daemon][feature]:
-                    if ((feature in utilization_dic) and (vendor_daemon in utilization_dic[feature])) and ((not specified_license_product) or (specified_license_product == product) or re.search(re.escape(specified_license_product.lower()), product.lower())):
+                    if ((feature in utilization_dic) and (vendor_daemon in utilization_dic[feature])) and ((not specified_license_product) or (product in matched_product_set)):
                         # Save sample data.
                         product_utilization_dic.setdefault(product, {})
                         product_utilization_dic[product].setdefault(vendor_daemon, {'sample_data': {}, 'summary': {'avg_utilization': 0}})
@@ -546,11 +848,11 @@ class MainWindow(QMainWindow):
                         sample_date_dic = utilization_dic[feature][vendor_daemon]['sample_data']
 
                         if not product_utilization_dic[product][vendor_daemon]['sample_data']:
-                            product_utilization_dic[product][vendor_daemon]['sample_data'] = sample_date_dic
+                            product_utilization_dic[product][vendor_daemon]['sample_data'] = copy.deepcopy(sample_date_dic)
                         else:
                             for sample_date in sample_date_dic.keys():
                                 if sample_date not in product_utilization_dic[product][vendor_daemon]['sample_data'].keys():
-                                    product_utilization_dic[product][vendor_daemon]['sample_data'].setdefault(sample_date, sample_date_dic[sample_date])
+                                    product_utilization_dic[product][vendor_daemon]['sample_data'].setdefault(sample_date, dict(sample_date_dic[sample_date]))
                                 elif product_utilization_dic[product][vendor_daemon]['sample_data'][sample_date]['utilization'] < sample_date_dic[sample_date]['utilization']:
                                     product_utilization_dic[product][vendor_daemon]['sample_data'][sample_date]['utilization'] = sample_date_dic[sample_date]['utilization']
 
@@ -603,11 +905,12 @@ class MainWindow(QMainWindow):
         product_cost_dic = {}
         specified_license_product = self.cost_tab_product_line.text().strip()
         self.update_product_feature_info()
+        matched_product_set = self.product_trigram_index.search(specified_license_product)
 
         for vendor_daemon in self.feature_product_dic.keys():
             for feature in self.feature_product_dic[vendor_daemon].keys():
                 for product in self.feature_product_dic[vendor_daemon][feature]:
-                    if ((feature in cost_dic) and (vendor_daemon in cost_dic[feature])) and ((not specified_license_product) or (specified_license_product == product) or re.search(re.escape(specified_license_product.lower()), product.lower())):
+                    if ((feature in cost_dic) and (vendor_daemon in cost_dic[feature])) and ((not specified_license_product) or (product in matched_product_set)):
                         # Save project_runtime info.
                         product_cost_dic.setdefault(product, {})
                         product_cost_dic[product].setdefault(vendor_daemon, {'project_runtime': {}, 'project_rate': {}, 'total_runtime': 0})
@@ -615,7 +918,7 @@ class MainWindow(QMainWindow):
                         project_dic = cost_dic[feature][vendor_daemon]['project_runtime']
 
                         if not product_cost_dic[product][vendor_daemon]['project_runtime']:
-                            product_cost_dic[product][vendor_daemon]['project_runtime'] = project_dic
+                            product_cost_dic[product][vendor_daemon]['project_runtime'] = dict(project_dic)
                         else:
                             for project in project_dic.keys():
                                 if project not in product_cost_dic[product][vendor_daemon]['project_runtime'].keys():
@@ -674,16 +977,18 @@ class MainWindow(QMainWindow):
         """
         common.bprint('Parse config/project/project_list', date_format='%Y-%m-%d %H:%M:%S')
 
-        self.project_list = []
+        project_list = []
         project_list_file = str(os.environ['LICENSE_MONITOR_INSTALL_PATH']) + '/config/project/project_list'
 
         if os.path.exists(project_list_file):
-            self.project_list = common.parse_project_list_file(str(os.environ['LICENSE_MONITOR_INSTALL_PATH']) + '/config/project/project_list')
+            project_list = common.parse_project_list_file(str(os.environ['LICENSE_MONITOR_INSTALL_PATH']) + '/config/project/project_list')
+
+        if self.enable_cost_others_project and ('others' not in project_list):
+            project_list.append('others')
+        elif (not self.enable_cost_others_project) and ('others' in project_list):
+            project_list.remove('others')
 
-        if self.enable_cost_others_project and ('others' not in self.project_list):
-            self.project_list.append('others')
-        elif (not self.enable_cost_others_project) and ('others' in self.project_list):
-            self.project_list.remove('others')
+        self.project_list = project_list
 
     def func_enable_cost_others_project(self, state):
         """
@@ -778,12 +1083,14 @@ licenseMonitor is an open source software for EDA software license information d
         self.server_tab_table.setColumnWidth(5, 120)
         self.server_tab_table.setColumnWidth(6, 120)
 
-        # Get and update license_dic
-        license_dic = copy.deepcopy(self.license_dic)
+        # Get license_dic, show an empty vendor_daemon for the license server without vendor_daemon.
+        license_dic = {}
+
+        for license_server in self.license_dic.keys():
+            license_dic[license_server] = dict(self.license_dic[license_server].items())
 
-        for license_server in license_dic.keys():
             if not license_dic[license_server]['vendor_daemon']:
-                license_dic[license_server]['vendor_daemon'].setdefault('', {'vendor_daemon_status': '', 'vendor_daemon_version': ''})
+                license_dic[license_server]['vendor_daemon'] = {'': {'vendor_daemon_status': '', 'vendor_daemon_version': ''}}
 
         # Get license_server_list.
         license_server_list = self.get_license_server_list()
@@ -817,7 +1124,14 @@ licenseMonitor is an open source software for EDA software license information d
                 # For Server_Status
                 column += 1
                 item = QTableWidgetItem()
-                item.setText(license_dic[license_server]['license_server_status'])
+
+                if license_dic[license_server].get('stale', False):
+                    stale_time = datetime.datetime.fromtimestamp(license_dic[license_server]['stale_second']).strftime('%Y-%m-%d %H:%M:%S')
+                    item.setText(str(license_dic[license_server]['license_server_status']) + ' (stale)')
+                    item.setToolTip('Failed on getting license info from this license server, the license info is from ' + str(stale_time) + '.')
+                    item.setBackground(QBrush(Qt.yellow))
+                else:
+                    item.setText(license_dic[license_server]['license_server_status'])
 
                 if license_dic[license_server]['license_server_status'] != 'UP':
                     item.setBackground(QBrush(Qt.red))
@@ -884,8 +1198,11 @@ licenseMonitor is an open source software for EDA software license information d
         self.feature_tab_frame.setFrameShadow(QFrame.Raised)
         self.feature_tab_frame.setFrameShape(QFrame.Box)
 
-        self.feature_tab_table = QTableWidget(self.feature_tab)
+        self.feature_tab_table = QTableView(self.feature_tab)
         self.feature_tab_table.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.feature_tab_table_title_list = ['Server', 'Vendor', 'Feature', 'Total_License', 'In_Use_License']
+        self.feature_tab_table_model = common_pyqt5.TableModel(self.feature_tab_table_title_list, font_function_dic={4: self.get_feature_tab_in_use_font})
+        self.feature_tab_table.setModel(self.feature_tab_table_model)
 
         # Grid
         feature_tab_grid = QGridLayout()
@@ -902,14 +1219,18 @@ licenseMonitor is an open source software for EDA software license information d
         self.gen_feature_tab_frame()
         self.gen_feature_tab_table(self.license_dic)
         self.feature_tab_table.customContextMenuRequested.connect(self.generate_feature_menu)
-        self.feature_tab_table.itemClicked.connect(self.feature_tab_table_check_click)
+        self.feature_tab_table.clicked.connect(self.feature_tab_table_check_click)
 
     def generate_feature_menu(self, pos):
         menu = QMenu()
         row = self.feature_tab_table.currentIndex().row()
-        server = self.feature_tab_table.item(row, 0).text().strip()
-        vendor = self.feature_tab_table.item(row, 1).text().strip()
-        feature = self.feature_tab_table.item(row, 2).text().strip()
+
+        if row < 0:
+            return
+
+        server = self.feature_tab_table_model.get_text(row, 0).strip()
+        vendor = self.feature_tab_table_model.get_text(row, 1).strip()
+        feature = self.feature_tab_table_model.get_text(row, 2).strip()
         user = ''
 
         action = QAction('View License Log')
@@ -926,7 +1247,12 @@ licenseMonitor is an open source software for EDA software license information d
             if 'license_files' in self.license_dic[server]:
                 lic_files = self.license_dic[server]['license_files']
 
-        self.my_show_license_log_file.run(server, vendor, feature, user, lic_files)
+        # Forget the closed license log windows.
+        self.license_log_window_list = [license_log_window for license_log_window in self.license_log_window_list if license_log_window.isVisible()]
+
+        license_log_window = show_license_log_info.MainWindow(server, vendor, feature, user, lic_files)
+        license_log_window.show()
+        self.license_log_window_list.append(license_log_window)
 
     def gen_feature_tab_frame(self):
         # Show
@@ -962,7 +1288,7 @@ licenseMonitor is an open source software for EDA software license information d
         self.feature_tab_feature_line = QLineEdit()
         self.feature_tab_feature_line.returnPressed.connect(lambda: self.filter_feature_tab_license_feature())
 
-        feature_tab_feature_line_completer = common_pyqt5.get_completer(self.feature_list)
+        feature_tab_feature_line_completer = common_pyqt5.get_completer(self.feature_list, self.feature_trigram_index)
         self.feature_tab_feature_line.setCompleter(feature_tab_feature_line_completer)
 
         # Filter Button
@@ -1027,9 +1353,9 @@ licenseMonitor is an open source software for EDA software license information d
         Get license feature information based on self.feature_tab_show_combo/self.feature_tab_server_combo/self.feature_tab_vendor_combo/self.feature_tab_feature_line.
         Generate self.feature_tab_table with filetered license feature information.
         """
-        # Re-generate self.feature_tab_table.
-        if get_license_info:
-            self.get_license_dic()
+        # Re-generate self.feature_tab_table, it is re-generated again after license info is loaded on background thread.
+        if get_license_info and self.update_license_dic(self.filter_feature_tab_license_feature):
+            return
 
         if self.license_dic:
             show_mode = self.feature_tab_show_combo.currentText().strip()
@@ -1038,30 +1364,31 @@ licenseMonitor is an open source software for EDA software license information d
             selected_vendor_daemon_dic = self.feature_tab_vendor_combo.selectedItems()
             selected_vendor_daemon_list = list(selected_vendor_daemon_dic.values())
             specified_license_feature_list = self.feature_tab_feature_line.text().strip().split()
-            my_filter_license = common_license.FilterLicenseDic()
-            filtered_license_dic = my_filter_license.run(license_dic=self.license_dic, server_list=selected_license_server_list, vendor_list=selected_vendor_daemon_list, feature_list=specified_license_feature_list, show_mode=show_mode)
+            filtered_license_dic = self.license_record_index.run(server_list=selected_license_server_list, vendor_list=selected_vendor_daemon_list, feature_list=specified_license_feature_list, show_mode=show_mode)
 
             # Update self.feature_tab_table
             self.gen_feature_tab_table(filtered_license_dic)
 
-    def feature_tab_table_check_click(self, item=None):
-        if item is not None:
-            if item.column() == 4:
-                in_use_num = self.feature_tab_table.item(item.row(), item.column()).text().strip()
+    def feature_tab_table_check_click(self, index=None):
+        if (index is not None) and index.isValid():
+            if index.column() == 4:
+                in_use_num = self.feature_tab_table_model.get_text(index.row(), index.column()).strip()
 
                 if in_use_num != '0':
+                    self.init_tab(self.usage_tab)
+
                     # Reset self.usage_tab_server_combo on USAGE tab.
-                    current_license_server = self.feature_tab_table.item(item.row(), 0).text().strip()
+                    current_license_server = self.feature_tab_table_model.get_text(index.row(), 0).strip()
                     self.set_usage_tab_server_combo()
                     self.set_checkbox_combo_item_state(self.usage_tab_server_combo, current_license_server, state=True)
 
                     # Reset self.usage_tab_vendor_combo on USAGE tab.
-                    current_vendor_daemon = self.feature_tab_table.item(item.row(), 1).text().strip()
+                    current_vendor_daemon = self.feature_tab_table_model.get_text(index.row(), 1).strip()
                     self.set_usage_tab_vendor_combo()
                     self.set_checkbox_combo_item_state(self.usage_tab_vendor_combo, current_vendor_daemon, state=True)
 
                     # Reset self.usage_tab_feature_line on USAGE tab.
-                    current_feature = self.feature_tab_table.item(item.row(), 2).text().strip()
+                    current_feature = self.feature_tab_table_model.get_text(index.row(), 2).strip()
                     self.usage_tab_feature_line.setText(current_feature)
 
                     # Clear self.usage_tab_user_line on USAGE tab.
@@ -1072,73 +1399,40 @@ licenseMonitor is an open source software for EDA software license information d
                     self.filter_usage_tab_license_feature()
 
     def gen_feature_tab_table(self, license_dic):
-        # Get license feature num.
-        license_feature_num = 0
+        """
+        Fill self.feature_tab_table_model with license_dic, only the changed rows are applied on refresh, cells are rendered by the model on demand.
+        """
+        row_list = []
 
-        if license_dic:
-            for license_server in license_dic.keys():
-                for vendor_daemon in license_dic[license_server]['vendor_daemon'].keys():
-                    for license_feature in license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'].keys():
-                        license_feature_num += 1
+        for license_server in license_dic.keys():
+            for vendor_daemon in license_dic[license_server]['vendor_daemon'].keys():
+                for (license_feature, feature_dic) in license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'].items():
+                    # Server/Vendor/Feature/Total_License/In_Use_License.
+                    if feature_dic['issued'] == 'Uncounted':
+                        issued = feature_dic['issued']
+                    else:
+                        issued = int(feature_dic['issued'])
 
-        # Fill self.feature_tab_table column.
+                    row_list.append((license_server, vendor_daemon, license_feature, issued, int(feature_dic['in_use'])))
+
+        # Feature rows are matched on Server/Vendor/Feature.
+        self.feature_tab_table_model.update_row_list(row_list, key_column_list=[0, 1, 2])
+
+        # Set self.feature_tab_table column.
         self.feature_tab_table.setShowGrid(True)
         self.feature_tab_table.setSortingEnabled(True)
-        self.feature_tab_table.setColumnCount(0)
-        self.feature_tab_table.setColumnCount(5)
-        self.feature_tab_table_title_list = ['Server', 'Vendor', 'Feature', 'Total_License', 'In_Use_License']
-        self.feature_tab_table.setHorizontalHeaderLabels(self.feature_tab_table_title_list)
-
         self.feature_tab_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
         self.feature_tab_table.setColumnWidth(1, 120)
         self.feature_tab_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
         self.feature_tab_table.setColumnWidth(3, 160)
         self.feature_tab_table.setColumnWidth(4, 160)
 
-        # Fill self.feature_tab_table row.
-        self.feature_tab_table.setRowCount(0)
-        self.feature_tab_table.setRowCount(license_feature_num)
-
-        row = -1
-
-        for license_server in license_dic.keys():
-            for vendor_daemon in license_dic[license_server]['vendor_daemon'].keys():
-                for license_feature in license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'].keys():
-                    row += 1
-
-                    # For Server.
-                    item = QTableWidgetItem()
-                    item.setText(license_server)
-                    self.feature_tab_table.setItem(row, 0, item)
-
-                    # For Vendor.
-                    item = QTableWidgetItem()
-                    item.setText(vendor_daemon)
-                    self.feature_tab_table.setItem(row, 1, item)
-
-                    # For Feature.
-                    item = QTableWidgetItem()
-                    item.setText(license_feature)
-                    self.feature_tab_table.setItem(row, 2, item)
-
-                    # For Total_License.
-                    item = QTableWidgetItem()
-
-                    if self.license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][license_feature]['issued'] == 'Uncounted':
-                        item.setData(Qt.DisplayRole, self.license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][license_feature]['issued'])
-                    else:
-                        item.setData(Qt.DisplayRole, int(self.license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][license_feature]['issued']))
-
-                    self.feature_tab_table.setItem(row, 3, item)
-
-                    # For In_Use_License.
-                    item = QTableWidgetItem()
-                    item.setData(Qt.DisplayRole, int(self.license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][license_feature]['in_use']))
-
-                    if item.text() != '0':
-                        item.setFont(QFont('song', 9, QFont.Bold))
-
-                    self.feature_tab_table.setItem(row, 4, item)
+    def get_feature_tab_in_use_font(self, row_value_list):
+        """
+        In_Use_License is bold if the feature is in use.
+        """
+        if row_value_list[4] != 0:
+            return QFont('song', 9, QFont.Bold)
 # For FEATURE TAB (end) #
 
 # For EXPIRES TAB (start) #
@@ -1150,7 +1444,11 @@ licenseMonitor is an open source software for EDA software license information d
         self.expires_tab_frame.setFrameShadow(QFrame.Raised)
         self.expires_tab_frame.setFrameShape(QFrame.Box)
 
-        self.expires_tab_table = QTableWidget(self.expires_tab)
+        self.expires_tab_table = QTableView(self.expires_tab)
+        self.expires_tab_table_title_list = ['Server', 'Vendor', 'Feature', 'Version', 'License_Num', 'Expires']
+        self.expires_tab_table_model = common_pyqt5.TableModel(self.expires_tab_table_title_list, display_function_dic={5: common_license.switch_expires_date}, foreground_function_dic={5: self.get_expires_tab_expires_foreground})
+        self.expires_tab_table.setModel(self.expires_tab_table_model)
+        self.expires_mark_dic = {}
 
         # Grid
         expires_tab_grid = QGridLayout()
@@ -1201,7 +1499,7 @@ licenseMonitor is an open source software for EDA software license information d
         self.expires_tab_feature_line = QLineEdit()
         self.expires_tab_feature_line.returnPressed.connect(lambda: self.filter_expires_tab_license_feature())
 
-        expires_tab_feature_line_completer = common_pyqt5.get_completer(self.feature_list)
+        expires_tab_feature_line_completer = common_pyqt5.get_completer(self.feature_list, self.feature_trigram_index)
         self.expires_tab_feature_line.setCompleter(expires_tab_feature_line_completer)
 
         # Filter Button
@@ -1267,9 +1565,9 @@ licenseMonitor is an open source software for EDA software license information d
         Get license feature expires information based on self.expires_tab_show_combo/self.expires_tab_server_combo/self.expires_tab_vendor_combo/self.expires_tab_feature_line.
         Generate self.expires_tab_table with filetered license feature information.
         """
-        # Re-generate self.expires_tab_table.
-        if get_license_info:
-            self.get_license_dic()
+        # Re-generate self.expires_tab_table, it is re-generated again after license info is loaded on background thread.
+        if get_license_info and self.update_license_dic(self.filter_expires_tab_license_feature):
+            return
 
         if self.license_dic:
             selected_show_mode = self.expires_tab_show_combo.currentText().strip()
@@ -1278,33 +1576,36 @@ licenseMonitor is an open source software for EDA software license information d
             selected_vendor_daemon_dic = self.expires_tab_vendor_combo.selectedItems()
             selected_vendor_daemon_list = list(selected_vendor_daemon_dic.values())
             specified_license_feature_list = self.expires_tab_feature_line.text().strip().split()
-            my_filter_license = common_license.FilterLicenseDic()
-            filtered_license_dic = my_filter_license.run(license_dic=self.license_dic, server_list=selected_license_server_list, vendor_list=selected_vendor_daemon_list, feature_list=specified_license_feature_list, show_mode=selected_show_mode)
+            filtered_license_dic = self.license_record_index.run(server_list=selected_license_server_list, vendor_list=selected_vendor_daemon_list, feature_list=specified_license_feature_list, show_mode=selected_show_mode)
 
             if (not filtered_license_dic) and specified_license_feature_list:
+                # Search license files on background thread, self.expires_tab_table is updated after searching.
                 common.bprint('Searching expires info from license file ...', date_format='%Y-%m-%d %H:%M:%S')
-                my_show_message = ShowMessage('Info', 'Searching expires info from license file, please wait a moment ...')
-                my_show_message.start()
-                filtered_license_dic = self.search_expire_info_from_license_file(selected_show_mode, selected_license_server_list, selected_vendor_daemon_list, specified_license_feature_list)
-                my_show_message.terminate()
+                self.start_load_thread('expires', 'Searching expires info from license file, please wait a moment ...', self.search_expire_info_from_license_file, (selected_show_mode, selected_license_server_list, selected_vendor_daemon_list, specified_license_feature_list), self.gen_expires_tab_table)
+            else:
+                self.cancel_load_thread('expires')
 
-            # Update self.expires_tab_table
-            self.gen_expires_tab_table(filtered_license_dic)
+                # Update self.expires_tab_table
+                self.gen_expires_tab_table(filtered_license_dic)
 
-    def search_expire_info_from_license_file(self, selected_show_mode, selected_license_server_list, selected_vendor_daemon_list, specified_license_feature_list):
+    def search_expire_info_from_license_file(self, selected_show_mode, selected_license_server_list, selected_vendor_daemon_list, specified_license_feature_list, load_thread=None):
         """
-        Search license feature expires information from license file.
+        Search license feature expires information from license file, it can run on background thread.
         """
         filtered_license_dic = {}
         license_dic = {}
+        all_license_dic = self.license_dic
 
-        for license_server in self.license_dic.keys():
+        for license_server in all_license_dic.keys():
             if ('ALL' in selected_license_server_list) or (license_server in selected_license_server_list):
-                for vendor_daemon in self.license_dic[license_server]['vendor_daemon'].keys():
+                for vendor_daemon in all_license_dic[license_server]['vendor_daemon'].keys():
                     if ('ALL' in selected_vendor_daemon_list) or (vendor_daemon in selected_vendor_daemon_list):
-                        license_files = self.license_dic[license_server]['license_files']
+                        license_files = all_license_dic[license_server]['license_files']
 
                         for license_file in license_files.split():
+                            if load_thread and load_thread.cancelled:
+                                return {}
+
                             for specified_feature in specified_license_feature_list:
                                 grep_command = 'grep \' ' + str(specified_feature) + ' \' ' + str(license_file)
 
@@ -1325,8 +1626,8 @@ licenseMonitor is an open source software for EDA software license information d
                                         license_num = my_match.group(6)
 
                                         if feature == specified_feature:
-                                            license_dic.setdefault(license_server, {'license_files': license_files, 'license_server_status': self.license_dic[license_server]['license_server_status'], 'license_server_version': self.license_dic[license_server]['license_server_version'], 'vendor_daemon': {}})
-                                            license_dic[license_server]['vendor_daemon'].setdefault(vendor_daemon, {'vendor_daemon_status': self.license_dic[license_server]['vendor_daemon'][vendor_daemon]['vendor_daemon_status'], 'vendor_daemon_version': self.license_dic[license_server]['vendor_daemon'][vendor_daemon]['vendor_daemon_version'], 'feature': {}, 'expires': {}})
+                                            license_dic.setdefault(license_server, {'license_files': license_files, 'license_server_status': all_license_dic[license_server]['license_server_status'], 'license_server_version': all_license_dic[license_server]['license_server_version'], 'vendor_daemon': {}})
+                                            license_dic[license_server]['vendor_daemon'].setdefault(vendor_daemon, {'vendor_daemon_status': all_license_dic[license_server]['vendor_daemon'][vendor_daemon]['vendor_daemon_status'], 'vendor_daemon_version': all_license_dic[license_server]['vendor_daemon'][vendor_daemon]['vendor_daemon_version'], 'feature': {}, 'expires': {}})
                                             license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'].setdefault(feature, {})
                                             license_dic[license_server]['vendor_daemon'][vendor_daemon]['expires'].setdefault(feature, [])
                                             license_dic[license_server]['vendor_daemon'][vendor_daemon]['expires'][feature].append({'version': version, 'license': license_num, 'vendor': vendor, 'expires': expire_info})
@@ -1341,24 +1642,27 @@ licenseMonitor is an open source software for EDA software license information d
         return filtered_license_dic
 
     def gen_expires_tab_table(self, license_dic):
-        # Get license expires num.
-        license_feature_num = 0
+        """
+        Fill self.expires_tab_table_model with license_dic, only the changed rows are applied on refresh, cells are rendered by the model on demand.
+        """
+        row_list = []
 
-        if license_dic:
-            for license_server in license_dic.keys():
-                for vendor_daemon in license_dic[license_server]['vendor_daemon'].keys():
-                    for license_feature in license_dic[license_server]['vendor_daemon'][vendor_daemon]['expires'].keys():
-                        for expires_dic in license_dic[license_server]['vendor_daemon'][vendor_daemon]['expires'][license_feature]:
-                            license_feature_num += 1
+        for license_server in license_dic.keys():
+            for vendor_daemon in license_dic[license_server]['vendor_daemon'].keys():
+                for license_feature in license_dic[license_server]['vendor_daemon'][vendor_daemon]['expires'].keys():
+                    for expires_dic in license_dic[license_server]['vendor_daemon'][vendor_daemon]['expires'][license_feature]:
+                        # Server/Vendor/Feature/Version/License_Num/Expires.
+                        row_list.append((license_server, expires_dic['vendor'], license_feature, expires_dic['version'], int(expires_dic['license']), expires_dic['expires']))
+
+        # Expires mark is counted again when it is shown.
+        self.expires_mark_dic = {}
+
+        # Expires rows are matched on all columns except License_Num.
+        self.expires_tab_table_model.update_row_list(row_list, key_column_list=[0, 1, 2, 3, 5])
 
-        # Fill self.expires_tab_table column.
+        # Set self.expires_tab_table column.
         self.expires_tab_table.setShowGrid(True)
         self.expires_tab_table.setSortingEnabled(True)
-        self.expires_tab_table.setColumnCount(0)
-        self.expires_tab_table.setColumnCount(6)
-        self.expires_tab_table_title_list = ['Server', 'Vendor', 'Feature', 'Version', 'License_Num', 'Expires']
-        self.expires_tab_table.setHorizontalHeaderLabels(self.expires_tab_table_title_list)
-
         self.expires_tab_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
         self.expires_tab_table.setColumnWidth(1, 100)
         self.expires_tab_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
@@ -1366,66 +1670,31 @@ licenseMonitor is an open source software for EDA software license information d
         self.expires_tab_table.setColumnWidth(4, 120)
         self.expires_tab_table.horizontalHeader().setSectionResizeMode(5, QHeaderView.Stretch)
 
-        # Fill self.expires_tab_table row.
-        self.expires_tab_table.setRowCount(0)
-        self.expires_tab_table.setRowCount(license_feature_num)
-
-        row = -1
+    def get_expires_tab_expires_foreground(self, row_value_list):
+        """
+        Expires is gray if it is expired, red if it expires in 14 days.
+        """
+        expires = row_value_list[5]
 
-        for license_server in license_dic.keys():
-            for vendor_daemon in license_dic[license_server]['vendor_daemon'].keys():
-                for license_feature in license_dic[license_server]['vendor_daemon'][vendor_daemon]['expires'].keys():
-                    for expires_dic in license_dic[license_server]['vendor_daemon'][vendor_daemon]['expires'][license_feature]:
-                        row += 1
-
-                        # For Server.
-                        item = QTableWidgetItem()
-                        item.setText(license_server)
-                        self.expires_tab_table.setItem(row, 0, item)
-
-                        # For Vendor.
-                        item = QTableWidgetItem()
-                        item.setText(expires_dic['vendor'])
-                        self.expires_tab_table.setItem(row, 1, item)
-
-                        # For Feature.
-                        item = QTableWidgetItem()
-                        item.setText(license_feature)
-                        self.expires_tab_table.setItem(row, 2, item)
-
-                        # For Version.
-                        item = QTableWidgetItem()
-                        item.setText(expires_dic['version'])
-                        self.expires_tab_table.setItem(row, 3, item)
-
-                        # For Feature Number.
-                        item = QTableWidgetItem()
-                        item.setData(Qt.DisplayRole, int(expires_dic['license']))
-                        self.expires_tab_table.setItem(row, 4, item)
-
-                        # For Expires Date.
-                        item = QTableWidgetItem()
-                        expires_date = common_license.switch_expires_date(expires_dic['expires'])
-                        item.setText(expires_date)
-
-                        expires_mark = common_license.check_expire_date(expires_dic['expires'])
-
-                        if expires_mark == 0:
-                            pass
-                        elif expires_mark == -1:
-                            item.setForeground(QBrush(Qt.gray))
-                        else:
-                            item.setForeground(QBrush(Qt.red))
+        if expires not in self.expires_mark_dic:
+            self.expires_mark_dic[expires] = common_license.check_expire_date(expires)
 
-                        self.expires_tab_table.setItem(row, 5, item)
+        if self.expires_mark_dic[expires] == -1:
+            return QBrush(Qt.gray)
+        elif self.expires_mark_dic[expires] != 0:
+            return QBrush(Qt.red)
 
     def generate_usage_menu(self, pos):
         menu = QMenu()
         row = self.usage_tab_table.currentIndex().row()
-        server = self.usage_tab_table.item(row, 0).text().strip()
-        vendor = self.usage_tab_table.item(row, 1).text().strip()
-        feature = self.usage_tab_table.item(row, 2).text().strip()
-        user = self.usage_tab_table.item(row, 3).text().strip()
+
+        if row < 0:
+            return
+
+        server = self.usage_tab_table_model.get_text(row, 0).strip()
+        vendor = self.usage_tab_table_model.get_text(row, 1).strip()
+        feature = self.usage_tab_table_model.get_text(row, 2).strip()
+        user = self.usage_tab_table_model.get_text(row, 3).strip()
 
         action = QAction('View License Log')
         action.triggered.connect(lambda: self.gen_license_log_window(server=server, vendor=vendor, feature=feature, user=user))
@@ -1444,7 +1713,11 @@ licenseMonitor is an open source software for EDA software license information d
         self.usage_tab_frame.setFrameShadow(QFrame.Raised)
         self.usage_tab_frame.setFrameShape(QFrame.Box)
 
-        self.usage_tab_table = QTableWidget(self.usage_tab)
+        self.usage_tab_table = QTableView(self.usage_tab)
+        self.usage_tab_table_title_list = ['Server', 'Vendor', 'Feature', 'User', 'Submit_Host', 'Execute_Host', 'Num', 'Version', 'Start_Time']
+        self.usage_tab_table_model = common_pyqt5.TableModel(self.usage_tab_table_title_list, display_function_dic={8: self.get_usage_tab_start_time}, foreground_function_dic={8: self.get_usage_tab_start_time_foreground})
+        self.usage_tab_table.setModel(self.usage_tab_table_model)
+        self.start_time_dic = {}
 
         # Grid
         usage_tab_grid = QGridLayout()
@@ -1488,7 +1761,7 @@ licenseMonitor is an open source software for EDA software license information d
         self.usage_tab_feature_line = QLineEdit()
         self.usage_tab_feature_line.returnPressed.connect(lambda: self.filter_usage_tab_license_feature())
 
-        usage_tab_feature_line_completer = common_pyqt5.get_completer(self.feature_list)
+        usage_tab_feature_line_completer = common_pyqt5.get_completer(self.feature_list, self.feature_trigram_index)
         self.usage_tab_feature_line.setCompleter(usage_tab_feature_line_completer)
 
         # Submit Host
@@ -1617,9 +1890,9 @@ licenseMonitor is an open source software for EDA software license information d
         Get license feature information based on self.usage_tab_server_combo/self.usage_tab_vendor_combo/self.usage_tab_feature_line/self.usage_tab_user_line.
         Generate self.usage_tab_table with filetered license feature information.
         """
-        # Re-generate self.usage_tab_table.
-        if get_license_info:
-            self.get_license_dic()
+        # Re-generate self.usage_tab_table, it is re-generated again after license info is loaded on background thread.
+        if get_license_info and self.update_license_dic(self.filter_usage_tab_license_feature):
+            return
 
         if self.license_dic:
             show_mode = 'IN_USE'
@@ -1631,31 +1904,33 @@ licenseMonitor is an open source software for EDA software license information d
             selected_submit_host = self.usage_tab_submit_host_combo.currentText().strip()
             selected_execute_host = self.usage_tab_execute_host_combo.currentText().strip()
             specified_user_list = self.usage_tab_user_line.text().strip().split()
-            filter_license_dic = common_license.FilterLicenseDic()
-            filtered_license_dic = filter_license_dic.run(license_dic=self.license_dic, server_list=selected_license_server_list, vendor_list=selected_vendor_daemon_list, feature_list=specified_license_feature_list, submit_host_list=[selected_submit_host, ], execute_host_list=[selected_execute_host, ], user_list=specified_user_list, show_mode=show_mode)
+            filtered_license_dic = self.license_record_index.run(server_list=selected_license_server_list, vendor_list=selected_vendor_daemon_list, feature_list=specified_license_feature_list, submit_host_list=[selected_submit_host, ], execute_host_list=[selected_execute_host, ], user_list=specified_user_list, show_mode=show_mode)
 
             # Update self.usage_tab_table
             self.gen_usage_tab_table(license_dic=filtered_license_dic)
 
     def gen_usage_tab_table(self, license_dic):
-        # Get license usage num.
-        license_usage_num = 0
+        """
+        Fill self.usage_tab_table_model with license_dic, only the changed rows are applied on refresh, cells are rendered by the model on demand.
+        """
+        row_list = []
 
-        if license_dic:
-            for license_server in license_dic.keys():
-                for vendor_daemon in license_dic[license_server]['vendor_daemon'].keys():
-                    for license_feature in license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'].keys():
-                        for usage_dic in license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][license_feature]['in_use_info']:
-                            license_usage_num += 1
+        for license_server in license_dic.keys():
+            for vendor_daemon in license_dic[license_server]['vendor_daemon'].keys():
+                for license_feature in license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'].keys():
+                    for usage_dic in license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][license_feature]['in_use_info']:
+                        # Server/Vendor/Feature/User/Submit_Host/Execute_Host/Num/Version/Start_Time.
+                        row_list.append((license_server, vendor_daemon, license_feature, usage_dic['user'], usage_dic['submit_host'], usage_dic['execute_host'], int(usage_dic['license_num']), usage_dic['version'], usage_dic['start_time']))
 
-        # Fill self.usage_tab_table column.
+        # Start time info is counted again when it is shown.
+        self.start_time_dic = {}
+
+        # Usage rows are matched on all columns except Num.
+        self.usage_tab_table_model.update_row_list(row_list, key_column_list=[0, 1, 2, 3, 4, 5, 7, 8])
+
+        # Set self.usage_tab_table column.
         self.usage_tab_table.setShowGrid(True)
         self.usage_tab_table.setSortingEnabled(True)
-        self.usage_tab_table.setColumnCount(0)
-        self.usage_tab_table.setColumnCount(9)
-        self.usage_tab_table_title_list = ['Server', 'Vendor', 'Feature', 'User', 'Submit_Host', 'Execute_Host', 'Num', 'Version', 'Start_Time']
-        self.usage_tab_table.setHorizontalHeaderLabels(self.usage_tab_table_title_list)
-
         self.usage_tab_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
         self.usage_tab_table.setColumnWidth(1, 85)
         self.usage_tab_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
@@ -1666,67 +1941,24 @@ licenseMonitor is an open source software for EDA software license information d
         self.usage_tab_table.setColumnWidth(7, 85)
         self.usage_tab_table.setColumnWidth(8, 135)
 
-        # Fill self.usage_tab_table row.
-        self.usage_tab_table.setRowCount(0)
-        self.usage_tab_table.setRowCount(license_usage_num)
+    def get_start_time_info(self, start_time):
+        """
+        Get (Start_Time text, long runtime or not) of lmstat start_time, it is counted once for every start_time.
+        """
+        if start_time not in self.start_time_dic:
+            self.start_time_dic[start_time] = (common_license.switch_start_time(start_time, format='%Y-%m-%d %H:%M'), common_license.check_long_runtime(start_time))
 
-        row = -1
+        return self.start_time_dic[start_time]
 
-        for license_server in license_dic.keys():
-            for vendor_daemon in license_dic[license_server]['vendor_daemon'].keys():
-                for license_feature in license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'].keys():
-                    for usage_dic in license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][license_feature]['in_use_info']:
-                        row += 1
-
-                        # For Server.
-                        item = QTableWidgetItem()
-                        item.setText(license_server)
-                        self.usage_tab_table.setItem(row, 0, item)
-
-                        # For Vendor.
-                        item = QTableWidgetItem()
-                        item.setText(vendor_daemon)
-                        self.usage_tab_table.setItem(row, 1, item)
-
-                        # For Feature.
-                        item = QTableWidgetItem()
-                        item.setText(license_feature)
-                        self.usage_tab_table.setItem(row, 2, item)
-
-                        # For User.
-                        item = QTableWidgetItem()
-                        item.setText(usage_dic['user'])
-                        self.usage_tab_table.setItem(row, 3, item)
-
-                        # For Submit_Host.
-                        item = QTableWidgetItem()
-                        item.setText(usage_dic['submit_host'])
-                        self.usage_tab_table.setItem(row, 4, item)
-
-                        # For Execute_Host.
-                        item = QTableWidgetItem()
-                        item.setText(usage_dic['execute_host'])
-                        self.usage_tab_table.setItem(row, 5, item)
-
-                        # For License_Num.
-                        item = QTableWidgetItem()
-                        item.setData(Qt.DisplayRole, int(usage_dic['license_num']))
-                        self.usage_tab_table.setItem(row, 6, item)
-
-                        # For License_Version.
-                        item = QTableWidgetItem()
-                        item.setText(usage_dic['version'])
-                        self.usage_tab_table.setItem(row, 7, item)
-
-                        # For Start_Time.
-                        item = QTableWidgetItem()
-                        start_time = common_license.switch_start_time(usage_dic['start_time'], format='%Y-%m-%d %H:%M')
-                        item.setText(start_time)
-
-                        if common_license.check_long_runtime(usage_dic['start_time']):
-                            item.setForeground(QBrush(Qt.red))
-
-                        self.usage_tab_table.setItem(row, 8, item)
+    def get_usage_tab_start_time(self, start_time):
+        return self.get_start_time_info(start_time)[0]
+
+    def get_usage_tab_start_time_foreground(self, row_value_list):
+        """
+        Start_Time is red if the license is used for a long time.
+        """
+        if self.get_start_time_info(row_value_list[8])[1]:
+            return QBrush(Qt.red)
 # For USAGE TAB (end) #
 
 # For CURVE TAB (start) #
@@ -1790,8 +2022,9 @@ licenseMonitor is an open source software for EDA software license information d
 
         self.curve_tab_feature_line = QLineEdit()
         self.curve_tab_feature_line.returnPressed.connect(self.filter_curve_tab)
+        self.curve_tab_feature_line.textChanged.connect(lambda: self.cancel_load_thread('curve'))
 
-        curve_tab_feature_line_completer = common_pyqt5.get_completer(self.feature_list)
+        curve_tab_feature_line_completer = common_pyqt5.get_completer(self.feature_list, self.feature_trigram_index)
         self.curve_tab_feature_line.setCompleter(curve_tab_feature_line_completer)
 
         # Check button
@@ -1809,6 +2042,7 @@ licenseMonitor is an open source software for EDA software license information d
         self.curve_tab_begin_date_edit.setMinimumDate(QDate.currentDate().addDays(-3652))
         self.curve_tab_begin_date_edit.setCalendarPopup(True)
         self.curve_tab_begin_date_edit.setDate(QDate.currentDate().addDays(-7))
+        self.curve_tab_begin_date_edit.dateChanged.connect(lambda: self.cancel_load_thread('curve'))
 
         # End_Date
         curve_tab_end_date_label = QLabel('End_Date', self.curve_tab_frame0)
@@ -1820,6 +2054,7 @@ licenseMonitor is an open source software for EDA software license information d
         self.curve_tab_end_date_edit.setMinimumDate(QDate.currentDate().addDays(-3652))
         self.curve_tab_end_date_edit.setCalendarPopup(True)
         self.curve_tab_end_date_edit.setDate(QDate.currentDate())
+        self.curve_tab_end_date_edit.dateChanged.connect(lambda: self.cancel_load_thread('curve'))
 
         # Empty label
         curve_tab_empty_label = QLabel('', self.curve_tab_frame0)
@@ -1877,19 +2112,37 @@ licenseMonitor is an open source software for EDA software license information d
 
     def filter_curve_tab(self):
         """
-        Update self.curve_tab_table and self.curve_tab_frame1.
+        Load curve info on background thread, then update self.curve_tab_table and self.curve_tab_frame1.
         """
-        curve_dic = self.get_curve_info()
+        self.start_load_thread('curve', 'Loading curve info, please wait a moment ...', self.get_curve_info, (self.get_curve_filter_dic(), ), self.update_curve_tab)
 
+    def update_curve_tab(self, curve_dic):
+        """
+        Update self.curve_tab_table and self.curve_tab_frame1 with curve_dic.
+        """
         self.gen_curve_tab_table(curve_dic)
         self.update_curve_tab_frame1(curve_dic)
 
+    def get_curve_filter_dic(self):
+        """
+        Get curve filter settings from CURVE tab widgets, they cannot be read on background thread.
+        """
+        curve_filter_dic = {'begin_date': self.curve_tab_begin_date_edit.date().toString(Qt.ISODate),
+                            'end_date': self.curve_tab_end_date_edit.date().toString(Qt.ISODate),
+                            'license_server_list': list(self.curve_tab_server_combo.selectedItems().values()),
+                            'vendor_daemon_list': list(self.curve_tab_vendor_combo.selectedItems().values()),
+                            'license_feature': self.curve_tab_feature_line.text().strip()}
+
+        return curve_filter_dic
+
     def update_db_info(self):
         """
         Get curve/utilization/usage database information.
+        It is got from config.db_path/db_catalog.json (maintained by license_sample), only the changed directories are scanned again.
         """
         common.bprint('Parse config.db_path', date_format='%Y-%m-%d %H:%M:%S')
-        self.db_dic = {}
+        db_dic = {}
+        db_file_catalog_dic = {}
 
         if hasattr(config, 'db_path') and config.db_path and os.path.exists(config.db_path):
             license_server_db_path = str(config.db_path) + '/license_server'
@@ -1897,139 +2150,218 @@ licenseMonitor is an open source software for EDA software license information d
             if not os.path.exists(license_server_db_path):
                 common.bprint('"' + str(license_server_db_path) + '": No such directory.', date_format='%Y-%m-%d %H:%M:%S', level='Warning')
             else:
-                for license_server in os.listdir(license_server_db_path):
-                    license_server_path = str(license_server_db_path) + '/' + str(license_server)
+                # Reload db catalog only if license_sample updates it.
+                db_catalog_file_mtime = common_license_db.get_path_mtime(common_license_db.get_db_catalog_file(config.db_path))
+
+                if db_catalog_file_mtime != self.db_catalog_file_mtime:
+                    self.db_catalog_dic = common_license_db.load_db_catalog(config.db_path)
+                    self.db_catalog_file_mtime = db_catalog_file_mtime
+
+                self.db_catalog_dic = common_license_db.revalidate_db_catalog(config.db_path, self.db_catalog_dic, scan_db=False, db_layout=common_license_db.get_db_layout(config))
+
+                for (license_server, license_server_dic) in self.db_catalog_dic['license_server'].items():
+                    db_dic.setdefault(license_server, {})
+
+                    for (vendor_daemon, vendor_daemon_dic) in license_server_dic['vendor_daemon'].items():
+                        db_dic[license_server].setdefault(vendor_daemon, {})
+                        db_kind_dic = {'curve': 'utilization', 'usage': 'usage', 'cost_day': 'cost_day'}
+
+                        if self.enable_utilization_detail:
+                            db_kind_dic['utilization'] = 'utilization'
+                        else:
+                            db_kind_dic['utilization'] = 'utilization_day'
+
+                        for (key, db_kind) in db_kind_dic.items():
+                            if db_kind in vendor_daemon_dic['db_file']:
+                                db_dic[license_server][vendor_daemon].setdefault(key, vendor_daemon_dic['db_file'][db_kind]['file'])
+                                db_file_catalog_dic[vendor_daemon_dic['db_file'][db_kind]['file']] = vendor_daemon_dic['db_file'][db_kind]
+
+        self.db_dic = db_dic
+        self.db_file_catalog_dic = db_file_catalog_dic
+
+    def is_db_file_in_range(self, db_file, begin_second, end_second=None):
+        """
+        Check with db catalog whether db_file may have samples in [begin_second, end_second], so the db files out of range need not be opened.
+        """
+        return common_license_db.is_db_file_in_range(self.db_file_catalog_dic.get(db_file, {}), begin_second, end_second)
 
-                    if re.match(r'^\d+@\S+$', license_server) and os.path.isdir(license_server_path):
-                        self.db_dic.setdefault(license_server, {})
+    def get_query_cache_key(self, tab_name, filter_dic, db_kind_list, config_file_list=[]):
+        """
+        Get self.query_cache key for tab_name query with filter_dic.
+        The key contains the modify time of the related database files and config files, so the cached result is not used after they are updated.
+        """
+        filter_item_list = []
+
+        for (key, value) in sorted(filter_dic.items()):
+            if isinstance(value, list):
+                value = tuple(value)
+
+            filter_item_list.append((key, value))
+
+        enable_item_list = [(key, value) for (key, value) in sorted(vars(self).items()) if key.startswith('enable_') and isinstance(value, bool)]
+        file_list = []
+
+        for license_server in sorted(self.db_dic.keys()):
+            if ('ALL' in filter_dic['license_server_list']) or (license_server in filter_dic['license_server_list']):
+                for vendor_daemon in sorted(self.db_dic[license_server].keys()):
+                    if ('ALL' in filter_dic['vendor_daemon_list']) or (vendor_daemon in filter_dic['vendor_daemon_list']):
+                        for db_kind in db_kind_list:
+                            if db_kind in self.db_dic[license_server][vendor_daemon]:
+                                file_list.append(self.db_dic[license_server][vendor_daemon][db_kind])
 
-                        for vendor_daemon in os.listdir(license_server_path):
-                            vendor_daemon_path = str(license_server_path) + '/' + str(vendor_daemon)
-                            curve_db_path = str(vendor_daemon_path) + '/utilization.db'
-                            usage_db_path = str(vendor_daemon_path) + '/usage.db'
+        file_list.extend(config_file_list)
+        file_mtime_list = []
 
-                            if self.enable_utilization_detail:
-                                utilization_db_path = str(vendor_daemon_path) + '/utilization.db'
-                            else:
-                                utilization_db_path = str(vendor_daemon_path) + '/utilization_day.db'
+        for file in file_list:
+            try:
+                file_mtime_list.append((file, os.stat(file).st_mtime_ns))
+            except OSError:
+                file_mtime_list.append((file, 0))
 
-                            if os.path.isdir(vendor_daemon_path):
-                                self.db_dic[license_server].setdefault(vendor_daemon, {})
+        return (tab_name, tuple(filter_item_list), tuple(enable_item_list), tuple(file_mtime_list))
 
-                                if os.path.exists(curve_db_path):
-                                    self.db_dic[license_server][vendor_daemon].setdefault('curve', curve_db_path)
+    def get_query_config_file_list(self, tab_name):
+        """
+        Get the config files which affect tab_name (utilization/cost) query result.
+        """
+        install_path = str(os.environ['LICENSE_MONITOR_INSTALL_PATH'])
+        config_file_list = [install_path + '/config/others/product_feature.yaml', install_path + '/config/others/feature_record_on_license_log.yaml']
+
+        for filter_type in ['white', 'black']:
+            config_file_list.append(install_path + '/config/' + str(tab_name) + '/' + str(tab_name) + '_' + str(filter_type) + '_feature')
 
-                                if os.path.exists(usage_db_path):
-                                    self.db_dic[license_server][vendor_daemon].setdefault('usage', usage_db_path)
+        if tab_name == 'cost':
+            config_file_list.append(install_path + '/config/project/project_list')
+            project_setting_db_path = str(config.db_path) + '/project_setting'
 
-                                if os.path.exists(utilization_db_path):
-                                    self.db_dic[license_server][vendor_daemon].setdefault('utilization', utilization_db_path)
+            if os.path.isdir(project_setting_db_path):
+                for (dir_path, dir_name_list, file_name_list) in sorted(os.walk(project_setting_db_path)):
+                    config_file_list.extend(sorted(str(dir_path) + '/' + str(file_name) for file_name in file_name_list))
 
-    def get_curve_info(self):
+        return config_file_list
+
+    def read_db_feature_data(self, db_file, db_kind, filter_feature_list_function, key_list, select_condition, load_thread=None):
         """
-        Get curve information from config.db_path/license_server/<license_server>/<vendor_deamon>/usage.db.
+        Read specified feature data from db_file with readonly connection, it runs on db reader threads (common_license_db.read_db_files).
+        filter_feature_list_function gets the specified features from all of the features on db_file.
+        Return [(feature, data_dic), ...], the features without data are not included.
+        """
+        feature_data_list = []
+
+        if load_thread and load_thread.cancelled:
+            return feature_data_list
+
+        (db_file_connect_result, db_conn) = common_sqlite3.connect_db_file(db_file, mode='readonly')
+
+        if db_file_connect_result == 'failed':
+            common.bprint('Failed on connecting ' + str(db_kind) + ' database file "' + str(db_file) + '".', date_format='%Y-%m-%d %H:%M:%S', level='Warning')
+            return feature_data_list
+
+        for feature in filter_feature_list_function(common_license_db.get_feature_list(db_file, db_conn)):
+            if load_thread and load_thread.cancelled:
+                break
+
+            if key_list:
+                data_dic = common_license_db.get_feature_data(db_file, db_conn, feature, key_list, select_condition)
+
+                if data_dic:
+                    feature_data_list.append((feature, data_dic))
+            else:
+                feature_data_list.append((feature, {}))
+
+        db_conn.close()
+
+        return feature_data_list
+
+    def filter_curve_feature_list(self, feature_list, specified_license_feature):
+        """
+        Get specified feature (exact match or fuzzy match) from feature_list for CURVE tab.
+        """
+        if not specified_license_feature:
+            return feature_list
+        elif specified_license_feature in feature_list:
+            return [specified_license_feature]
+        else:
+            return self.feature_trigram_index.filter(specified_license_feature, feature_list)
+
+    def get_curve_info(self, curve_filter_dic, load_thread=None):
+        """
+        Get curve information from config.db_path/license_server/<license_server>/<vendor_deamon>/(consolidated_)utilization.db.
+        It runs on background thread, and stops early if load_thread is cancelled.
         """
         # Print loading curve informaiton message.
         common.bprint('Load curve info ...', date_format='%Y-%m-%d %H:%M:%S')
 
-        # Print loading curve informaiton message with GUI.
-        my_show_message = ShowMessage('Info', 'Loading curve info, please wait a moment ...')
-        my_show_message.start()
-
         curve_dic = {}
 
-        key_list = ['sample_time', 'issued', 'in_use']
-        begin_date = self.curve_tab_begin_date_edit.date().toString(Qt.ISODate)
+        begin_date = curve_filter_dic['begin_date']
         begin_time = str(begin_date) + ' 00:00:00'
-        begin_second = time.mktime(time.strptime(begin_time, '%Y-%m-%d %H:%M:%S'))
-        end_date = self.curve_tab_end_date_edit.date().toString(Qt.ISODate)
+        begin_second = int(time.mktime(time.strptime(begin_time, '%Y-%m-%d %H:%M:%S')))
+        end_date = curve_filter_dic['end_date']
         end_time = str(end_date) + ' 23:59:59'
-        end_second = time.mktime(time.strptime(end_time, '%Y-%m-%d %H:%M:%S'))
-        select_condition = 'WHERE sample_second>=' + str(begin_second) + ' AND sample_second<=' + str(end_second)
+        end_second = int(time.mktime(time.strptime(end_time, '%Y-%m-%d %H:%M:%S')))
 
-        selected_license_server_dic = self.curve_tab_server_combo.selectedItems()
-        selected_license_server_list = list(selected_license_server_dic.values())
-        selected_vendor_daemon_dic = self.curve_tab_vendor_combo.selectedItems()
-        selected_vendor_daemon_list = list(selected_vendor_daemon_dic.values())
-        specified_license_feature = self.curve_tab_feature_line.text().strip()
+        selected_license_server_list = curve_filter_dic['license_server_list']
+        selected_vendor_daemon_list = curve_filter_dic['vendor_daemon_list']
+        specified_license_feature = curve_filter_dic['license_feature']
 
         self.update_db_info()
+        db_dic = self.db_dic
+        query_cache_key = self.get_query_cache_key('curve', curve_filter_dic, ['curve'])
+        cached_curve_dic = self.query_cache.get(query_cache_key)
+
+        if cached_curve_dic is not None:
+            common.bprint('Load curve info from query cache.', date_format='%Y-%m-%d %H:%M:%S')
+            return cached_curve_dic
+
+        # Filter with license_server/vendor_daemon.
+        curve_task_list = []
 
-        # Filter with license_server/vendor_daemon/feature.
-        for license_server in self.db_dic.keys():
+        for license_server in db_dic.keys():
             if ('ALL' in selected_license_server_list) or (license_server in selected_license_server_list):
-                for vendor_daemon in self.db_dic[license_server].keys():
+                for vendor_daemon in db_dic[license_server].keys():
                     if ('ALL' in selected_vendor_daemon_list) or (vendor_daemon in selected_vendor_daemon_list):
-                        if 'curve' in self.db_dic[license_server][vendor_daemon].keys():
-                            curve_db_file = self.db_dic[license_server][vendor_daemon]['curve']
-                            (curve_db_file_connect_result, curve_db_conn) = common_sqlite3.connect_db_file(curve_db_file)
+                        if ('curve' in db_dic[license_server][vendor_daemon].keys()) and self.is_db_file_in_range(db_dic[license_server][vendor_daemon]['curve'], begin_second, end_second):
+                            curve_task_list.append((vendor_daemon, db_dic[license_server][vendor_daemon]['curve']))
 
-                            if curve_db_file_connect_result == 'failed':
-                                common.bprint('Failed on connecting curve database file "' + str(curve_db_file) + '".', date_format='%Y-%m-%d %H:%M:%S', level='Warning')
-                            else:
-                                # Get specified_license_feature_list.
-                                curve_db_table_list = common_sqlite3.get_sql_table_list(curve_db_file, curve_db_conn)
+        # Get the partial sums of all curve db files at the same time, then sum up the partial sums of different license servers for every vendor_daemon.
+        def read_curve_db_file(curve_task):
+            if load_thread and load_thread.cancelled:
+                return [], []
 
-                                if 'sqlite_sequence' in curve_db_table_list:
-                                    curve_db_table_list.remove('sqlite_sequence')
+            return common_license_db.get_feature_sample_partial_sum(curve_task[1], lambda feature_list: self.filter_curve_feature_list(feature_list, specified_license_feature), 'sample_time', 'sample_second', begin_second, end_second)
 
-                                specified_license_feature_list = []
+        curve_partial_sum_list = common_license_db.read_db_files(read_curve_db_file, curve_task_list, self.db_read_max_workers)
 
-                                if not specified_license_feature:
-                                    specified_license_feature_list = curve_db_table_list
-                                else:
-                                    if specified_license_feature in curve_db_table_list:
-                                        specified_license_feature_list.append(specified_license_feature)
-                                    else:
-                                        for feature in curve_db_table_list:
-                                            if re.search(re.escape(specified_license_feature.lower()), feature.lower()):
-                                                specified_license_feature_list.append(feature)
-
-                                # Get specified feature data.
-                                for feature in specified_license_feature_list:
-                                    data_dic = common_sqlite3.get_sql_table_data(curve_db_file, curve_db_conn, feature, key_list, select_condition)
-
-                                    if data_dic:
-                                        curve_dic.setdefault(feature, {})
-                                        curve_dic[feature].setdefault(vendor_daemon, {'sample_data': {}, 'summary': {}})
-                                        issued_list = []
-                                        in_use_list = []
-
-                                        # Get sample data.
-                                        for (i, sample_time) in enumerate(data_dic['sample_time']):
-                                            curve_dic[feature][vendor_daemon]['sample_data'].setdefault(sample_time, {'issued': 0.0, 'in_use': 0.0})
-                                            issued_num = data_dic['issued'][i]
-                                            in_use_num = data_dic['in_use'][i]
-
-                                            if issued_num == 'Uncounted':
-                                                curve_dic[feature][vendor_daemon]['sample_data'][sample_time]['issued'] = 'Uncounted'
-                                            else:
-                                                if curve_dic[feature][vendor_daemon]['sample_data'][sample_time]['issued'] != 'Uncounted':
-                                                    curve_dic[feature][vendor_daemon]['sample_data'][sample_time]['issued'] += float(issued_num)
-
-                                            curve_dic[feature][vendor_daemon]['sample_data'][sample_time]['in_use'] += float(in_use_num)
-
-                                            # Collect summary information.
-                                            issued_list.append(curve_dic[feature][vendor_daemon]['sample_data'][sample_time]['issued'])
-                                            in_use_list.append(curve_dic[feature][vendor_daemon]['sample_data'][sample_time]['in_use'])
-
-                                        # Get summary data.
-                                        if 'Uncounted' in issued_list:
-                                            avg_issued = 'Uncounted'
-                                        else:
-                                            avg_issued = round(sum(issued_list)/len(issued_list), 1)
+        if load_thread and load_thread.cancelled:
+            return {}
 
-                                        avg_in_use = round(sum(in_use_list)/len(in_use_list), 1)
-                                        peak_in_use = max(in_use_list)
-                                        curve_dic[feature][vendor_daemon]['summary'] = {'avg_issued': avg_issued, 'avg_in_use': avg_in_use, 'peak_in_use': peak_in_use}
+        vendor_daemon_partial_sum_dic = {}
 
-                            curve_db_conn.close()
+        for ((vendor_daemon, curve_db_file), partial_sum) in zip(curve_task_list, curve_partial_sum_list):
+            vendor_daemon_partial_sum_dic.setdefault(vendor_daemon, []).append(partial_sum)
 
-        my_show_message.terminate()
+        for (vendor_daemon, partial_sum_list) in vendor_daemon_partial_sum_dic.items():
+            for (feature, sample_dic) in common_license_db.sum_feature_sample_partial_list(partial_sum_list).items():
+                curve_dic.setdefault(feature, {})
+                summary_dic = sample_dic['summary']
+
+                # Get summary data.
+                if summary_dic['issued_sum'] == 'Uncounted':
+                    avg_issued = 'Uncounted'
+                else:
+                    avg_issued = round(summary_dic['issued_sum']/summary_dic['sample_num'], 1)
+
+                avg_in_use = round(summary_dic['in_use_sum']/summary_dic['sample_num'], 1)
+                peak_in_use = summary_dic['peak_in_use']
+                curve_dic[feature][vendor_daemon] = {'sample_data': sample_dic['sample_data'], 'summary': {'avg_issued': avg_issued, 'avg_in_use': avg_in_use, 'peak_in_use': peak_in_use}}
 
         if not curve_dic:
             common.bprint('No curve data is find.', date_format='%Y-%m-%d %H:%M:%S', level='Warning')
 
+        if not (load_thread and load_thread.cancelled):
+            self.query_cache.set(query_cache_key, curve_dic)
+
         return curve_dic
 
     def gen_curve_tab_table(self, curve_dic={}):
@@ -2103,6 +2435,7 @@ licenseMonitor is an open source software for EDA software license information d
                 current_row = self.curve_tab_table.currentRow()
                 feature = self.curve_tab_table.item(current_row, 0).text().strip()
 
+                self.init_tab(self.feature_tab)
                 self.set_feature_tab_server_combo()
                 self.set_feature_tab_vendor_combo()
                 self.feature_tab_feature_line.setText(feature)
@@ -2211,9 +2544,11 @@ licenseMonitor is an open source software for EDA software license information d
             axes.set_xlabel('Sample Time')
             axes.set_ylabel('Num')
 
-        axes.plot(sample_time_list, issued_list, 'bo-', label='TOTAL', linewidth=0.3, markersize=0.1)
-        axes.plot(sample_time_list, in_use_list, 'go-', label='IN_USE', linewidth=0.1, markersize=0.1)
-        axes.fill_between(sample_time_list, 0, in_use_list, color='green', alpha=0.5)
+        # Only draw about one point per pixel, finer detail is drawn on zooming in.
+        self.curve_tab_curve = common_pyqt5.DownsampleCurve(axes, sample_time_list)
+        self.curve_tab_curve.plot(issued_list, 'bo-', label='TOTAL', linewidth=0.3, markersize=0.1)
+        self.curve_tab_curve.plot(in_use_list, 'go-', label='IN_USE', linewidth=0.1, markersize=0.1)
+        self.curve_tab_curve.fill_between(in_use_list, color='green', alpha=0.5)
         axes.legend(loc='upper right')
         axes.tick_params(axis='x', rotation=15)
         axes.grid()
@@ -2281,8 +2616,9 @@ licenseMonitor is an open source software for EDA software license information d
 
         self.utilization_tab_feature_line = QLineEdit()
         self.utilization_tab_feature_line.returnPressed.connect(self.filter_utilization_tab)
+        self.utilization_tab_feature_line.textChanged.connect(lambda: self.cancel_load_thread('utilization'))
 
-        utilization_tab_feature_line_completer = common_pyqt5.get_completer(self.feature_list)
+        utilization_tab_feature_line_completer = common_pyqt5.get_completer(self.feature_list, self.feature_trigram_index)
         self.utilization_tab_feature_line.setCompleter(utilization_tab_feature_line_completer)
 
         # Check button
@@ -2300,6 +2636,7 @@ licenseMonitor is an open source software for EDA software license information d
         self.utilization_tab_begin_date_edit.setMinimumDate(QDate.currentDate().addDays(-3652))
         self.utilization_tab_begin_date_edit.setCalendarPopup(True)
         self.utilization_tab_begin_date_edit.setDate(QDate.currentDate().addMonths(-1))
+        self.utilization_tab_begin_date_edit.dateChanged.connect(lambda: self.cancel_load_thread('utilization'))
 
         # End_Date
         utilization_tab_end_date_label = QLabel('End_Date', self.utilization_tab_frame0)
@@ -2311,6 +2648,7 @@ licenseMonitor is an open source software for EDA software license information d
         self.utilization_tab_end_date_edit.setMinimumDate(QDate.currentDate().addDays(-3652))
         self.utilization_tab_end_date_edit.setCalendarPopup(True)
         self.utilization_tab_end_date_edit.setDate(QDate.currentDate())
+        self.utilization_tab_end_date_edit.dateChanged.connect(lambda: self.cancel_load_thread('utilization'))
 
         # License Product
         utilization_tab_product_label = QLabel('Product', self.utilization_tab_frame0)
@@ -2319,8 +2657,9 @@ licenseMonitor is an open source software for EDA software license information d
 
         self.utilization_tab_product_line = QLineEdit()
         self.utilization_tab_product_line.returnPressed.connect(self.filter_utilization_tab)
+        self.utilization_tab_product_line.textChanged.connect(lambda: self.cancel_load_thread('utilization'))
 
-        utilization_tab_product_line_completer = common_pyqt5.get_completer(self.product_list)
+        utilization_tab_product_line_completer = common_pyqt5.get_completer(self.product_list, self.product_trigram_index)
         self.utilization_tab_product_line.setCompleter(utilization_tab_product_line_completer)
 
         # Export button
@@ -2377,10 +2716,14 @@ licenseMonitor is an open source software for EDA software license information d
 
     def filter_utilization_tab(self):
         """
-        Update self.utilization_tab_table and self.utilization_tab_frame1.
+        Load utilization info on background thread, then update self.utilization_tab_table and self.utilization_tab_frame1.
         """
-        utilization_dic = self.get_utilization_info()
+        self.start_load_thread('utilization', 'Loading utilization info, please wait a moment ...', self.get_utilization_info, (self.get_utilization_filter_dic(), ), self.update_utilization_tab)
 
+    def update_utilization_tab(self, utilization_dic):
+        """
+        Update self.utilization_tab_table and self.utilization_tab_frame1 with utilization_dic.
+        """
         if utilization_dic:
             if self.enable_utilization_product:
                 utilization_dic = self.switch_product_on_utilization_dic(utilization_dic)
@@ -2393,100 +2736,111 @@ licenseMonitor is an open source software for EDA software license information d
         Update self.feature_record_dic with config/others/feature_record_on_license_log.yaml.
         """
         # Get self.feature_record_dic.
-        self.feature_record_dic = {}
+        feature_record_dic = {}
         feature_record_file = str(os.environ['LICENSE_MONITOR_INSTALL_PATH']) + '/config/others/feature_record_on_license_log.yaml'
 
         if os.path.exists(feature_record_file):
             common.bprint('Parse config/others/feature_record_on_license_log.yaml', date_format='%Y-%m-%d %H:%M:%S')
 
             with open(feature_record_file, 'r') as FRF:
-                self.feature_record_dic = yaml.load(FRF, Loader=yaml.FullLoader)
+                feature_record_dic = yaml.load(FRF, Loader=yaml.FullLoader)
+
+        self.feature_record_dic = feature_record_dic
+
+    def get_utilization_filter_dic(self):
+        """
+        Get utilization filter settings from UTILIZATION tab widgets, they cannot be read on background thread.
+        """
+        utilization_filter_dic = {'begin_date': self.utilization_tab_begin_date_edit.date().toString(Qt.ISODate),
+                                  'end_date': self.utilization_tab_end_date_edit.date().toString(Qt.ISODate),
+                                  'license_server_list': list(self.utilization_tab_server_combo.selectedItems().values()),
+                                  'vendor_daemon_list': list(self.utilization_tab_vendor_combo.selectedItems().values()),
+                                  'license_feature_list': self.utilization_tab_feature_line.text().strip().split(),
+                                  'license_product': self.utilization_tab_product_line.text().strip()}
 
-    def get_utilization_info(self):
+        return utilization_filter_dic
+
+    def get_utilization_info(self, utilization_filter_dic, load_thread=None):
         """
-        Get utilization information from config.db_path/license_server/<license_server>/<vendor_deamon>/utilization(_day).db.
+        Get utilization information from config.db_path/license_server/<license_server>/<vendor_deamon>/(consolidated_)utilization(_day).db.
+        It runs on background thread, and stops early if load_thread is cancelled.
         """
         # Print loading utilization informaiton message.
         common.bprint('Load utilization info ...', date_format='%Y-%m-%d %H:%M:%S')
 
-        # Print loading utilization informaiton message with GUI.
-        my_show_message = ShowMessage('Info', 'Loading utilization info, please wait a moment ...')
-        my_show_message.start()
-
         utilization_dic = {}
 
         if self.enable_utilization_detail:
-            key_list = ['sample_time', 'issued', 'in_use']
-            begin_date = self.utilization_tab_begin_date_edit.date().toString(Qt.ISODate)
+            time_key = 'sample_time'
+            range_key = 'sample_second'
+            begin_date = utilization_filter_dic['begin_date']
             begin_time = str(begin_date) + ' 00:00:00'
-            begin_second = time.mktime(time.strptime(begin_time, '%Y-%m-%d %H:%M:%S'))
-            end_date = self.utilization_tab_end_date_edit.date().toString(Qt.ISODate)
+            begin_second = int(time.mktime(time.strptime(begin_time, '%Y-%m-%d %H:%M:%S')))
+            end_date = utilization_filter_dic['end_date']
             end_time = str(end_date) + ' 23:59:59'
-            end_second = time.mktime(time.strptime(end_time, '%Y-%m-%d %H:%M:%S'))
-            select_condition = 'WHERE sample_second>=' + str(begin_second) + ' AND sample_second<=' + str(end_second)
+            end_second = int(time.mktime(time.strptime(end_time, '%Y-%m-%d %H:%M:%S')))
+            begin_value = begin_second
+            end_value = end_second
         else:
-            key_list = ['sample_date', 'issued', 'in_use']
-            begin_date = self.utilization_tab_begin_date_edit.date().toString(Qt.ISODate)
+            # sample_date is TEXT (YYYYMMDD), so it is compared with TEXT values.
+            time_key = 'sample_date'
+            range_key = 'sample_date'
+            begin_date = utilization_filter_dic['begin_date']
+            begin_second = int(time.mktime(time.strptime(str(begin_date) + ' 00:00:00', '%Y-%m-%d %H:%M:%S')))
             begin_date = re.sub('-', '', begin_date)
-            end_date = self.utilization_tab_end_date_edit.date().toString(Qt.ISODate)
+            end_date = utilization_filter_dic['end_date']
+            end_second = int(time.mktime(time.strptime(str(end_date) + ' 23:59:59', '%Y-%m-%d %H:%M:%S')))
             end_date = re.sub('-', '', end_date)
-            select_condition = 'WHERE sample_date>=' + str(begin_date) + ' AND sample_date<=' + str(end_date)
+            begin_value = str(begin_date)
+            end_value = str(end_date)
 
-        selected_license_server_dic = self.utilization_tab_server_combo.selectedItems()
-        selected_license_server_list = list(selected_license_server_dic.values())
-        selected_vendor_daemon_dic = self.utilization_tab_vendor_combo.selectedItems()
-        selected_vendor_daemon_list = list(selected_vendor_daemon_dic.values())
-        selected_license_feature_list = self.utilization_tab_feature_line.text().strip().split()
-        selected_license_product = self.utilization_tab_product_line.text().strip()
+        selected_license_server_list = utilization_filter_dic['license_server_list']
+        selected_vendor_daemon_list = utilization_filter_dic['vendor_daemon_list']
+        selected_license_feature_list = utilization_filter_dic['license_feature_list']
+        selected_license_product = utilization_filter_dic['license_product']
 
         self.update_db_info()
+        db_dic = self.db_dic
         self.update_product_feature_info()
         self.update_feature_record_info()
+        query_cache_key = self.get_query_cache_key('utilization', utilization_filter_dic, ['utilization'], self.get_query_config_file_list('utilization'))
+        cached_utilization_dic = self.query_cache.get(query_cache_key)
 
-        # Filter with license_server/vendor_daemon/feature.
-        for license_server in self.db_dic.keys():
+        if cached_utilization_dic is not None:
+            common.bprint('Load utilization info from query cache.', date_format='%Y-%m-%d %H:%M:%S')
+            return cached_utilization_dic
+
+        # Filter with license_server/vendor_daemon.
+        utilization_task_list = []
+
+        for license_server in db_dic.keys():
             if ('ALL' in selected_license_server_list) or (license_server in selected_license_server_list):
-                for vendor_daemon in self.db_dic[license_server].keys():
+                for vendor_daemon in db_dic[license_server].keys():
                     if ('ALL' in selected_vendor_daemon_list) or (vendor_daemon in selected_vendor_daemon_list):
-                        if 'utilization' in self.db_dic[license_server][vendor_daemon].keys():
-                            utilization_db_file = self.db_dic[license_server][vendor_daemon]['utilization']
-                            (utilization_db_file_connect_result, utilization_db_conn) = common_sqlite3.connect_db_file(utilization_db_file)
-
-                            if utilization_db_file_connect_result == 'failed':
-                                common.bprint('Failed on connecting utilization database file "' + str(utilization_db_file) + '".', date_format='%Y-%m-%d %H:%M:%S', level='Warning')
-                            else:
-                                # Get specified_license_feature_list.
-                                utilization_db_table_list = common_sqlite3.get_sql_table_list(utilization_db_file, utilization_db_conn)
-                                specified_license_feature_list = self.count_specified_license_feature_list(utilization_db_table_list, vendor_daemon, selected_license_feature_list, selected_license_product)
-
-                                # Get specified feature data.
-                                for feature in specified_license_feature_list:
-                                    data_dic = common_sqlite3.get_sql_table_data(utilization_db_file, utilization_db_conn, feature, key_list, select_condition)
-
-                                    if data_dic:
-                                        # Save sample data.
-                                        utilization_dic.setdefault(feature, {})
-                                        utilization_dic[feature].setdefault(vendor_daemon, {'sample_data': {}, 'summary': {}})
-
-                                        if self.enable_utilization_detail:
-                                            key = 'sample_time'
-                                        else:
-                                            key = 'sample_date'
+                        if ('utilization' in db_dic[license_server][vendor_daemon].keys()) and self.is_db_file_in_range(db_dic[license_server][vendor_daemon]['utilization'], begin_second, end_second):
+                            utilization_task_list.append((vendor_daemon, db_dic[license_server][vendor_daemon]['utilization']))
 
-                                        for (i, sample_date) in enumerate(data_dic[key]):
-                                            utilization_dic[feature][vendor_daemon]['sample_data'].setdefault(sample_date, {'issued': 0.0, 'in_use': 0.0})
-                                            issued_num = data_dic['issued'][i]
-                                            in_use_num = data_dic['in_use'][i]
+        # Get the partial sums of all utilization db files at the same time, then sum up the partial sums of different license servers for every vendor_daemon.
+        def read_utilization_db_file(utilization_task):
+            if load_thread and load_thread.cancelled:
+                return [], []
 
-                                            if issued_num == 'Uncounted':
-                                                utilization_dic[feature][vendor_daemon]['sample_data'][sample_date]['issued'] = 'Uncounted'
-                                            else:
-                                                if utilization_dic[feature][vendor_daemon]['sample_data'][sample_date]['issued'] != 'Uncounted':
-                                                    utilization_dic[feature][vendor_daemon]['sample_data'][sample_date]['issued'] += float(issued_num)
+            return common_license_db.get_feature_sample_partial_sum(utilization_task[1], lambda feature_list: self.count_specified_license_feature_list(feature_list, utilization_task[0], selected_license_feature_list, selected_license_product), time_key, range_key, begin_value, end_value)
 
-                                            utilization_dic[feature][vendor_daemon]['sample_data'][sample_date]['in_use'] += float(in_use_num)
+        utilization_partial_sum_list = common_license_db.read_db_files(read_utilization_db_file, utilization_task_list, self.db_read_max_workers)
 
-                            utilization_db_conn.close()
+        if load_thread and load_thread.cancelled:
+            return {}
+
+        vendor_daemon_partial_sum_dic = {}
+
+        for ((vendor_daemon, utilization_db_file), partial_sum) in zip(utilization_task_list, utilization_partial_sum_list):
+            vendor_daemon_partial_sum_dic.setdefault(vendor_daemon, []).append(partial_sum)
+
+        for (vendor_daemon, partial_sum_list) in vendor_daemon_partial_sum_dic.items():
+            for (feature, sample_dic) in common_license_db.sum_feature_sample_partial_list(partial_sum_list).items():
+                utilization_dic.setdefault(feature, {})
+                utilization_dic[feature][vendor_daemon] = sample_dic
 
         # Filter with white/black feature list.
         utilization_white_feature_list = self.parse_feature_product_filter_file('utilization', 'white', 'feature')
@@ -2506,12 +2860,9 @@ licenseMonitor is an open source software for EDA software license information d
                     if re.match(black_feature, feature):
                         del filtered_utilization_dic[feature]
 
-        # Count utilizaton/avg_utilization information. (Aggregated data from different license servers)
+        # Count utilizaton/avg_utilization information. (Aggregated data from different license servers, issued/in_use sums are counted on sqlite)
         for feature in filtered_utilization_dic.keys():
             for vendor_daemon in filtered_utilization_dic[feature].keys():
-                issued_list = []
-                in_use_list = []
-
                 for sample_date in filtered_utilization_dic[feature][vendor_daemon]['sample_data'].keys():
                     # Get feature sample_date 'utilization' info.
                     issued_num = filtered_utilization_dic[feature][vendor_daemon]['sample_data'][sample_date]['issued']
@@ -2528,17 +2879,16 @@ licenseMonitor is an open source software for EDA software license information d
 
                     filtered_utilization_dic[feature][vendor_daemon]['sample_data'][sample_date]['utilization'] = utilization
 
-                    issued_list.append(issued_num)
-                    in_use_list.append(in_use_num)
-
                 # Get feature 'avg_utilization' info.
-                if 'Uncounted' in issued_list:
-                    if sum(in_use_list) > 0:
+                summary_dic = filtered_utilization_dic[feature][vendor_daemon]['summary']
+
+                if summary_dic['issued_sum'] == 'Uncounted':
+                    if summary_dic['in_use_sum'] > 0:
                         avg_utilization = 100.0
                     else:
                         avg_utilization = 0.0
                 else:
-                    avg_utilization = round(100 * sum(in_use_list) / sum(issued_list), 1)
+                    avg_utilization = round(100 * summary_dic['in_use_sum'] / summary_dic['issued_sum'], 1)
 
                 filtered_utilization_dic[feature][vendor_daemon]['summary'] = {'avg_utilization': avg_utilization}
 
@@ -2549,16 +2899,18 @@ licenseMonitor is an open source software for EDA software license information d
                     if (filtered_utilization_dic[feature][vendor_daemon]['summary']['avg_utilization'] == 0.0) and (feature in self.feature_record_dic) and (vendor_daemon in self.feature_record_dic[feature]):
                         filtered_utilization_dic[feature][vendor_daemon]['summary']['avg_utilization'] = 0.09
 
-        my_show_message.terminate()
-
         if not filtered_utilization_dic:
             common.bprint('No utilization data is find.', date_format='%Y-%m-%d %H:%M:%S', level='Warning')
 
+        if not (load_thread and load_thread.cancelled):
+            self.query_cache.set(query_cache_key, filtered_utilization_dic)
+
         return filtered_utilization_dic
 
     def count_specified_license_feature_list(self, feature_list, vendor_daemon, selected_license_feature_list=[], selected_license_product=''):
         """
         Based on selected_license_feature_list and selected_license_product, count specified_license_feature_list.
+        It runs on db reader threads, so selected_license_feature_list is not changed.
         """
         specified_license_feature_list = []
 
@@ -2568,25 +2920,27 @@ licenseMonitor is an open source software for EDA software license information d
         if (not selected_license_feature_list) and (not selected_license_product):
             specified_license_feature_list = feature_list
         else:
-            if selected_license_feature_list:
-                # Exact match or fuzzy match for specified_license_feature_list.
-                for selected_license_feature in selected_license_feature_list:
-                    if selected_license_feature in feature_list:
-                        specified_license_feature_list.append(selected_license_feature)
-                    else:
-                        for feature in feature_list:
-                            if re.search(re.escape(selected_license_feature.lower()), feature.lower()):
-                                specified_license_feature_list.append(feature)
-            elif selected_license_product:
-                # If not specified "selected_license_feature_list", try to get "selected_license_feature_list" from "selected_license_product".
+            if (not selected_license_feature_list) and selected_license_product:
+                # If not specified "selected_license_feature_list", try to get "selected_license_feature_list" from "selected_license_product" of vendor_daemon.
+                selected_license_feature_list = []
+
                 if vendor_daemon in self.product_feature_dic:
                     if selected_license_product in self.product_feature_dic[vendor_daemon]:
                         selected_license_feature_list.extend(self.product_feature_dic[vendor_daemon][selected_license_product])
                     else:
+                        matched_product_set = self.product_trigram_index.search(selected_license_product)
+
                         for product in self.product_feature_dic[vendor_daemon].keys():
-                            if re.search(re.escape(selected_license_product.lower()), product.lower()):
+                            if product in matched_product_set:
                                 selected_license_feature_list.extend(self.product_feature_dic[vendor_daemon][product])
 
+            # Exact match or fuzzy match for specified_license_feature_list.
+            for selected_license_feature in selected_license_feature_list:
+                if selected_license_feature in feature_list:
+                    specified_license_feature_list.append(selected_license_feature)
+                else:
+                    specified_license_feature_list.extend(self.feature_trigram_index.filter(selected_license_feature, feature_list))
+
         return specified_license_feature_list
 
     def gen_utilization_tab_table(self, utilization_dic={}):
@@ -2655,6 +3009,7 @@ licenseMonitor is an open source software for EDA software license information d
                 current_row = self.utilization_tab_table.currentRow()
                 feature = self.utilization_tab_table.item(current_row, 0).text().strip()
 
+                self.init_tab(self.feature_tab)
                 self.set_feature_tab_server_combo()
                 self.set_feature_tab_vendor_combo()
                 self.feature_tab_feature_line.setText(feature)
@@ -2767,8 +3122,10 @@ licenseMonitor is an open source software for EDA software license information d
 
             axes.set_ylabel('Utilization (%)')
 
-        axes.plot(sample_date_list, utilization_list, 'ro-', label='UT', linewidth=0.1, markersize=0.1)
-        axes.fill_between(sample_date_list, 0, utilization_list, color='red', alpha=0.5)
+        # Only draw about one point per pixel, finer detail is drawn on zooming in.
+        self.utilization_tab_curve = common_pyqt5.DownsampleCurve(axes, sample_date_list)
+        self.utilization_tab_curve.plot(utilization_list, 'ro-', label='UT', linewidth=0.1, markersize=0.1)
+        self.utilization_tab_curve.fill_between(utilization_list, color='red', alpha=0.5)
         axes.legend(loc='upper right')
         axes.tick_params(axis='x', rotation=15)
         axes.grid()
@@ -2826,8 +3183,9 @@ licenseMonitor is an open source software for EDA software license information d
 
         self.cost_tab_feature_line = QLineEdit()
         self.cost_tab_feature_line.returnPressed.connect(self.filter_cost_tab)
+        self.cost_tab_feature_line.textChanged.connect(lambda: self.cancel_load_thread('cost'))
 
-        cost_tab_feature_line_completer = common_pyqt5.get_completer(self.feature_list)
+        cost_tab_feature_line_completer = common_pyqt5.get_completer(self.feature_list, self.feature_trigram_index)
         self.cost_tab_feature_line.setCompleter(cost_tab_feature_line_completer)
 
         # Check button
@@ -2845,6 +3203,7 @@ licenseMonitor is an open source software for EDA software license information d
         self.cost_tab_begin_date_edit.setMinimumDate(QDate.currentDate().addDays(-3652))
         self.cost_tab_begin_date_edit.setCalendarPopup(True)
         self.cost_tab_begin_date_edit.setDate(QDate.currentDate().addMonths(-1))
+        self.cost_tab_begin_date_edit.dateChanged.connect(lambda: self.cancel_load_thread('cost'))
 
         # End_Date
         cost_tab_end_date_label = QLabel('End_Date', self.cost_tab_frame0)
@@ -2856,6 +3215,7 @@ licenseMonitor is an open source software for EDA software license information d
         self.cost_tab_end_date_edit.setMinimumDate(QDate.currentDate().addDays(-3652))
         self.cost_tab_end_date_edit.setCalendarPopup(True)
         self.cost_tab_end_date_edit.setDate(QDate.currentDate())
+        self.cost_tab_end_date_edit.dateChanged.connect(lambda: self.cancel_load_thread('cost'))
 
         # License Product
         cost_tab_product_label = QLabel('Product', self.cost_tab_frame0)
@@ -2864,8 +3224,9 @@ licenseMonitor is an open source software for EDA software license information d
 
         self.cost_tab_product_line = QLineEdit()
         self.cost_tab_product_line.returnPressed.connect(self.filter_cost_tab)
+        self.cost_tab_product_line.textChanged.connect(lambda: self.cancel_load_thread('cost'))
 
-        cost_tab_product_line_completer = common_pyqt5.get_completer(self.product_list)
+        cost_tab_product_line_completer = common_pyqt5.get_completer(self.product_list, self.product_trigram_index)
         self.cost_tab_product_line.setCompleter(cost_tab_product_line_completer)
 
         # Export button
@@ -2922,131 +3283,141 @@ licenseMonitor is an open source software for EDA software license information d
 
     def filter_cost_tab(self):
         """
-        Update self.cost_tab_table.
+        Load cost info on background thread, then update self.cost_tab_table.
+        """
+        self.start_load_thread('cost', 'Loading cost info, please wait a moment ...', self.get_cost_info, (self.get_cost_filter_dic(), ), self.gen_cost_tab_table)
+
+    def get_cost_filter_dic(self):
+        """
+        Get cost filter settings from COST tab widgets, they cannot be read on background thread.
         """
-        cost_dic = self.get_cost_info()
+        cost_filter_dic = {'begin_date': self.cost_tab_begin_date_edit.date().toString(Qt.ISODate),
+                           'end_date': self.cost_tab_end_date_edit.date().toString(Qt.ISODate),
+                           'license_server_list': list(self.cost_tab_server_combo.selectedItems().values()),
+                           'vendor_daemon_list': list(self.cost_tab_vendor_combo.selectedItems().values()),
+                           'license_feature_list': self.cost_tab_feature_line.text().strip().split(),
+                           'license_product': self.cost_tab_product_line.text().strip()}
 
-        self.gen_cost_tab_table(cost_dic)
+        return cost_filter_dic
 
-    def get_cost_info(self):
+    def is_cost_day_db_available(self, vendor_daemon_db_dic, begin_sample_date):
+        """
+        Check whether cost_day db file of vendor_daemon has complete runtime info from begin_sample_date (format "%Y%m%d").
         """
-        Get EDA license feature cost information from config.db_path/license_server/<license_server>/<vendor_deamon>/usage.db.
+        if 'cost_day' in vendor_daemon_db_dic:
+            (cost_day_db_file_connect_result, cost_day_db_conn) = common_sqlite3.connect_db_file(vendor_daemon_db_dic['cost_day'], mode='readonly')
+
+            if cost_day_db_file_connect_result == 'passed':
+                cost_day_begin_date = common_license_db.get_cost_day_begin_date(vendor_daemon_db_dic['cost_day'], cost_day_db_conn)
+                cost_day_db_conn.close()
+
+                if (cost_day_begin_date is not None) and (cost_day_begin_date <= begin_sample_date):
+                    return True
+
+        return False
+
+    def read_cost_db_files(self, vendor_daemon, vendor_daemon_db_dic, selected_license_feature_list, selected_license_product, begin_second, begin_sample_date, select_condition, cost_day_select_condition, load_thread=None):
+        """
+        Read the db files of vendor_daemon for COST tab, it runs on db reader threads.
+        Return (utilization_feature_list, usage_db_kind, feature_data_list), feature_data_list is got from cost_day db file (usage_db_kind is "cost_day") or usage db file (usage_db_kind is "usage").
+        """
+        def filter_feature_list(feature_list):
+            return self.count_specified_license_feature_list(feature_list, vendor_daemon, selected_license_feature_list, selected_license_product)
+
+        utilization_feature_list = []
+
+        if 'utilization' in vendor_daemon_db_dic:
+            utilization_feature_list = [feature for (feature, data_dic) in self.read_db_feature_data(vendor_daemon_db_dic['utilization'], 'utilization', filter_feature_list, [], '', load_thread)]
+
+        if self.is_cost_day_db_available(vendor_daemon_db_dic, begin_sample_date):
+            return utilization_feature_list, 'cost_day', self.read_db_feature_data(vendor_daemon_db_dic['cost_day'], 'cost_day', filter_feature_list, ['project', 'runtime', 'full_runtime'], cost_day_select_condition, load_thread)
+        elif ('usage' in vendor_daemon_db_dic) and self.is_db_file_in_range(vendor_daemon_db_dic['usage'], begin_second):
+            return utilization_feature_list, 'usage', self.read_db_feature_data(vendor_daemon_db_dic['usage'], 'usage', filter_feature_list, ['sample_second', 'user', 'submit_host', 'execute_host', 'num', 'start_second'], select_condition, load_thread)
+
+        return utilization_feature_list, '', []
+
+    def get_cost_info(self, cost_filter_dic, load_thread=None):
+        """
+        Get EDA license feature cost information from config.db_path/license_server/<license_server>/<vendor_deamon>/consolidated_cost_day.db (daily runtime rollup).
+        If cost_day db does not cover the date range, get it from config.db_path/license_server/<license_server>/<vendor_deamon>/(consolidated_)usage.db.
+        It runs on background thread, and stops early if load_thread is cancelled.
         """
         # Print loading cost informaiton message.
         common.bprint('Load cost info ...', date_format='%Y-%m-%d %H:%M:%S')
 
-        # Print loading cost informaiton message with GUI.
-        my_show_message = ShowMessage('Info', 'Loading cost info, please wait a moment ...')
-        my_show_message.start()
-
         cost_dic = {}
 
-        begin_date = self.cost_tab_begin_date_edit.date().toString(Qt.ISODate)
+        begin_date = cost_filter_dic['begin_date']
         begin_date = str(begin_date) + ' 00:00:00'
         begin_second = int(datetime.datetime.strptime(begin_date, "%Y-%m-%d %H:%M:%S").timestamp())
-        end_date = self.cost_tab_end_date_edit.date().toString(Qt.ISODate)
+        end_date = cost_filter_dic['end_date']
         end_date = str(end_date) + ' 23:59:59'
         end_second = int(datetime.datetime.strptime(end_date, "%Y-%m-%d %H:%M:%S").timestamp())
         select_condition = 'WHERE sample_second>' + str(begin_second) + ' AND start_second<' + str(end_second)
+        begin_sample_date = str(cost_filter_dic['begin_date']).replace('-', '')
+        end_sample_date = str(cost_filter_dic['end_date']).replace('-', '')
+        cost_day_select_condition = "WHERE sample_date>='" + str(begin_sample_date) + "' AND sample_date<='" + str(end_sample_date) + "'"
 
-        selected_license_server_dic = self.cost_tab_server_combo.selectedItems()
-        selected_license_server_list = list(selected_license_server_dic.values())
-        selected_vendor_daemon_dic = self.cost_tab_vendor_combo.selectedItems()
-        selected_vendor_daemon_list = list(selected_vendor_daemon_dic.values())
-        selected_license_feature_list = self.cost_tab_feature_line.text().strip().split()
-        selected_license_product = self.cost_tab_product_line.text().strip()
+        selected_license_server_list = cost_filter_dic['license_server_list']
+        selected_vendor_daemon_list = cost_filter_dic['vendor_daemon_list']
+        selected_license_feature_list = cost_filter_dic['license_feature_list']
+        selected_license_product = cost_filter_dic['license_product']
 
         self.update_db_info()
+        db_dic = self.db_dic
         self.update_project_list()
         self.update_project_setting_info()
         self.update_product_feature_info()
         self.update_feature_record_info()
+        query_cache_key = self.get_query_cache_key('cost', cost_filter_dic, ['utilization', 'usage', 'cost_day'], self.get_query_config_file_list('cost'))
+        cached_cost_dic = self.query_cache.get(query_cache_key)
+
+        if cached_cost_dic is not None:
+            common.bprint('Load cost info from query cache.', date_format='%Y-%m-%d %H:%M:%S')
+            return cached_cost_dic
+
+        # Filter with license_server/vendor_daemon.
+        cost_task_list = []
 
-        # Filter with license_server/vendor_daemon/feature.
-        for license_server in self.db_dic.keys():
+        for license_server in db_dic.keys():
             if ('ALL' in selected_license_server_list) or (license_server in selected_license_server_list):
-                for vendor_daemon in self.db_dic[license_server].keys():
+                for vendor_daemon in db_dic[license_server].keys():
                     if ('ALL' in selected_vendor_daemon_list) or (vendor_daemon in selected_vendor_daemon_list):
-                        # Get full feature information from utilization database.
-                        if 'utilization' in self.db_dic[license_server][vendor_daemon].keys():
-                            utilization_db_file = self.db_dic[license_server][vendor_daemon]['utilization']
-                            (utilization_db_file_connect_result, utilization_db_conn) = common_sqlite3.connect_db_file(utilization_db_file)
-
-                            if utilization_db_file_connect_result == 'failed':
-                                common.bprint('Failed on connecting utilization database file "' + str(utilization_db_file) + '".', date_format='%Y-%m-%d %H:%M:%S', level='Warning')
-                            else:
-                                # Get specified_license_feature_list.
-                                utilization_db_table_list = common_sqlite3.get_sql_table_list(utilization_db_file, utilization_db_conn)
-                                specified_license_feature_list = self.count_specified_license_feature_list(utilization_db_table_list, vendor_daemon, selected_license_feature_list, selected_license_product)
-
-                                # Get specified feature data.
-                                for feature in specified_license_feature_list:
-                                    cost_dic.setdefault(feature, {})
-                                    cost_dic[feature].setdefault(vendor_daemon, {'project_runtime': {}, 'project_rate': {}, 'total_runtime': 0})
-
-                                    for project in self.project_list:
-                                        cost_dic[feature][vendor_daemon]['project_runtime'].setdefault(project, 0)
-
-                        # Get used feature information from usage database.
-                        if 'usage' in self.db_dic[license_server][vendor_daemon].keys():
-                            usage_db_file = self.db_dic[license_server][vendor_daemon]['usage']
-                            (usage_db_file_connect_result, usage_db_conn) = common_sqlite3.connect_db_file(usage_db_file)
-
-                            if usage_db_file_connect_result == 'failed':
-                                common.bprint('Failed on connecting usage database file "' + str(usage_db_file) + '".', date_format='%Y-%m-%d %H:%M:%S', level='Warning')
-                            else:
-                                # Get specified_license_feature_list.
-                                usage_db_table_list = common_sqlite3.get_sql_table_list(usage_db_file, usage_db_conn)
-                                specified_license_feature_list = self.count_specified_license_feature_list(usage_db_table_list, vendor_daemon, selected_license_feature_list, selected_license_product)
-
-                                # Get specified feature data.
-                                for feature in specified_license_feature_list:
-                                    data_dic = common_sqlite3.get_sql_table_data(usage_db_file, usage_db_conn, feature, ['sample_second', 'user', 'submit_host', 'execute_host', 'num', 'start_second'], select_condition)
-
-                                    if data_dic:
-                                        # Save project data.
-                                        cost_dic.setdefault(feature, {})
-                                        cost_dic[feature].setdefault(vendor_daemon, {'project_runtime': {}, 'project_rate': {}, 'total_runtime': 0})
-
-                                        for project in self.project_list:
-                                            cost_dic[feature][vendor_daemon]['project_runtime'].setdefault(project, 0)
-
-                                        for (i, sample_second) in enumerate(data_dic['sample_second']):
-                                            num = int(data_dic['num'][i])
-                                            start_second = int(data_dic['start_second'][i])
-
-                                            # Get total runtime for the feature usage record.
-                                            if start_second >= begin_second:
-                                                if sample_second >= end_second:
-                                                    runtime_second = num * (end_second - start_second)
-                                                else:
-                                                    runtime_second = num * (sample_second - start_second)
-                                            else:
-                                                if sample_second >= end_second:
-                                                    runtime_second = num * (end_second - begin_second)
-                                                else:
-                                                    runtime_second = num * (sample_second - begin_second)
-
-                                            # Get project runtime information for the feature usage record.
-                                            project_dic = self.get_project_info(submit_host=data_dic['submit_host'][i], execute_host=data_dic['execute_host'][i], user=data_dic['user'][i], start_second=start_second)
-
-                                            if project_dic:
-                                                for project in project_dic.keys():
-                                                    if project in self.project_list:
-                                                        cost_dic[feature][vendor_daemon]['project_runtime'][project] += project_dic[project] * runtime_second
-                                                        cost_dic[feature][vendor_daemon]['total_runtime'] += project_dic[project] * runtime_second
-                                                    else:
-                                                        if self.enable_cost_others_project:
-                                                            # If not find any product information, collect runtime into 'others' group.
-                                                            cost_dic[feature][vendor_daemon]['project_runtime']['others'] += runtime_second
-                                                            cost_dic[feature][vendor_daemon]['total_runtime'] += runtime_second
-                                            else:
-                                                if self.enable_cost_others_project:
-                                                    # If not find any product information, collect runtime into 'others' group.
-                                                    cost_dic[feature][vendor_daemon]['project_runtime']['others'] += runtime_second
-                                                    cost_dic[feature][vendor_daemon]['total_runtime'] += runtime_second
-
-                                usage_db_conn.close()
+                        cost_task_list.append((vendor_daemon, db_dic[license_server][vendor_daemon]))
+
+        # Get feature information from the db files of all vendor daemons at the same time.
+        def read_cost_db_files(cost_task):
+            return self.read_cost_db_files(cost_task[0], cost_task[1], selected_license_feature_list, selected_license_product, begin_second, begin_sample_date, select_condition, cost_day_select_condition, load_thread)
+
+        cost_data_list = common_license_db.read_db_files(read_cost_db_files, cost_task_list, self.db_read_max_workers)
+
+        if load_thread and load_thread.cancelled:
+            return {}
+
+        for ((vendor_daemon, vendor_daemon_db_dic), (utilization_feature_list, usage_db_kind, feature_data_list)) in zip(cost_task_list, cost_data_list):
+            # Get full feature information from utilization database.
+            for feature in utilization_feature_list:
+                cost_dic.setdefault(feature, {})
+                cost_dic[feature].setdefault(vendor_daemon, {'project_runtime': {}, 'project_rate': {}, 'total_runtime': 0})
+
+                for project in self.project_list:
+                    cost_dic[feature][vendor_daemon]['project_runtime'].setdefault(project, 0)
+
+            # Get used feature information from cost_day or usage database.
+            for (feature, data_dic) in feature_data_list:
+                # Save project data.
+                cost_dic.setdefault(feature, {})
+                cost_dic[feature].setdefault(vendor_daemon, {'project_runtime': {}, 'project_rate': {}, 'total_runtime': 0})
+
+                for project in self.project_list:
+                    cost_dic[feature][vendor_daemon]['project_runtime'].setdefault(project, 0)
+
+                if usage_db_kind == 'cost_day':
+                    # Runtime is summed up by day and project already.
+                    common_cost.count_cost_day_cost(cost_dic[feature][vendor_daemon], data_dic, self.project_list, self.enable_cost_others_project)
+                else:
+                    # Get project runtime information for the feature usage records.
+                    common_cost.count_usage_cost(cost_dic[feature][vendor_daemon], data_dic, begin_second, end_second, self.project_resolver, self.project_list, self.enable_cost_others_project)
 
         # Filter with white/black feature list.
         cost_white_feature_list = self.parse_feature_product_filter_file('cost', 'white', 'feature')
@@ -3114,11 +3485,12 @@ licenseMonitor is an open source software for EDA software license information d
 
                     filtered_cost_dic[feature][vendor_daemon]['project_rate'][project] = project_rate
 
-        my_show_message.terminate()
-
         if not filtered_cost_dic:
             common.bprint('No cost data is find.', date_format='%Y-%m-%d %H:%M:%S', level='Warning')
 
+        if not (load_thread and load_thread.cancelled):
+            self.query_cache.set(query_cache_key, filtered_cost_dic)
+
         return filtered_cost_dic
 
     def update_project_setting_info(self):
@@ -3128,8 +3500,8 @@ licenseMonitor is an open source software for EDA software license information d
         common.bprint('Parse config.db_path/project_setting', date_format='%Y-%m-%d %H:%M:%S')
 
         project_setting_dic = {}
-        self.project_setting_dic = {}
-        self.project_setting_create_second_list = []
+        project_setting_second_dic = {}
+        project_setting_create_second_list = []
         project_setting_db_path = str(config.db_path) + '/project_setting'
 
         if os.path.exists(project_setting_db_path):
@@ -3139,39 +3511,17 @@ licenseMonitor is an open source software for EDA software license information d
 
         for create_time in project_setting_dic.keys():
             create_second = int(time.mktime(time.strptime(str(create_time), '%Y%m%d%H%M%S')))
-            self.project_setting_dic.setdefault(create_second, project_setting_dic[create_time])
-            self.project_setting_create_second_list.append(create_second)
+            project_setting_second_dic.setdefault(create_second, project_setting_dic[create_time])
+            project_setting_create_second_list.append(create_second)
+
+        (self.project_setting_dic, self.project_setting_create_second_list) = (project_setting_second_dic, project_setting_create_second_list)
+        self.project_resolver = common_cost.ProjectResolver(project_setting_second_dic, config.project_primary_factors if hasattr(config, 'project_primary_factors') else '')
 
     def get_project_info(self, submit_host, execute_host, user, start_second):
         """
         Get project information based on submit_host/execute_host/user.
         """
-        project_dic = {}
-        factor_dic = {'submit_host': submit_host, 'execute_host': execute_host, 'user': user}
-
-        if hasattr(config, 'project_primary_factors') and config.project_primary_factors:
-            project_primary_factor_list = config.project_primary_factors.split()
-
-            for (i, create_second) in enumerate(self.project_setting_create_second_list):
-                if ((i == 0) and (start_second <= create_second)) or ((i == len(self.project_setting_create_second_list)-1) and (start_second >= create_second)) or ((i < len(self.project_setting_create_second_list)-1) and (start_second >= create_second) and (start_second <= self.project_setting_create_second_list[i+1])):
-                    for project_primary_factor in project_primary_factor_list:
-                        if project_primary_factor not in factor_dic.keys():
-                            common.bprint('"' + str(project_primary_factor) + '": invalid project_primary_factors setting on config file.', date_format='%Y-%m-%d %H:%M:%S', level='Error')
-                            sys.exit(1)
-                        else:
-                            factor_value = factor_dic[project_primary_factor]
-                            project_proportion_dic = {}
-
-                            if factor_value in self.project_setting_dic[create_second]['project_' + str(project_primary_factor)].keys():
-                                project_proportion_dic = self.project_setting_dic[create_second]['project_' + str(project_primary_factor)][factor_value]
-
-                            if project_proportion_dic:
-                                project_dic = project_proportion_dic
-                                break
-                            else:
-                                continue
-
-        return project_dic
+        return self.project_resolver.get_project_dic(submit_host, execute_host, user, start_second)
 
     def gen_cost_tab_table(self, cost_dic={}):
         """
@@ -3263,6 +3613,7 @@ licenseMonitor is an open source software for EDA software license information d
                 current_row = self.cost_tab_table.currentRow()
                 feature = self.cost_tab_table.item(current_row, 0).text().strip()
 
+                self.init_tab(self.feature_tab)
                 self.set_feature_tab_server_combo()
                 self.set_feature_tab_vendor_combo()
                 self.feature_tab_feature_line.setText(feature)
@@ -3272,24 +3623,31 @@ licenseMonitor is an open source software for EDA software license information d
 
 # Export table (start) #
     def export_server_table(self):
+        self.init_tab(self.server_tab)
         self.export_table('server', self.server_tab_table, self.server_tab_table_title_list)
 
     def export_feature_table(self):
+        self.init_tab(self.feature_tab)
         self.export_table('feature', self.feature_tab_table, self.feature_tab_table_title_list)
 
     def export_expires_table(self):
+        self.init_tab(self.expires_tab)
         self.export_table('expires', self.expires_tab_table, self.expires_tab_table_title_list)
 
     def export_usage_table(self):
+        self.init_tab(self.usage_tab)
         self.export_table('usage', self.usage_tab_table, self.usage_tab_table_title_list)
 
     def export_curve_table(self):
+        self.init_tab(self.curve_tab)
         self.export_table('curve', self.curve_tab_table, self.curve_tab_table_title_list)
 
     def export_utilization_table(self):
+        self.init_tab(self.utilization_tab)
         self.export_table('utilization', self.utilization_tab_table, self.utilization_tab_table_title_list)
 
     def export_cost_table(self):
+        self.init_tab(self.cost_tab)
         self.export_table('cost', self.cost_tab_table, self.cost_tab_table_title_list)
 
     def export_table(self, table_type, table_item, title_list):
@@ -3306,19 +3664,27 @@ licenseMonitor is an open source software for EDA software license information d
         if output_file:
             # Get table content.
             content_dic = {}
-            row_num = table_item.rowCount()
-            column_num = table_item.columnCount()
 
-            for column in range(column_num):
-                column_list = []
+            if isinstance(table_item, QTableView) and isinstance(table_item.model(), common_pyqt5.TableModel):
+                # Model based table.
+                table_model = table_item.model()
 
-                for row in range(row_num):
-                    if table_item.item(row, column):
-                        column_list.append(table_item.item(row, column).text())
-                    else:
-                        column_list.append('')
+                for column in range(table_model.columnCount()):
+                    content_dic.setdefault(title_list[column], [table_model.get_text(row, column) for row in range(table_model.rowCount())])
+            else:
+                row_num = table_item.rowCount()
+                column_num = table_item.columnCount()
 
-                content_dic.setdefault(title_list[column], column_list)
+                for column in range(column_num):
+                    column_list = []
+
+                    for row in range(row_num):
+                        if table_item.item(row, column):
+                            column_list.append(table_item.item(row, column).text())
+                        else:
+                            column_list.append('')
+
+                    content_dic.setdefault(title_list[column], column_list)
 
             # Write csv
             common.bprint('Writing ' + str(table_type) + ' table into "' + str(output_file) + '" ...', date_format='%Y-%m-%d %H:%M:%S')
@@ -3330,66 +3696,53 @@ licenseMonitor is an open source software for EDA software license information d
         """
         When window close, post-process.
         """
-        common.bprint('Bye', date_format='%Y-%m-%d %H:%M:%S')
+        if self.auto_refresh_timer:
+            self.auto_refresh_timer.stop()
 
+        for load_thread in self.load_thread_list:
+            load_thread.cancel()
+            load_thread.wait()
 
-class ShowMessage(QThread):
-    """
-    Show message with tool message.
-    """
-    def __init__(self, title, message):
-        super(ShowMessage, self).__init__()
-        self.title = title
-        self.message = message
-
-    def run(self):
-        command = 'python3 ' + str(os.environ['LICENSE_MONITOR_INSTALL_PATH']) + '/tools/message.py --title "' + str(self.title) + '" --message "' + str(self.message) + '"'
-        os.system(command)
-
-    def terminate(self):
-        time.sleep(0.01)
-        QThread.terminate(self)
+        common.bprint('Bye', date_format='%Y-%m-%d %H:%M:%S')
 
 
-class ShowLicenseLogInfo(QThread):
+class LoadInfo(QThread):
     """
-    Show specified message on license log.
+    Load info with specified function on background thread, so GUI is not blocked.
+    function gets this thread with argument "load_thread", and it can stop early if load_thread.cancelled is True.
     """
-    def __init__(self):
-        super(ShowLicenseLogInfo, self).__init__()
-
-    def run(self, server='', vendor='', feature='', user='', lic_files=''):
-        command = str(os.environ['LICENSE_MONITOR_INSTALL_PATH']) + '/tools/show_license_log_info'
-
-        if server:
-            command = str(command) + ' --server ' + str(server)
+    def __init__(self, name, generation, function, args, done_function):
+        super(LoadInfo, self).__init__()
+        self.name = name
+        self.generation = generation
+        self.function = function
+        self.args = args
+        self.done_function = done_function
+        self.show_message = None
+        self.cancelled = False
+        self.result = None
+        self.result_ready = False
 
-        if vendor:
-            command = str(command) + ' --vendor ' + str(vendor)
-
-        if feature:
-            command = str(command) + ' --feature ' + str(feature)
-
-        if user:
-            command = str(command) + ' --user ' + str(user)
-
-        if lic_files:
-            command = str(command) + ' --lic_files ' + str(lic_files)
-
-        os.system(command)
+    def run(self):
+        try:
+            self.result = self.function(*self.args, load_thread=self)
+            self.result_ready = True
+        except Exception as error:
+            common.bprint('Failed on loading ' + str(self.name) + ' info.', date_format='%Y-%m-%d %H:%M:%S', level='Error')
+            common.bprint(error, color='red', display_method=1, indent=9)
 
-    def terminate(self):
-        time.sleep(0.01)
-        QThread.terminate(self)
+    def cancel(self):
+        self.cancelled = True
 
 
 #################
 # Main Function #
 #################
 def main():
-    (specified_feature, specified_user, specified_tab, dark_mode) = read_args()
+    (specified_feature, specified_user, specified_tab, dark_mode, live) = read_args()
+    IMPORT_TIME_RECORDER.report()
     app = QApplication(sys.argv)
-    mw = MainWindow(specified_feature, specified_user, specified_tab, dark_mode)
+    mw = MainWindow(specified_feature, specified_user, specified_tab, dark_mode, live)
     mw.show()
     sys.exit(app.exec_())
 
@@ -8,6 +8,7 @@
 import os
 import re
 import sys
+import signal
 import time
 import shutil
 import datetime
@@ -18,6 +19,8 @@ sys.path.append(os.environ['LICENSE_MONITOR_INSTALL_PATH'])
 from common import common
 from common import common_license
 from common import common_sqlite3
+from common import common_license_db
+from common import common_cost
 
 # Import local config file if exists.
 local_config_dir = str(os.environ['HOME']) + '/.licenseMonitor/config'
@@ -46,6 +49,14 @@ def read_args():
                         action='store_true',
                         default=False,
                         help='Sample license feature utilization info.')
+    parser.add_argument('-D', '--daemon',
+                        action='store_true',
+                        default=False,
+                        help='Keep running and sample license feature info on a fixed clock, instead of sampling once.')
+    parser.add_argument('-i', '--interval',
+                        type=int,
+                        default=300,
+                        help='Sample interval for daemon mode, unit is "second", default is 300.')
 
     args = parser.parse_args()
 
@@ -53,39 +64,35 @@ def read_args():
         common.bprint('At least one argument of "usage/utilization" must be selected.', level='Error')
         sys.exit(1)
 
-    return args.usage, args.utilization
+    if args.interval <= 0:
+        common.bprint('"--interval" must be a positive number.', level='Error')
+        sys.exit(1)
+
+    return args.usage, args.utilization, args.daemon, args.interval
 
 
 class Sampling:
     """
     Sample and save license feature information.
     """
-    def __init__(self, usage_sampling, utilization_sampling):
+    def __init__(self, usage_sampling, utilization_sampling, daemon_mode=False):
         self.usage_sampling = usage_sampling
         self.utilization_sampling = utilization_sampling
+        self.daemon_mode = daemon_mode
 
-        # Get sample time.
-        self.sample_second = int(time.time())
-        self.sample_date = datetime.datetime.today().strftime('%Y%m%d')
-        self.sample_time = datetime.datetime.today().strftime('%Y%m%d_%H%M%S')
+        # For daemon mode, db connections are kept on self.db_conn_dic, file mtime is saved on self.file_mtime_dic.
+        self.db_conn_dic = {}
+        self.file_mtime_dic = {}
+        self.license_dic = {}
+        self.license_server_list = []
 
-        # Get self.license_dic.
-        print('>>> Sampling license usage information ...')
+        self.LM_LICENSE_FILE_file = str(os.environ['LICENSE_MONITOR_INSTALL_PATH']) + '/config/LM_LICENSE_FILE'
+        self.project_list_file = os.path.realpath(str(os.environ['LICENSE_MONITOR_INSTALL_PATH']) + '/config/project/project_list')
+        self.project_submit_host_file = os.path.realpath(str(os.environ['LICENSE_MONITOR_INSTALL_PATH']) + '/config/project/project_submit_host')
+        self.project_execute_host_file = os.path.realpath(str(os.environ['LICENSE_MONITOR_INSTALL_PATH']) + '/config/project/project_execute_host')
+        self.project_user_file = os.path.realpath(str(os.environ['LICENSE_MONITOR_INSTALL_PATH']) + '/config/project/project_user')
 
-        LM_LICENSE_FILE_file = str(os.environ['LICENSE_MONITOR_INSTALL_PATH']) + '/config/LM_LICENSE_FILE'
-
-        if os.path.exists(LM_LICENSE_FILE_file):
-            os.environ['LM_LICENSE_FILE'] = ''
-
-            with open(LM_LICENSE_FILE_file, 'r') as LLF:
-                for line in LLF.readlines():
-                    line = line.strip()
-
-                    if (not re.match(r'^\s*$', line)) and (not re.match(r'^\s*#.*$', line)):
-                        if os.environ['LM_LICENSE_FILE']:
-                            os.environ['LM_LICENSE_FILE'] = str(os.environ['LM_LICENSE_FILE']) + ':' + str(line)
-                        else:
-                            os.environ['LM_LICENSE_FILE'] = str(line)
+        self.update_sample_time()
 
         if not hasattr(config, 'lmstat_path'):
             config.lmstat_path = ''
@@ -93,9 +100,115 @@ class Sampling:
         if not hasattr(config, 'lmstat_bsub_command'):
             config.lmstat_bsub_command = ''
 
-        my_get_license_info = common_license.GetLicenseInfo(lmstat_path=config.lmstat_path, bsub_command=config.lmstat_bsub_command)
+        if not hasattr(config, 'lmstat_max_workers'):
+            config.lmstat_max_workers = 16
+
+        if not hasattr(config, 'lmstat_timeout'):
+            config.lmstat_timeout = 60
+
+        self.db_layout = common_license_db.get_db_layout(config)
+
+        if self.db_layout not in common_license_db.DB_LAYOUT_LIST:
+            common.bprint('"' + str(self.db_layout) + '": invalid db_layout setting on config file, it should be "' + '/'.join(common_license_db.DB_LAYOUT_LIST) + '".', level='Error')
+            sys.exit(1)
+
+    def update_sample_time(self):
+        """
+        Get sample time.
+        """
+        self.sample_second = int(time.time())
+        self.sample_date = datetime.datetime.fromtimestamp(self.sample_second).strftime('%Y%m%d')
+        self.sample_time = datetime.datetime.fromtimestamp(self.sample_second).strftime('%Y%m%d_%H%M%S')
+
+    def check_file_update(self, file_list):
+        """
+        Return True if any file on file_list is updated (mtime changed) since last check, or it is the first check.
+        """
+        update_mark = False
+
+        for file in file_list:
+            if os.path.exists(file):
+                mtime = os.path.getmtime(file)
+            else:
+                mtime = 0
+
+            if (file not in self.file_mtime_dic) or (self.file_mtime_dic[file] != mtime):
+                self.file_mtime_dic[file] = mtime
+                update_mark = True
+
+        return update_mark
+
+    def load_LM_LICENSE_FILE(self):
+        """
+        Get license server list from config/LM_LICENSE_FILE, or environment variable LM_LICENSE_FILE if config/LM_LICENSE_FILE is missing.
+        """
+        if os.path.exists(self.LM_LICENSE_FILE_file):
+            self.license_server_list = common_license.parse_lm_license_file(self.LM_LICENSE_FILE_file)
+        else:
+            self.license_server_list = [license_server for license_server in os.environ.get('LM_LICENSE_FILE', '').split(':') if license_server]
+
+    def get_license_dic(self):
+        """
+        Get self.license_dic with lmstat.
+        """
+        print('>>> Sampling license usage information ...')
+
+        server_state_file = str(config.db_path) + '/license_server_state.json'
+        my_get_license_info = common_license.GetLicenseInfo(lmstat_path=config.lmstat_path, bsub_command=config.lmstat_bsub_command, license_servers=self.license_server_list, max_workers=config.lmstat_max_workers, timeout=config.lmstat_timeout, server_state_file=server_state_file)
         self.license_dic = my_get_license_info.get_license_info()
 
+        # Publish license info for license_monitor and tools, so they need not run lmstat again.
+        my_get_license_info.save_license_snapshot(common_license.get_license_snapshot_file(config), self.license_dic)
+
+        # Stale license info (last good license info of failed license server) is not sampled again.
+        for license_server in list(self.license_dic.keys()):
+            if self.license_dic[license_server].get('stale', False):
+                common.bprint('License info of "' + str(license_server) + '" is stale, skip sampling it.', level='Warning')
+                del self.license_dic[license_server]
+
+    def connect_db_file(self, db_file, mode='read'):
+        """
+        Connect db_file, for daemon mode the connection is kept and reused on next sampling.
+        """
+        if not self.daemon_mode:
+            return common_sqlite3.connect_db_file(db_file, mode)
+
+        if db_file in self.db_conn_dic:
+            conn = self.db_conn_dic[db_file]
+
+            if not os.path.exists(db_file):
+                # The db file is removed, reconnect it.
+                conn.close()
+                del self.db_conn_dic[db_file]
+            elif (mode == 'write') and os.path.exists(str(db_file) + '-journal') and (not conn.in_transaction):
+                common.bprint('Database file "' + str(db_file) + '" is on another connection, will not connect it.', level='Warning')
+                return 'locked', ''
+            else:
+                return 'passed', conn
+
+        (result, conn) = common_sqlite3.connect_db_file(db_file, mode)
+
+        if result == 'passed':
+            self.db_conn_dic[db_file] = conn
+
+        return result, conn
+
+    def close_db_conn(self, conn):
+        """
+        Close db connection, for daemon mode the connection is kept.
+        """
+        if not self.daemon_mode:
+            conn.close()
+
+    def close_all_db_conn(self):
+        """
+        Close all kept db connections.
+        """
+        for conn in self.db_conn_dic.values():
+            conn.close()
+
+        self.db_conn_dic = {}
+
     def create_db_path(self, db_path):
         """
         Create db_path if not exists.
@@ -128,10 +241,10 @@ class Sampling:
         """
         print('>>> Detect project setting ...')
 
-        project_list_file = os.path.realpath(str(os.environ['LICENSE_MONITOR_INSTALL_PATH']) + '/config/project/project_list')
-        project_submit_host_file = os.path.realpath(str(os.environ['LICENSE_MONITOR_INSTALL_PATH']) + '/config/project/project_submit_host')
-        project_execute_host_file = os.path.realpath(str(os.environ['LICENSE_MONITOR_INSTALL_PATH']) + '/config/project/project_execute_host')
-        project_user_file = os.path.realpath(str(os.environ['LICENSE_MONITOR_INSTALL_PATH']) + '/config/project/project_user')
+        project_list_file = self.project_list_file
+        project_submit_host_file = self.project_submit_host_file
+        project_execute_host_file = self.project_execute_host_file
+        project_user_file = self.project_user_file
 
         # Get project_setting_dic.
         copy_mark = False
@@ -144,7 +257,7 @@ class Sampling:
         if not project_setting_dic:
             copy_mark = True
         else:
-            create_time_list = list(os.listdir(project_setting_db_path))
+            create_time_list = sorted(os.listdir(project_setting_db_path))
             latest_create_time = create_time_list[-1]
 
             # Get project_list/project_submit_host/project_execute_host/project_user content on config directory.
@@ -173,69 +286,192 @@ class Sampling:
         """
         print('>>> Sampling usage info ...')
 
+        sample_dic = {}
+
+        # Usage runtime is split into projects with the project settings on config.db_path/project_setting, just like licenseMonitor COST tab.
+        self.project_resolver = common_cost.get_project_resolver(config.db_path, config.project_primary_factors if hasattr(config, 'project_primary_factors') else '')
+
         for license_server in self.license_dic.keys():
             for vendor_daemon in self.license_dic[license_server]['vendor_daemon'].keys():
                 db_path = str(config.db_path) + '/license_server/' + str(license_server) + '/' + str(vendor_daemon)
 
                 self.create_db_path(db_path)
 
-                usage_db_file = str(db_path) + '/usage.db'
-                (result, usage_db_conn) = common_sqlite3.connect_db_file(usage_db_file, mode='write')
+                if self.db_layout == 'consolidated':
+                    cost_day_runtime_dic = self.save_consolidated_usage_info(license_server, vendor_daemon, db_path)
+                else:
+                    cost_day_runtime_dic = self.save_usage_info(license_server, vendor_daemon, db_path)
 
-                if result == 'passed':
-                    usage_table_list = common_sqlite3.get_sql_table_list(usage_db_file, usage_db_conn)
-
-                    key_list = ['id', 'sample_second', 'sample_time', 'server', 'vendor', 'feature', 'user', 'submit_host', 'execute_host', 'num', 'version', 'start_second', 'start_time']
-                    key_type_list = ['INTEGER PRIMARY KEY AUTOINCREMENT', 'INTEGER', 'TEXT', 'TEXT', 'TEXT', 'TEXT', 'TEXT', 'TEXT', 'TEXT', 'TEXT', 'TEXT', 'INTEGER', 'TEXT']
-
-                    for feature in self.license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'].keys():
-                        usage_table_name = feature
-
-                        print('    Sampling usage info for "' + str(license_server) + '/' + str(vendor_daemon) + '/' + str(feature) + '" ...')
-
-                        if usage_table_name not in usage_table_list:
-                            # Generate database table title.
-                            key_string = common_sqlite3.gen_sql_table_key_string(key_list, key_type_list)
-                            common_sqlite3.create_sql_table(usage_db_file, usage_db_conn, usage_table_name, key_string, commit=False)
-
-                            # Insert sql table value.
-                            for usage_dic in self.license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][feature]['in_use_info']:
-                                start_second = common_license.switch_start_time(usage_dic['start_time'], compare_second=self.sample_second)
-                                value_list = ['NULL', self.sample_second, self.sample_time, license_server, vendor_daemon, feature, usage_dic['user'], usage_dic['submit_host'], usage_dic['execute_host'], usage_dic['license_num'], usage_dic['version'], start_second, usage_dic['start_time']]
-                                value_string = common_sqlite3.gen_sql_table_value_string(value_list, autoincrement=True)
-                                common_sqlite3.insert_into_sql_table(usage_db_file, usage_db_conn, usage_table_name, value_string, commit=False)
-                        else:
-                            # Clean up usage database, only keep 100000 items.
-                            usage_table_count = common_sqlite3.get_sql_table_count(usage_db_file, usage_db_conn, usage_table_name)
-
-                            if usage_table_count != 'N/A':
-                                if int(usage_table_count) > 100000:
-                                    row_id = 'sample_time'
-                                    begin_line = 0
-                                    end_line = int(usage_table_count) - 100000
-
-                                    print('    Deleting database "' + str(usage_db_file) + '" table "' + str(usage_table_name) + '" ' + str(begin_line) + '-' + str(end_line) + ' lines to only keep 100000 items.')
-
-                                    common_sqlite3.delete_sql_table_rows(usage_db_file, usage_db_conn, usage_table_name, row_id, begin_line, end_line)
-
-                            for usage_dic in self.license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][feature]['in_use_info']:
-                                select_condition = "WHERE server='" + str(license_server) + "' AND vendor='" + str(vendor_daemon) + "' AND feature='" + str(feature) + "' AND user='" + str(usage_dic['user']) + "' AND submit_host='" + str(usage_dic['submit_host']) + "' AND execute_host='" + str(usage_dic['execute_host']) + "' AND num='" + str(usage_dic['license_num']) + "' AND version='" + str(usage_dic['version']) + "' AND start_time='" + str(usage_dic['start_time']) + "'"
-                                usage_db_data_dic = common_sqlite3.get_sql_table_data(usage_db_file, usage_db_conn, usage_table_name, ['server', 'vendor', 'feature'], select_condition)
-
-                                if usage_db_data_dic:
-                                    # Replace sql table value.
-                                    set_condition = "SET sample_second='" + str(self.sample_second) + "', sample_time='" + str(self.sample_time) + "'"
-                                    where_condition = "WHERE server='" + str(license_server) + "' AND vendor='" + str(vendor_daemon) + "' AND feature='" + str(feature) + "' AND user='" + str(usage_dic['user']) + "' AND submit_host='" + str(usage_dic['submit_host']) + "' AND execute_host='" + str(usage_dic['execute_host']) + "' AND num='" + str(usage_dic['license_num']) + "' AND version='" + str(usage_dic['version']) + "' AND start_time='" + str(usage_dic['start_time']) + "'"
-                                    common_sqlite3.update_sql_table_data(usage_db_file, usage_db_conn, usage_table_name, set_condition, where_condition, commit=False)
-                                else:
-                                    # Insert sql table value.
-                                    start_second = common_license.switch_start_time(usage_dic['start_time'], compare_second=self.sample_second)
-                                    value_list = ['NULL', self.sample_second, self.sample_time, license_server, vendor_daemon, feature, usage_dic['user'], usage_dic['submit_host'], usage_dic['execute_host'], usage_dic['license_num'], usage_dic['version'], start_second, usage_dic['start_time']]
-                                    value_string = common_sqlite3.gen_sql_table_value_string(value_list, autoincrement=True)
-                                    common_sqlite3.insert_into_sql_table(usage_db_file, usage_db_conn, usage_table_name, value_string, commit=False)
-
-                    usage_db_conn.commit()
-                    usage_db_conn.close()
+                if cost_day_runtime_dic is not None:
+                    self.save_cost_day_info(license_server, vendor_daemon, db_path, cost_day_runtime_dic)
+
+                feature_list = list(self.license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'].keys())
+                sample_dic.setdefault(license_server, {})
+                sample_dic[license_server][vendor_daemon] = {'usage': {'feature_list': feature_list, 'sample_second': self.sample_second}}
+
+        self.update_db_catalog(sample_dic)
+
+    def get_usage_value_list_list(self, license_server, vendor_daemon, feature):
+        """
+        Get usage values of specified feature from self.license_dic, value order is common_license_db.USAGE_KEY_LIST[1:].
+        """
+        value_list_list = []
+
+        for usage_dic in self.license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][feature]['in_use_info']:
+            start_second = common_license.switch_start_time(usage_dic['start_time'], compare_second=self.sample_second)
+            value_list_list.append([self.sample_second, self.sample_time, license_server, vendor_daemon, feature, usage_dic['user'], usage_dic['submit_host'], usage_dic['execute_host'], usage_dic['license_num'], usage_dic['version'], start_second, usage_dic['start_time']])
+
+        return value_list_list
+
+    def count_cost_day_runtime(self, usage_db_file, usage_db_conn, usage_table_name, value_list_list, cost_day_runtime_dic):
+        """
+        Count the license runtime since last sample of the usage records (value_list_list) into cost_day_runtime_dic.
+        It must be called before the usage records are saved, since the last sample_second of the saved records is needed.
+        """
+        checkout_index_list = [common_license_db.USAGE_KEY_LIST[1:].index(key) for key in common_license_db.USAGE_CHECKOUT_KEY_LIST]
+        checkout_value_list_list = [[value_list[i] for i in checkout_index_list] for value_list in value_list_list]
+        last_sample_second_list = common_sqlite3.get_sql_table_match_value_list(usage_db_file, usage_db_conn, usage_table_name, 'sample_second', common_license_db.USAGE_CHECKOUT_KEY_LIST, checkout_value_list_list)
+
+        counted_checkout_set = set()
+
+        for (value_list, checkout_value_list, last_sample_second) in zip(value_list_list, checkout_value_list_list, last_sample_second_list):
+            # The repeated checkout records are saved as one usage record.
+            if tuple(checkout_value_list) in counted_checkout_set:
+                continue
+
+            counted_checkout_set.add(tuple(checkout_value_list))
+            (feature, user, submit_host, execute_host, num, start_second) = (value_list[4], value_list[5], value_list[6], value_list[7], value_list[8], value_list[10])
+
+            # Reservations (start_time is "RESERVATION") are not license runtime, just like licenseMonitor COST tab.
+            if not isinstance(start_second, (int, float)):
+                continue
+
+            start_second = int(start_second)
+
+            if last_sample_second is None:
+                begin_second = start_second
+            else:
+                begin_second = max(int(last_sample_second), start_second)
+
+            common_cost.add_cost_day_runtime(cost_day_runtime_dic, feature, submit_host, execute_host, user, num, start_second, begin_second, self.sample_second, self.project_resolver)
+
+    def save_usage_info(self, license_server, vendor_daemon, db_path):
+        """
+        Save usage info into usage.db (legacy layout), every feature is a table.
+        Return the license runtime since last sample for cost_day (None if usage info is not saved).
+        """
+        usage_db_file = common_license_db.get_legacy_db_file(db_path, 'usage')
+        (result, usage_db_conn) = self.connect_db_file(usage_db_file, mode='write')
+        cost_day_runtime_dic = None
+
+        if result == 'passed':
+            cost_day_runtime_dic = {}
+
+            usage_table_list = common_sqlite3.get_sql_table_list(usage_db_file, usage_db_conn)
+            usage_index_list = common_sqlite3.get_sql_index_list(usage_db_file, usage_db_conn)
+
+            for feature in self.license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'].keys():
+                usage_table_name = feature
+                # Index names share the namespace with table (feature) names, so use a prefix which feature names never have.
+                usage_index_name = '__checkout_' + str(feature)
+
+                print('    Sampling usage info for "' + str(license_server) + '/' + str(vendor_daemon) + '/' + str(feature) + '" ...')
+
+                if usage_table_name not in usage_table_list:
+                    # Generate database table title.
+                    key_string = common_sqlite3.gen_sql_table_key_string(common_license_db.USAGE_KEY_LIST, common_license_db.USAGE_KEY_TYPE_LIST)
+                    common_sqlite3.create_sql_table(usage_db_file, usage_db_conn, usage_table_name, key_string, commit=False)
+                else:
+                    # Clean up usage database, only keep 100000 items.
+                    usage_table_count = common_sqlite3.get_sql_table_count(usage_db_file, usage_db_conn, usage_table_name)
+
+                    if usage_table_count != 'N/A':
+                        if int(usage_table_count) > 100000:
+                            row_id = 'sample_time'
+                            begin_line = 0
+                            end_line = int(usage_table_count) - 100000
+
+                            print('    Deleting database "' + str(usage_db_file) + '" table "' + str(usage_table_name) + '" ' + str(begin_line) + '-' + str(end_line) + ' lines to only keep 100000 items.')
+
+                            common_sqlite3.delete_sql_table_rows(usage_db_file, usage_db_conn, usage_table_name, row_id, begin_line, end_line, commit=False)
+
+                    # Old tables may have duplicate checkout rows, remove them before creating the unique index.
+                    if usage_index_name not in usage_index_list:
+                        common_sqlite3.delete_sql_table_duplicate_rows(usage_db_file, usage_db_conn, usage_table_name, 'id', common_license_db.USAGE_CHECKOUT_KEY_LIST, commit=False)
+
+                # One checkout identity only has one row, it is the conflict target of the upsert.
+                usage_index_ready = (usage_index_name in usage_index_list) or common_sqlite3.create_sql_index(usage_db_file, usage_db_conn, usage_index_name, usage_table_name, common_license_db.USAGE_CHECKOUT_KEY_LIST, unique=True, commit=False)
+
+                # Insert new checkouts and refresh sample_second/sample_time of the existing checkouts with one batch.
+                value_list_list = self.get_usage_value_list_list(license_server, vendor_daemon, feature)
+                self.count_cost_day_runtime(usage_db_file, usage_db_conn, usage_table_name, value_list_list, cost_day_runtime_dic)
+
+                if usage_index_ready:
+                    common_sqlite3.upsert_into_sql_table(usage_db_file, usage_db_conn, usage_table_name, common_license_db.USAGE_KEY_LIST[1:], value_list_list, common_license_db.USAGE_CHECKOUT_KEY_LIST, ['sample_second', 'sample_time'], commit=False)
+                else:
+                    # Without the unique index, update or insert the checkouts one by one.
+                    common_sqlite3.update_or_insert_into_sql_table(usage_db_file, usage_db_conn, usage_table_name, common_license_db.USAGE_KEY_LIST[1:], value_list_list, common_license_db.USAGE_CHECKOUT_KEY_LIST, ['sample_second', 'sample_time'], commit=False)
+
+            usage_db_conn.commit()
+            self.close_db_conn(usage_db_conn)
+
+        return cost_day_runtime_dic
+
+    def save_consolidated_usage_info(self, license_server, vendor_daemon, db_path):
+        """
+        Save usage info into consolidated_usage.db (consolidated layout), all features are on table "usage".
+        Return the license runtime since last sample for cost_day (None if usage info is not saved).
+        """
+        usage_db_file = common_license_db.get_consolidated_db_file(db_path, 'usage')
+        (result, usage_db_conn) = self.connect_db_file(usage_db_file, mode='write')
+        cost_day_runtime_dic = None
+
+        if result == 'passed':
+            cost_day_runtime_dic = {}
+
+            print('    Sampling usage info for "' + str(license_server) + '/' + str(vendor_daemon) + '" ...')
+
+            common_license_db.init_consolidated_db(usage_db_file, usage_db_conn, 'usage', commit=False)
+            common_license_db.cleanup_consolidated_db(usage_db_file, usage_db_conn, 'usage', self.sample_second, commit=False)
+
+            feature_list = list(self.license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'].keys())
+            value_list_list = []
+
+            for feature in feature_list:
+                value_list_list.extend(self.get_usage_value_list_list(license_server, vendor_daemon, feature))
+
+            common_license_db.save_consolidated_feature_list(usage_db_file, usage_db_conn, feature_list, commit=False)
+            self.count_cost_day_runtime(usage_db_file, usage_db_conn, 'usage', value_list_list, cost_day_runtime_dic)
+            common_sqlite3.upsert_into_sql_table(usage_db_file, usage_db_conn, 'usage', common_license_db.USAGE_KEY_LIST[1:], value_list_list, common_license_db.USAGE_CHECKOUT_KEY_LIST, ['sample_second', 'sample_time'], commit=False)
+
+            usage_db_conn.commit()
+            self.close_db_conn(usage_db_conn)
+
+        return cost_day_runtime_dic
+
+    def save_cost_day_info(self, license_server, vendor_daemon, db_path, cost_day_runtime_dic):
+        """
+        Add the license runtime since last sample into consolidated_cost_day.db (with both db layouts), one row for every feature/sample_date/project.
+        It is saved after usage info is committed, so the runtime is missed rather than counted twice on failure (tools/backfill_cost_day can rebuild it).
+        """
+        cost_day_db_file = common_license_db.get_consolidated_db_file(db_path, 'cost_day')
+        (result, cost_day_db_conn) = self.connect_db_file(cost_day_db_file, mode='write')
+
+        if result == 'passed':
+            print('    Saving cost day info for "' + str(license_server) + '/' + str(vendor_daemon) + '" ...')
+
+            common_license_db.init_cost_day_db(cost_day_db_file, cost_day_db_conn, commit=False)
+
+            if common_license_db.get_cost_day_begin_date(cost_day_db_file, cost_day_db_conn) is None:
+                # The usage records which are released before the first sample are not counted, so cost_day info is complete from next day.
+                begin_date = (datetime.date.fromtimestamp(self.sample_second) + datetime.timedelta(days=1)).strftime('%Y%m%d')
+                common_license_db.set_cost_day_begin_date(cost_day_db_file, cost_day_db_conn, begin_date, commit=False)
+
+            common_license_db.cleanup_cost_day_db(cost_day_db_file, cost_day_db_conn, self.sample_second, commit=False)
+            common_license_db.save_cost_day_runtime(cost_day_db_file, cost_day_db_conn, cost_day_runtime_dic, commit=False)
+
+            cost_day_db_conn.commit()
+            self.close_db_conn(cost_day_db_conn)
 
     def sample_utilization_info(self):
         """
@@ -243,55 +479,101 @@ class Sampling:
         """
         print('>>> Sampling utilization info ...')
 
+        sample_dic = {}
+
         for license_server in self.license_dic.keys():
             for vendor_daemon in self.license_dic[license_server]['vendor_daemon'].keys():
                 db_path = str(config.db_path) + '/license_server/' + str(license_server) + '/' + str(vendor_daemon)
 
                 self.create_db_path(db_path)
 
-                utilization_db_file = str(db_path) + '/utilization.db'
-                (result, utilization_db_conn) = common_sqlite3.connect_db_file(utilization_db_file, mode='write')
+                feature_utilization_dic = self.get_feature_utilization_info(specified_license_server=license_server, specified_vendor_daemon=vendor_daemon)
+
+                if self.db_layout == 'consolidated':
+                    result = self.save_consolidated_utilization_info(license_server, vendor_daemon, db_path, feature_utilization_dic)
+                else:
+                    result = self.save_utilization_info(license_server, vendor_daemon, db_path, feature_utilization_dic)
 
+                # Only count the samples which are saved into utilization db, so utilization_day is consistent with it.
                 if result == 'passed':
-                    utilization_table_list = common_sqlite3.get_sql_table_list(utilization_db_file, utilization_db_conn)
-                    feature_utilization_dic = self.get_feature_utilization_info(specified_license_server=license_server, specified_vendor_daemon=vendor_daemon)
+                    self.save_utilization_day_info(license_server, vendor_daemon, db_path, feature_utilization_dic)
 
-                    key_list = ['sample_second', 'sample_time', 'issued', 'in_use', 'utilization']
-                    key_type_list = ['INTEGER PRIMARY KEY', 'TEXT', 'TEXT', 'INTEGER', 'TEXT']
+                    feature_list = list(feature_utilization_dic.keys())
+                    sample_dic.setdefault(license_server, {})
+                    sample_dic[license_server][vendor_daemon] = {'utilization': {'feature_list': feature_list, 'sample_second': self.sample_second},
+                                                                 'utilization_day': {'feature_list': feature_list, 'sample_second': self.sample_second}}
 
-                    for (feature, feature_dic) in feature_utilization_dic.items():
-                        utilization_table_name = feature
+        self.update_db_catalog(sample_dic)
+
+    def save_utilization_info(self, license_server, vendor_daemon, db_path, feature_utilization_dic):
+        """
+        Save utilization info into utilization.db (legacy layout), every feature is a table.
+        """
+        utilization_db_file = common_license_db.get_legacy_db_file(db_path, 'utilization')
+        (result, utilization_db_conn) = self.connect_db_file(utilization_db_file, mode='write')
 
-                        print('    Sampling utilization info for "' + str(license_server) + '/' + str(vendor_daemon) + '/' + str(feature) + '" ...')
+        if result == 'passed':
+            utilization_table_list = common_sqlite3.get_sql_table_list(utilization_db_file, utilization_db_conn)
 
-                        # Clean up utilization database, only keep 100000 items.
-                        if utilization_table_name in utilization_table_list:
-                            utilization_table_count = common_sqlite3.get_sql_table_count(utilization_db_file, utilization_db_conn, utilization_table_name)
+            for (feature, feature_dic) in feature_utilization_dic.items():
+                utilization_table_name = feature
 
-                            if utilization_table_count != 'N/A':
-                                if int(utilization_table_count) > 100000:
-                                    row_id = 'sample_time'
-                                    begin_line = 0
-                                    end_line = int(utilization_table_count) - 100000
+                print('    Sampling utilization info for "' + str(license_server) + '/' + str(vendor_daemon) + '/' + str(feature) + '" ...')
 
-                                    print('    Deleting database "' + str(utilization_db_file) + '" table "' + str(utilization_table_name) + '" ' + str(begin_line) + '-' + str(end_line) + ' lines to only keep 100000 items.')
+                # Clean up utilization database, only keep 100000 items.
+                if utilization_table_name in utilization_table_list:
+                    utilization_table_count = common_sqlite3.get_sql_table_count(utilization_db_file, utilization_db_conn, utilization_table_name)
 
-                                    common_sqlite3.delete_sql_table_rows(utilization_db_file, utilization_db_conn, utilization_table_name, row_id, begin_line, end_line)
+                    if utilization_table_count != 'N/A':
+                        if int(utilization_table_count) > 100000:
+                            row_id = 'sample_time'
+                            begin_line = 0
+                            end_line = int(utilization_table_count) - 100000
 
-                        # Generate sql table.
-                        if utilization_table_name not in utilization_table_list:
-                            key_string = common_sqlite3.gen_sql_table_key_string(key_list, key_type_list)
-                            common_sqlite3.create_sql_table(utilization_db_file, utilization_db_conn, utilization_table_name, key_string, commit=False)
+                            print('    Deleting database "' + str(utilization_db_file) + '" table "' + str(utilization_table_name) + '" ' + str(begin_line) + '-' + str(end_line) + ' lines to only keep 100000 items.')
 
-                        # Insert sql table value.
-                        value_list = [self.sample_second, self.sample_time, feature_dic['issued'], feature_dic['in_use'], feature_dic['utilization']]
-                        value_string = common_sqlite3.gen_sql_table_value_string(value_list)
-                        common_sqlite3.insert_into_sql_table(utilization_db_file, utilization_db_conn, utilization_table_name, value_string, commit=False)
+                            common_sqlite3.delete_sql_table_rows(utilization_db_file, utilization_db_conn, utilization_table_name, row_id, begin_line, end_line)
 
-                    utilization_db_conn.commit()
-                    utilization_db_conn.close()
+                # Generate sql table.
+                if utilization_table_name not in utilization_table_list:
+                    key_string = common_sqlite3.gen_sql_table_key_string(common_license_db.UTILIZATION_KEY_LIST, common_license_db.UTILIZATION_KEY_TYPE_LIST)
+                    common_sqlite3.create_sql_table(utilization_db_file, utilization_db_conn, utilization_table_name, key_string, commit=False)
 
-        self.count_utilization_day_info()
+                # Insert sql table value.
+                value_list = [self.sample_second, self.sample_time, feature_dic['issued'], feature_dic['in_use'], feature_dic['utilization']]
+                value_string = common_sqlite3.gen_sql_table_value_string(value_list)
+                common_sqlite3.insert_into_sql_table(utilization_db_file, utilization_db_conn, utilization_table_name, value_string, commit=False)
+
+            utilization_db_conn.commit()
+            self.close_db_conn(utilization_db_conn)
+
+        return result
+
+    def save_consolidated_utilization_info(self, license_server, vendor_daemon, db_path, feature_utilization_dic):
+        """
+        Save utilization info into consolidated_utilization.db (consolidated layout), all features are on table "utilization".
+        """
+        utilization_db_file = common_license_db.get_consolidated_db_file(db_path, 'utilization')
+        (result, utilization_db_conn) = self.connect_db_file(utilization_db_file, mode='write')
+
+        if result == 'passed':
+            print('    Sampling utilization info for "' + str(license_server) + '/' + str(vendor_daemon) + '" ...')
+
+            common_license_db.init_consolidated_db(utilization_db_file, utilization_db_conn, 'utilization', commit=False)
+            common_license_db.cleanup_consolidated_db(utilization_db_file, utilization_db_conn, 'utilization', self.sample_second, commit=False)
+
+            value_list_list = []
+
+            for (feature, feature_dic) in feature_utilization_dic.items():
+                value_list_list.append([feature, self.sample_second, self.sample_time, feature_dic['issued'], feature_dic['in_use'], feature_dic['utilization']])
+
+            common_license_db.save_consolidated_feature_list(utilization_db_file, utilization_db_conn, list(feature_utilization_dic.keys()), commit=False)
+            common_sqlite3.insert_many_into_sql_table(utilization_db_file, utilization_db_conn, 'utilization', common_license_db.CONSOLIDATED_TABLE_DIC['utilization']['key_list'], value_list_list, commit=False)
+
+            utilization_db_conn.commit()
+            self.close_db_conn(utilization_db_conn)
+
+        return result
 
     def get_feature_utilization_info(self, specified_license_server, specified_vendor_daemon):
         """
@@ -344,148 +626,174 @@ class Sampling:
 
         return feature_utilization_dic
 
-    def count_utilization_day_info(self):
+    def save_utilization_day_info(self, license_server, vendor_daemon, db_path, feature_utilization_dic):
         """
-        Count license feature utilization day info and save it into sqlite db.
+        Update current day utilization (day average) info with the new utilization samples.
+        The running state (sample_num/issued_sum/in_use_sum/utilization_sum) is saved with the day average, so the samples of current day are not recounted.
         """
-        print('')
-        print('>>> Counting utilization (day average) info ...')
-
-        for license_server in self.license_dic.keys():
-            for vendor_daemon in self.license_dic[license_server]['vendor_daemon'].keys():
-                utilization_day_db_file = str(config.db_path) + '/license_server/' + str(license_server) + '/' + str(vendor_daemon) + '/utilization_day.db'
-                (result, utilization_day_db_conn) = common_sqlite3.connect_db_file(utilization_day_db_file, mode='write')
+        if self.db_layout == 'consolidated':
+            utilization_db_file = common_license_db.get_consolidated_db_file(db_path, 'utilization')
+            utilization_day_db_file = common_license_db.get_consolidated_db_file(db_path, 'utilization_day')
+        else:
+            utilization_db_file = common_license_db.get_legacy_db_file(db_path, 'utilization')
+            utilization_day_db_file = common_license_db.get_legacy_db_file(db_path, 'utilization_day')
 
-                if result == 'passed':
-                    utilization_day_table_list = common_sqlite3.get_sql_table_list(utilization_day_db_file, utilization_day_db_conn)
-                    utilization_day_dic = self.get_utilization_day_info(specified_license_server=license_server, specified_vendor_daemon=vendor_daemon)
-
-                    key_list = ['sample_date', 'issued', 'in_use', 'utilization']
-                    key_type_list = ['TEXT PRIMARY KEY', 'TEXT', 'INTEGER', 'TEXT']
-
-                    for (utilization_day_table_name, utilization_day_table_dic) in utilization_day_dic.items():
-                        print('    Counting utilization (day average) info for "' + str(license_server) + '/' + str(vendor_daemon) + '/' + str(utilization_day_table_name) + '" ...')
-
-                        # Generate sql table.
-                        if utilization_day_table_name not in utilization_day_table_list:
-                            key_string = common_sqlite3.gen_sql_table_key_string(key_list, key_type_list)
-                            common_sqlite3.create_sql_table(utilization_day_db_file, utilization_day_db_conn, utilization_day_table_name, key_string, commit=False)
-
-                            # Insert sql table value.
-                            value_list = [self.sample_date, utilization_day_table_dic['issued'], utilization_day_table_dic['in_use'], utilization_day_table_dic['utilization']]
-                            value_string = common_sqlite3.gen_sql_table_value_string(value_list)
-                            common_sqlite3.insert_into_sql_table(utilization_day_db_file, utilization_day_db_conn, utilization_day_table_name, value_string, commit=False)
-                        else:
-                            # Clean up utilization database, only keep 3650 items.
-                            utilization_day_table_count = common_sqlite3.get_sql_table_count(utilization_day_db_file, utilization_day_db_conn, utilization_day_table_name)
-
-                            if utilization_day_table_count != 'N/A':
-                                if int(utilization_day_table_count) > 3650:
-                                    row_id = 'sample_time'
-                                    begin_line = 0
-                                    end_line = int(utilization_day_table_count) - 3650
-
-                                    print('    Deleting database "' + str(utilization_day_db_file) + '" table "' + str(utilization_day_table_name) + '" ' + str(begin_line) + '-' + str(end_line) + ' lines to only keep 100000 items.')
-
-                                    common_sqlite3.delete_sql_table_rows(utilization_day_db_file, utilization_day_db_conn, utilization_day_table_name, row_id, begin_line, end_line)
-
-                            select_condition = "WHERE sample_date='" + str(self.sample_date) + "'"
-                            utilization_day_db_data_dic = common_sqlite3.get_sql_table_data(utilization_day_db_file, utilization_day_db_conn, utilization_day_table_name, ['issued', 'in_use', 'utilization'], select_condition)
-
-                            if utilization_day_db_data_dic:
-                                # Replace sql table value.
-                                set_condition = "SET issued='" + str(utilization_day_table_dic['issued']) + "', in_use='" + str(utilization_day_table_dic['in_use']) + "', utilization='" + str(utilization_day_table_dic['utilization']) + "'"
-                                where_condition = "WHERE sample_date='" + str(self.sample_date) + "'"
-                                common_sqlite3.update_sql_table_data(utilization_day_db_file, utilization_day_db_conn, utilization_day_table_name, set_condition, where_condition, commit=False)
-                            else:
-                                # Insert sql table value.
-                                value_list = [self.sample_date, utilization_day_table_dic['issued'], utilization_day_table_dic['in_use'], utilization_day_table_dic['utilization']]
-                                value_string = common_sqlite3.gen_sql_table_value_string(value_list)
-                                common_sqlite3.insert_into_sql_table(utilization_day_db_file, utilization_day_db_conn, utilization_day_table_name, value_string, commit=False)
-
-                    utilization_day_db_conn.commit()
-                    utilization_day_db_conn.close()
-
-    def get_utilization_day_info(self, specified_license_server, specified_vendor_daemon):
-        """
-        Get current day issued/in_use/utilization info from sqlite3 database.
-        Reture issued_avg/in_use_avg/utilization_avg info with utilization_day_dic.
-        """
-        utilization_day_dic = {}
-        begin_time = str(self.sample_date) + ' 00:00:00'
-        begin_second = time.mktime(time.strptime(begin_time, '%Y%m%d %H:%M:%S'))
-        end_time = str(self.sample_date) + ' 23:59:59'
-        end_second = time.mktime(time.strptime(end_time, '%Y%m%d %H:%M:%S'))
-        select_condition = "WHERE sample_second BETWEEN '" + str(begin_second) + "' AND '" + str(end_second) + "'"
+        (result, utilization_day_db_conn) = self.connect_db_file(utilization_day_db_file, mode='write')
 
-        for license_server in self.license_dic.keys():
-            if license_server == specified_license_server:
-                for vendor_daemon in self.license_dic[license_server]['vendor_daemon'].keys():
-                    if vendor_daemon == specified_vendor_daemon:
-                        utilization_db_file = str(config.db_path) + '/license_server/' + str(license_server) + '/' + str(vendor_daemon) + '/utilization.db'
+        if result == 'passed':
+            print('    Counting utilization (day average) info for "' + str(license_server) + '/' + str(vendor_daemon) + '" ...')
 
-                        if os.path.exists(utilization_db_file):
-                            (result, utilization_db_conn) = common_sqlite3.connect_db_file(utilization_db_file, mode='read')
+            if self.db_layout == 'consolidated':
+                common_license_db.init_consolidated_db(utilization_day_db_file, utilization_day_db_conn, 'utilization_day', commit=False)
+                common_license_db.cleanup_consolidated_db(utilization_day_db_file, utilization_day_db_conn, 'utilization_day', self.sample_second, commit=False)
+            else:
+                # Clean up utilization_day database, only keep 3650 items.
+                for utilization_day_table_name in common_sqlite3.get_sql_table_list(utilization_day_db_file, utilization_day_db_conn):
+                    if utilization_day_table_name in feature_utilization_dic:
+                        utilization_day_table_count = common_sqlite3.get_sql_table_count(utilization_day_db_file, utilization_day_db_conn, utilization_day_table_name)
 
-                            if result == 'passed':
-                                utilization_table_list = common_sqlite3.get_sql_table_list(utilization_db_file, utilization_db_conn)
+                        if (utilization_day_table_count != 'N/A') and (int(utilization_day_table_count) > 3650):
+                            row_id = 'sample_date'
+                            begin_line = 0
+                            end_line = int(utilization_day_table_count) - 3650
 
-                                for utilization_table_name in utilization_table_list:
-                                    # Get current day issued/in_use/utilization from sqlite3 database.
-                                    utilization_db_data_dic = common_sqlite3.get_sql_table_data(utilization_db_file, utilization_db_conn, utilization_table_name, ['issued', 'in_use', 'utilization'], select_condition)
+                            print('    Deleting database "' + str(utilization_day_db_file) + '" table "' + str(utilization_day_table_name) + '" ' + str(begin_line) + '-' + str(end_line) + ' lines to only keep 3650 items.')
 
-                                    if utilization_db_data_dic:
-                                        # Get issued_sum/in_use_sum/utilization_sum info.
-                                        issued_sum = 0
-                                        in_use_sum = 0
-                                        utilization_sum = 0
+                            common_sqlite3.delete_sql_table_rows(utilization_day_db_file, utilization_day_db_conn, utilization_day_table_name, row_id, begin_line, end_line)
 
-                                        for (i, issued) in enumerate(utilization_db_data_dic['issued']):
-                                            if (issued == 'Uncounted') or (issued_sum == 'Uncounted'):
-                                                issued_sum = 'Uncounted'
-                                            else:
-                                                issued_sum += int(issued)
+            utilization_day_dic = common_license_db.get_utilization_day_info(utilization_day_db_file, utilization_day_db_conn, self.sample_date, list(feature_utilization_dic.keys()))
+            feature_sum_dic = {}
+            recount_feature_list = []
 
-                                            in_use_sum += int(utilization_db_data_dic['in_use'][i])
-                                            utilization_sum += float(utilization_db_data_dic['utilization'][i])
+            for (feature, feature_dic) in feature_utilization_dic.items():
+                if feature not in utilization_day_dic:
+                    feature_sum_dic[feature] = common_license_db.count_utilization_day_sum({}, feature_dic['issued'], feature_dic['in_use'], feature_dic['utilization'])
+                elif utilization_day_dic[feature]['sample_num'] is None:
+                    recount_feature_list.append(feature)
+                else:
+                    sum_dic = {key: utilization_day_dic[feature][key] for key in common_license_db.UTILIZATION_DAY_SUM_KEY_LIST}
+                    feature_sum_dic[feature] = common_license_db.count_utilization_day_sum(sum_dic, feature_dic['issued'], feature_dic['in_use'], feature_dic['utilization'])
 
-                                        # Get issued_avg/in_use_avg/utilization_avg info.
-                                        if issued_sum == 'Uncounted':
-                                            issued_avg = 'Uncounted'
-                                        else:
-                                            issued_avg = round(issued_sum/len(utilization_db_data_dic['issued']), 1)
+            # Current day row is saved by old version without running state, recount it from utilization db (current sample is included).
+            if recount_feature_list:
+                (result, utilization_db_conn) = self.connect_db_file(utilization_db_file, mode='read')
 
-                                        in_use_avg = round(in_use_sum/len(utilization_db_data_dic['issued']), 1)
-                                        utilization_avg = round(utilization_sum/len(utilization_db_data_dic['issued']), 1)
+                if result == 'passed':
+                    feature_sum_dic.update(common_license_db.get_utilization_day_sum_from_raw(utilization_db_file, utilization_db_conn, self.sample_date, recount_feature_list))
+                    self.close_db_conn(utilization_db_conn)
 
-                                        utilization_day_dic[utilization_table_name] = {'issued': issued_avg, 'in_use': in_use_avg, 'utilization': utilization_avg}
+            common_license_db.save_utilization_day_sum(utilization_day_db_file, utilization_day_db_conn, self.sample_date, feature_sum_dic, commit=False)
 
-        return utilization_day_dic
+            utilization_day_db_conn.commit()
+            self.close_db_conn(utilization_day_db_conn)
 
-    def sampling(self):
-        if hasattr(config, 'db_path') and config.db_path:
-            if self.usage_sampling:
-                p = Process(target=self.sample_usage_info)
-                p.start()
+    def update_db_catalog(self, sample_dic):
+        """
+        Update config.db_path/db_catalog.json with the new samples, so licenseMonitor need not scan config.db_path on every query.
+        """
+        print('    Updating db catalog "' + str(common_license_db.get_db_catalog_file(config.db_path)) + '" ...')
 
-            if self.utilization_sampling:
-                p = Process(target=self.sample_utilization_info)
-                p.start()
+        try:
+            common_license_db.update_db_catalog(config.db_path, sample_dic, self.db_layout)
+        except Exception as warning:
+            common.bprint('Failed on updating db catalog.', level='Warning')
+            common.bprint(warning, color='yellow', display_method=1, indent=11)
 
-            p.join()
-        else:
+    def check_db_path(self):
+        """
+        Make sure config.db_path is specified.
+        """
+        if not (hasattr(config, 'db_path') and config.db_path):
             common.bprint('No "db_path" is specified on config/config.py.', level='Error')
             sys.exit(1)
 
+    def sampling(self):
+        """
+        Sample once, usage and utilization info are sampled on different processes.
+        """
+        self.check_db_path()
+        self.load_LM_LICENSE_FILE()
+        self.get_license_dic()
+        self.detect_project_setting()
+
+        if self.usage_sampling:
+            p = Process(target=self.sample_usage_info)
+            p.start()
+
+        if self.utilization_sampling:
+            p = Process(target=self.sample_utilization_info)
+            p.start()
+
+        p.join()
+
+    def stop_daemon_sampling(self, signum, frame):
+        raise KeyboardInterrupt
+
+    def daemon_sampling(self, interval):
+        """
+        Keep sampling on a fixed clock (every interval seconds), db connections and config are kept between samplings.
+        config/LM_LICENSE_FILE and project files are reloaded only if they are updated.
+        """
+        self.check_db_path()
+
+        # Stop daemon on SIGTERM just like on Ctrl-C, so kept db connections are closed.
+        signal.signal(signal.SIGTERM, self.stop_daemon_sampling)
+
+        common.bprint('Start sampling daemon, interval is ' + str(interval) + ' seconds.', date_format='%Y-%m-%d %H:%M:%S')
+
+        try:
+            while True:
+                self.update_sample_time()
+
+                try:
+                    if self.check_file_update([self.LM_LICENSE_FILE_file]):
+                        self.load_LM_LICENSE_FILE()
+
+                    self.get_license_dic()
+
+                    if self.check_file_update([self.project_list_file, self.project_submit_host_file, self.project_execute_host_file, self.project_user_file]):
+                        self.detect_project_setting()
+
+                    if self.usage_sampling:
+                        self.sample_usage_info()
+
+                    if self.utilization_sampling:
+                        self.sample_utilization_info()
+                except Exception as error:
+                    common.bprint('Failed on sampling license info at ' + str(self.sample_time) + '.', date_format='%Y-%m-%d %H:%M:%S', level='Error')
+                    common.bprint(error, color='red', display_method=1, indent=9)
+
+                    # Drop uncommitted changes, so the kept connections start with a clean transaction on next sampling.
+                    for conn in self.db_conn_dic.values():
+                        if conn.in_transaction:
+                            conn.rollback()
+
+                # Next sample time is aligned to the fixed clock, so sampling time drift is not accumulated.
+                # If sampling takes longer than interval, the missed sample time is skipped.
+                current_second = time.time()
+                next_sample_second = (int(current_second // interval) + 1) * interval
+
+                if current_second - self.sample_second > interval:
+                    common.bprint('Sampling takes ' + str(int(current_second - self.sample_second)) + ' seconds, longer than interval ' + str(interval) + ' seconds.', date_format='%Y-%m-%d %H:%M:%S', level='Warning')
+
+                time.sleep(max(0, next_sample_second - time.time()))
+        except KeyboardInterrupt:
+            common.bprint('Stop sampling daemon.', date_format='%Y-%m-%d %H:%M:%S')
+        finally:
+            self.close_all_db_conn()
+
 
 ################
 # Main Process #
 ################
 def main():
-    (usage, utilization) = read_args()
-    my_sampling = Sampling(usage, utilization)
-    my_sampling.detect_project_setting()
-    my_sampling.sampling()
+    (usage, utilization, daemon, interval) = read_args()
+    my_sampling = Sampling(usage, utilization, daemon_mode=daemon)
+
+    if daemon:
+        my_sampling.daemon_sampling(interval)
+    else:
+        my_sampling.sampling()
 
 
 if __name__ == '__main__':
@@ -1,11 +1,13 @@
 import os
 import re
-import pandas
-import socket
-import paramiko
+import sys
+import time
+import builtins
 import datetime
 import getpass
+import threading
 import subprocess
+import collections
 
 
 def bprint(message, color='', background_color='', display_method='', date_format='', level='', indent=0, end='\n', save_file='', save_file_method='a'):
@@ -309,6 +311,30 @@ def run_command(command, mystdin=subprocess.PIPE, mystdout=subprocess.PIPE, myst
     return SP.returncode, stdout, stderr
 
 
+def load_tool_module(tool_name):
+    """
+    Load tool script <LICENSE_MONITOR_INSTALL_PATH>/tools/<tool_name>.py as module by path.
+    tools is not a package, so "from tools import ..." may import another "tools" package on sys.path.
+    """
+    module_name = 'license_monitor_tools_' + str(tool_name)
+
+    if module_name not in sys.modules:
+        import importlib.util
+
+        tool_file = str(os.environ['LICENSE_MONITOR_INSTALL_PATH']) + '/tools/' + str(tool_name) + '.py'
+        spec = importlib.util.spec_from_file_location(module_name, tool_file)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+
+        try:
+            spec.loader.exec_module(module)
+        except Exception:
+            del sys.modules[module_name]
+            raise
+
+    return sys.modules[module_name]
+
+
 def write_csv(csv_file, content_dic):
     """
     Write csv with content_dic.
@@ -318,6 +344,9 @@ def write_csv(csv_file, content_dic):
         ...
     }
     """
+    # pandas is slow to import, it is only imported on writing csv.
+    import pandas
+
     df = pandas.DataFrame(content_dic)
     df.to_csv(csv_file, index=False)
 
@@ -326,6 +355,10 @@ def ssh_client(host_name='', port=22, user_name=getpass.getuser(), password='',
     """
     Ssh specified host, execute specified command, get stdout informaiton (return stdout_list).
     """
+    # paramiko is slow to import, it is only imported on ssh.
+    import socket
+    import paramiko
+
     stdout_list = []
     client = paramiko.SSHClient()
 
@@ -478,3 +511,197 @@ def parse_project_setting_db_path(db_path):
                     project_setting_dic[create_time].setdefault(item_name, item_value)
 
     return project_setting_dic
+
+
+class TrigramIndex():
+    """
+    Case-insensitive substring index for names (like license feature/product names).
+    search(pattern) gets the items which contain pattern, it is the same as re.search(re.escape(pattern.lower()), item.lower()), but only the items which have all the trigrams of pattern are checked.
+    It is thread-safe, licenseMonitor searches it on db reader threads while the completers add items on GUI thread.
+    """
+    def __init__(self, item_list=[], max_cache_num=1000):
+        self.item_list = []
+        self.lower_item_list = []
+        self.item_id_dic = {}
+        self.trigram_dic = {}
+        self.max_cache_num = max_cache_num
+        self.search_cache_dic = {}
+        self.lock = threading.Lock()
+
+        self.add_item_list(item_list)
+
+    def __contains__(self, item):
+        return item in self.item_id_dic
+
+    def add_item_list(self, item_list):
+        """
+        Add new items into the index, the existing items are ignored.
+        """
+        with self.lock:
+            for item in item_list:
+                if item in self.item_id_dic:
+                    continue
+
+                item_id = len(self.item_list)
+                lower_item = item.lower()
+                self.item_id_dic[item] = item_id
+                self.item_list.append(item)
+                self.lower_item_list.append(lower_item)
+
+                for i in range(len(lower_item) - 2):
+                    self.trigram_dic.setdefault(lower_item[i:i + 3], set()).add(item_id)
+
+                self.search_cache_dic = {}
+
+    def search(self, pattern):
+        """
+        Get the items (frozenset) which contain pattern (case-insensitive).
+        """
+        with self.lock:
+            return self.search_item_set(pattern.lower())
+
+    def search_item_set(self, lower_pattern):
+        """
+        Get the items which contain lower_pattern, self.lock must be held by the caller.
+        """
+        if lower_pattern in self.search_cache_dic:
+            return self.search_cache_dic[lower_pattern]
+
+        if len(lower_pattern) < 3:
+            item_set = frozenset(item for (item, lower_item) in zip(self.item_list, self.lower_item_list) if lower_pattern in lower_item)
+        else:
+            item_id_set_list = []
+
+            for i in range(len(lower_pattern) - 2):
+                item_id_set_list.append(self.trigram_dic.get(lower_pattern[i:i + 3], set()))
+
+            item_id_set_list.sort(key=len)
+            item_id_set = item_id_set_list[0].intersection(*item_id_set_list[1:])
+            item_set = frozenset(self.item_list[item_id] for item_id in item_id_set if lower_pattern in self.lower_item_list[item_id])
+
+        if len(self.search_cache_dic) >= self.max_cache_num:
+            self.search_cache_dic = {}
+
+        self.search_cache_dic[lower_pattern] = item_set
+
+        return item_set
+
+    def filter(self, pattern, item_list):
+        """
+        Get the items on item_list which contain pattern (case-insensitive), the order of item_list is kept.
+        The index is not changed, the items which are not on the index are checked one by one.
+        """
+        lower_pattern = pattern.lower()
+
+        with self.lock:
+            item_set = self.search_item_set(lower_pattern)
+
+            return [item for item in item_list if (item in item_set) or ((item not in self.item_id_dic) and (lower_pattern in item.lower()))]
+
+
+def get_object_size(obj):
+    """
+    Get the approximate memory size (bytes) of obj, including the items of dict/list/tuple/set.
+    """
+    object_size = sys.getsizeof(obj)
+
+    if isinstance(obj, dict):
+        object_size += sum(get_object_size(key) + get_object_size(value) for (key, value) in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        object_size += sum(get_object_size(item) for item in obj)
+
+    return object_size
+
+
+class LruCache():
+    """
+    Thread-safe least-recently-used cache, the total size of cached values is limited to max_size (bytes).
+    The cached values are shared with the callers, so they should not be modified.
+    """
+    def __init__(self, max_size=0):
+        self.max_size = max_size
+        self.total_size = 0
+        self.cache_dic = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key not in self.cache_dic:
+                return default
+
+            self.cache_dic.move_to_end(key)
+
+            return self.cache_dic[key][0]
+
+    def set(self, key, value):
+        """
+        Cache value with key, the least recently used values are dropped if max_size is exceeded.
+        The values which are bigger than max_size are not cached.
+        """
+        value_size = get_object_size(value)
+
+        with self.lock:
+            if key in self.cache_dic:
+                self.total_size -= self.cache_dic.pop(key)[1]
+
+            if value_size > self.max_size:
+                return
+
+            self.cache_dic[key] = (value, value_size)
+            self.total_size += value_size
+
+            while self.total_size > self.max_size:
+                self.total_size -= self.cache_dic.popitem(last=False)[1][1]
+
+    def clear(self):
+        with self.lock:
+            self.cache_dic.clear()
+            self.total_size = 0
+
+
+class ImportTimeRecorder():
+    """
+    Record import time of the modules which are imported between start() and stop(), like "python -X importtime".
+    Only the outermost imports are recorded, the time of nested imports is counted into them (cumulative time).
+    """
+    def __init__(self):
+        self.original_import = None
+        self.import_depth = 0
+        self.import_time_list = []
+        self.start_second = 0
+        self.total_second = 0
+
+    def start(self):
+        self.original_import = builtins.__import__
+        builtins.__import__ = self.import_module
+        self.start_second = time.time()
+
+    def stop(self):
+        builtins.__import__ = self.original_import
+        self.total_second = time.time() - self.start_second
+
+    def import_module(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if self.import_depth:
+            return self.original_import(name, globals, locals, fromlist, level)
+
+        self.import_depth += 1
+        start_second = time.time()
+
+        try:
+            return self.original_import(name, globals, locals, fromlist, level)
+        finally:
+            self.import_depth -= 1
+
+            # For "from package import module", record the module name.
+            submodule_list = [str(name) + '.' + str(item) for item in (fromlist or []) if (str(name) + '.' + str(item)) in sys.modules]
+            self.import_time_list.append((', '.join(submodule_list) or name, time.time() - start_second))
+
+    def report(self, min_second=0.01):
+        """
+        Print total import time and the modules which take at least min_second, slowest first.
+        """
+        bprint('Import modules in ' + str(round(self.total_second, 3)) + ' seconds.', date_format='%Y-%m-%d %H:%M:%S')
+
+        for (module, second) in sorted(self.import_time_list, key=lambda x: x[1], reverse=True):
+            if second >= min_second:
+                print('                      ' + str(round(second, 3)) + 's : ' + str(module))
@@ -0,0 +1,220 @@
+import os
+import sys
+import math
+import time
+import bisect
+
+sys.path.append(os.environ['LICENSE_MONITOR_INSTALL_PATH'])
+from common import common
+from common import common_license_db
+
+PROJECT_FACTOR_LIST = ['submit_host', 'execute_host', 'user']
+
+
+class ProjectResolver():
+    """
+    Get project proportion (like {'projA': 0.3, 'projB': 0.7}) of license usage with submit_host/execute_host/user and start_second.
+    project_setting_dic is {create_second: project_setting}, the project setting epoch of start_second is found with bisect, and the results are cached.
+    """
+    def __init__(self, project_setting_dic={}, project_primary_factors=''):
+        self.create_second_list = sorted(project_setting_dic.keys())
+        self.project_primary_factor_list = project_primary_factors.split()
+        self.project_dic_cache = {}
+
+        for project_primary_factor in self.project_primary_factor_list:
+            if self.create_second_list and (project_primary_factor not in PROJECT_FACTOR_LIST):
+                common.bprint('"' + str(project_primary_factor) + '": invalid project_primary_factors setting on config file.', date_format='%Y-%m-%d %H:%M:%S', level='Error')
+                sys.exit(1)
+
+        # For every epoch, factor proportion dicts are saved with the order of project_primary_factors.
+        self.epoch_factor_dic_list = []
+
+        for create_second in self.create_second_list:
+            factor_dic_list = []
+
+            for project_primary_factor in self.project_primary_factor_list:
+                factor_dic_list.append((PROJECT_FACTOR_LIST.index(project_primary_factor), project_setting_dic[create_second].get('project_' + str(project_primary_factor), {})))
+
+            self.epoch_factor_dic_list.append(factor_dic_list)
+
+    def get_epoch_project_dic(self, epoch, factor_value_tuple):
+        """
+        Get project proportion on specified epoch, the first factor which has project setting wins.
+        """
+        for (factor_index, factor_dic) in self.epoch_factor_dic_list[epoch]:
+            project_dic = factor_dic.get(factor_value_tuple[factor_index], {})
+
+            if project_dic:
+                return project_dic
+
+        return {}
+
+    def get_epoch(self, start_second):
+        """
+        Get (epoch, previous_epoch) of start_second, previous_epoch is used if start_second is just the create second of epoch and epoch has no project setting for the usage.
+        """
+        epoch = bisect.bisect_right(self.create_second_list, start_second) - 1
+
+        if epoch < 0:
+            return 0, -1
+        elif (epoch > 0) and (start_second == self.create_second_list[epoch]):
+            return epoch, epoch - 1
+
+        return epoch, -1
+
+    def get_epoch_array(self, start_second_array):
+        """
+        Get (epoch_array, previous_epoch_array) of start_second_array, just like get_epoch.
+        """
+        import numpy
+
+        create_second_array = numpy.asarray(self.create_second_list, dtype=numpy.int64)
+
+        if not len(create_second_array):
+            return numpy.zeros(len(start_second_array), dtype=numpy.int64), numpy.full(len(start_second_array), -1, dtype=numpy.int64)
+
+        epoch_array = numpy.searchsorted(create_second_array, start_second_array, side='right') - 1
+        tie_array = (epoch_array > 0) & (create_second_array[numpy.maximum(epoch_array, 0)] == start_second_array)
+        previous_epoch_array = numpy.where(tie_array, epoch_array - 1, -1)
+
+        return numpy.maximum(epoch_array, 0), previous_epoch_array
+
+    def get_project_dic(self, submit_host, execute_host, user, start_second):
+        """
+        Get project proportion of the license usage, return {} if no project is found.
+        """
+        if (not self.create_second_list) or (not self.project_primary_factor_list):
+            return {}
+
+        (epoch, previous_epoch) = self.get_epoch(start_second)
+        key = (epoch, previous_epoch, submit_host, execute_host, user)
+
+        if key not in self.project_dic_cache:
+            project_dic = self.get_epoch_project_dic(epoch, (submit_host, execute_host, user))
+
+            if (not project_dic) and (previous_epoch >= 0):
+                project_dic = self.get_epoch_project_dic(previous_epoch, (submit_host, execute_host, user))
+
+            self.project_dic_cache[key] = project_dic
+
+        return self.project_dic_cache[key]
+
+
+def get_project_resolver(db_path, project_primary_factors=''):
+    """
+    Get ProjectResolver with the project settings on config.db_path/project_setting.
+    """
+    project_setting_second_dic = {}
+    project_setting_db_path = str(db_path) + '/project_setting'
+
+    if os.path.exists(project_setting_db_path):
+        project_setting_dic = common.parse_project_setting_db_path(project_setting_db_path)
+
+        for create_time in project_setting_dic.keys():
+            create_second = int(time.mktime(time.strptime(str(create_time), '%Y%m%d%H%M%S')))
+            project_setting_second_dic.setdefault(create_second, project_setting_dic[create_time])
+
+    return ProjectResolver(project_setting_second_dic, project_primary_factors)
+
+
+def get_code_array(value_list):
+    """
+    Switch value_list into integer code array (0 ~ N-1), the same values get the same code.
+    It is faster than numpy.unique on strings, and None is kept different from ''.
+    """
+    import numpy
+
+    code_dic = {value: code for (code, value) in enumerate(dict.fromkeys(value_list))}
+
+    return numpy.array([code_dic[value] for value in value_list], dtype=numpy.int64)
+
+
+def get_runtime_array(sample_second_array, start_second_array, num_array, begin_second, end_second):
+    """
+    Get license runtime (num * seconds) of usage records on [begin_second, end_second].
+    """
+    import numpy
+
+    return num_array * (numpy.minimum(sample_second_array, end_second) - numpy.maximum(start_second_array, begin_second))
+
+
+def count_usage_cost(cost_dic, data_dic, begin_second, end_second, project_resolver, project_list, enable_others_project=False):
+    """
+    Add the runtime of usage records (data_dic, with sample_second/user/submit_host/execute_host/num/start_second) into cost_dic (one feature/vendor_daemon, with project_runtime/total_runtime).
+    The records with the same submit_host/execute_host/user and project setting epoch are summed up before splitting runtime into projects.
+    """
+    import numpy
+
+    if not data_dic.get('sample_second', []):
+        return
+
+    sample_second_array = numpy.asarray(data_dic['sample_second'], dtype=object).astype(numpy.int64)
+    start_second_array = numpy.asarray(data_dic['start_second'], dtype=object).astype(numpy.int64)
+    num_array = numpy.asarray(data_dic['num'], dtype=object).astype(numpy.int64)
+    runtime_array = get_runtime_array(sample_second_array, start_second_array, num_array, begin_second, end_second)
+
+    # Group usage records by submit_host/execute_host/user/epoch.
+    (epoch_array, previous_epoch_array) = project_resolver.get_epoch_array(start_second_array)
+    code_array_list = [get_code_array(data_dic['submit_host']), get_code_array(data_dic['execute_host']), get_code_array(data_dic['user']), epoch_array, previous_epoch_array + 1]
+    code_num_list = [int(code_array.max()) + 1 for code_array in code_array_list]
+
+    if math.prod(code_num_list) < 2**63:
+        # Merge the codes into one int64 key, it is much faster than numpy.unique with axis.
+        key_array = numpy.zeros(len(start_second_array), dtype=numpy.int64)
+
+        for (code_array, code_num) in zip(code_array_list, code_num_list):
+            key_array = key_array * code_num + code_array
+    else:
+        key_array = numpy.stack(code_array_list, axis=1)
+
+    (first_index_array, group_index_array) = numpy.unique(key_array, axis=0, return_index=True, return_inverse=True)[1:]
+    runtime_sum_array = numpy.zeros(len(first_index_array), dtype=numpy.int64)
+    numpy.add.at(runtime_sum_array, group_index_array.reshape(-1), runtime_array)
+
+    for (i, first_index) in enumerate(first_index_array):
+        runtime_second = int(runtime_sum_array[i])
+        project_dic = project_resolver.get_project_dic(data_dic['submit_host'][first_index], data_dic['execute_host'][first_index], data_dic['user'][first_index], int(start_second_array[first_index]))
+
+        if project_dic:
+            for project in project_dic.keys():
+                if project in project_list:
+                    cost_dic['project_runtime'][project] += project_dic[project] * runtime_second
+                    cost_dic['total_runtime'] += project_dic[project] * runtime_second
+                elif enable_others_project:
+                    # If not find any product information, collect runtime into 'others' group.
+                    cost_dic['project_runtime']['others'] += runtime_second
+                    cost_dic['total_runtime'] += runtime_second
+        elif enable_others_project:
+            # If not find any product information, collect runtime into 'others' group.
+            cost_dic['project_runtime']['others'] += runtime_second
+            cost_dic['total_runtime'] += runtime_second
+
+
+def add_cost_day_runtime(cost_day_runtime_dic, feature, submit_host, execute_host, user, num, start_second, begin_second, end_second, project_resolver):
+    """
+    Split the runtime of one usage record on [begin_second, end_second) by date and project, and add it into cost_day_runtime_dic ({(feature, sample_date, project): [runtime, full_runtime]}).
+    """
+    project_dic = project_resolver.get_project_dic(submit_host, execute_host, user, int(start_second)) or {'': 1}
+
+    for (sample_date, second) in common_license_db.split_second_range_by_date(begin_second, end_second):
+        runtime_second = int(num) * second
+
+        for (project, proportion) in project_dic.items():
+            runtime_list = cost_day_runtime_dic.setdefault((feature, sample_date, project), [0, 0])
+            runtime_list[0] += proportion * runtime_second
+            runtime_list[1] += runtime_second
+
+
+def count_cost_day_cost(cost_dic, data_dic, project_list, enable_others_project=False):
+    """
+    Add the runtime of cost_day records (data_dic, with project/runtime/full_runtime) into cost_dic (one feature/vendor_daemon, with project_runtime/total_runtime).
+    It is the same as count_usage_cost, but the runtime is split into projects already.
+    """
+    for (i, project) in enumerate(data_dic.get('project', [])):
+        if project and (project in project_list):
+            cost_dic['project_runtime'][project] += data_dic['runtime'][i]
+            cost_dic['total_runtime'] += data_dic['runtime'][i]
+        elif enable_others_project:
+            # If not find any product information, collect runtime into 'others' group.
+            cost_dic['project_runtime']['others'] += data_dic['full_runtime'][i]
+            cost_dic['total_runtime'] += data_dic['full_runtime'][i]
@@ -2,59 +2,309 @@ import os
 import re
 import sys
 import time
+import json
+import fcntl
+import shlex
+import asyncio
+import tempfile
 import datetime
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 sys.path.append(os.environ['LICENSE_MONITOR_INSTALL_PATH'])
 from common import common
 
 os.environ['PYTHONUNBUFFERED'] = '1'
 
+# Regular expressions for lmstat output message.
+LMSTAT_COMPILE_DIC = {'empty_line': re.compile(r'^\s*$'),
+                      'license_server_status': re.compile(r'^\s*License server status: (\S+)\s*$'),
+                      'license_files': re.compile(r'^\s*License file\(s\) on (\S+): (\S+):\s*$'),
+                      'license_server': re.compile(r'^\s*(\S+): license server (\S+?) .* (\S+?)\s*$'),
+                      'vendor_daemon_status': re.compile(r'^\s*Vendor daemon status \(on (.+)\):\s*$'),
+                      'vendor_daemon_up': re.compile(r'^\s*(\S+): UP (\S+)\s*$'),
+                      'vendor_daemon_down': re.compile(r'^\s*(\S+): (The desired vendor daemon is down|Cannot read data from license server system)\..*$'),
+                      'users_of_feature': re.compile(r'^Users of (\S+):  \(Total of ([0-9]+) license(s?) issued;  Total of ([0-9]+) license(s?) in use\)\s*$'),
+                      'users_of_feature_uncounted': re.compile(r'^Users of (\S+):  \(Uncounted,.*\)\s*$'),
+                      'in_use_info': re.compile(r'^\s*(\S+)\s+(\S+)\s+(\S+)?\s*(.+)?\s*\((\S+)\)\s+\((\S+)\s+(\d+)\), start (.+?)(,\s+(\d+)\s+licenses)?(\s*\(linger:.+\))?\s*$'),
+                      'reservation': re.compile(r'^\s*(\d+)\s+RESERVATION(s)? for (\S+)\s+(\S+)\s+\((\S+)(\s+(\d+))?\)\s*$'),
+                      'feature_expires': re.compile(r'^Feature .* Expires\s*$'),
+                      'expire_info': re.compile(r'^(\S+)\s+(\S+)\s+(\S+)\s+(\S+)\s+(permanent\(no expiration date\)|[0-9]{1,2}-[a-zA-Z]{3}-[0-9]{4})\s*$'),
+                      'display_setting': re.compile(r'^(.+):.+$'),
+                      'start_time': re.compile(r'^(.+?)\s*\(.*\)\s*$')}
+
 
 class GetLicenseInfo():
     """
     Get license information with tool "lmstat".
     Save it into a dictory and return.
     """
-    def __init__(self, specified_servers=[], excluded_servers=[], specified_feature='', lmstat_path='lmstat', bsub_command='bsub -q normal -Is'):
+    def __init__(self, specified_servers=[], excluded_servers=[], specified_feature='', lmstat_path='lmstat', bsub_command='bsub -q normal -Is', license_servers=None, max_workers=16, timeout=60, server_state_file='', server_state_readonly=False, backoff_second=60, max_backoff_second=3600, max_stale_second=86400, snapshot_file='', fresh_interval=0):
+        """
+        license_servers    : license server list (format is "27020@lic_server"), default is from environment variable LM_LICENSE_FILE.
+        max_workers        : how many lmstat commands are run at the same time.
+        timeout            : lmstat command for one license server is killed after timeout seconds, 0 means no timeout.
+        server_state_file  : json file to save license server failure state and last good license info across runs, empty means no failure tracking.
+        server_state_readonly : only read server_state_file (backoff and last good license info) and never update it, licenseMonitor reads the server_state_file of license_sample.
+        backoff_second     : failed license server is skipped for backoff_second*2^(fail_num-1) seconds, at most max_backoff_second seconds.
+        max_stale_second   : last good license info is reused (marked as stale) for failed license server in max_stale_second seconds.
+        snapshot_file      : license snapshot file published by license_sample, license info is loaded from it instead of running lmstat if it is not older than fresh_interval seconds.
+        """
         self.specified_feature = specified_feature
-        self.lmstat_path = lmstat_path
+        self.lmstat_path = lmstat_path or 'lmstat'
         self.bsub_command = bsub_command
+        self.max_workers = max(1, int(max_workers))
+        self.timeout = timeout
+        self.server_state_file = server_state_file
+        self.server_state_readonly = server_state_readonly
+        self.backoff_second = backoff_second
+        self.max_backoff_second = max_backoff_second
+        self.max_stale_second = max_stale_second
+        self.snapshot_file = snapshot_file
+        self.fresh_interval = fresh_interval
 
-        if specified_servers or excluded_servers:
-            server_list = os.environ['LM_LICENSE_FILE'].split(':')
+        # server_license_key_dic = {license_server: [license_dic key, ...]}, which license_dic items are got from which (specified) license server.
+        self.server_license_key_dic = {}
+        self.sample_second = 0
 
-            for specified_server in specified_servers:
-                if specified_server not in server_list:
-                    server_list.append(specified_server)
+        if license_servers is None:
+            license_servers = os.environ.get('LM_LICENSE_FILE', '').split(':')
 
-            for excluded_server in excluded_servers:
-                if excluded_server in server_list:
-                    server_list.remove(excluded_server)
+        self.license_server_list = [license_server for license_server in license_servers if license_server]
 
-            os.environ['LM_LICENSE_FILE'] = ':'.join(server_list)
+        for specified_server in specified_servers:
+            if specified_server not in self.license_server_list:
+                self.license_server_list.append(specified_server)
+
+        for excluded_server in excluded_servers:
+            if excluded_server in self.license_server_list:
+                self.license_server_list.remove(excluded_server)
 
     def get_lmstat_command(self, specified_server=''):
         """
-        Get reasonable lmstat command, it is used to get license usage information.
+        Get reasonable lmstat command (argument list, it is run without shell), it is used to get license usage information.
         """
-        lmstat_command = str(self.lmstat_path) + ' -a -i'
+        lmstat_command = [str(self.lmstat_path), '-a', '-i']
 
         if specified_server:
-            lmstat_command = str(lmstat_command) + ' -c ' + str(specified_server)
-        elif self.specified_server:
-            lmstat_command = str(lmstat_command) + ' -c ' + str(self.specified_server)
+            lmstat_command.extend(['-c', str(specified_server)])
 
         if self.specified_feature:
-            lmstat_command = str(lmstat_command) + ' ' + str(self.specified_feature)
+            lmstat_command.append(str(self.specified_feature))
 
         if self.bsub_command:
-            lmstat_command = str(self.bsub_command) + ' "' + str(lmstat_command) + '"'
+            lmstat_command = shlex.split(self.bsub_command) + [' '.join(lmstat_command)]
         elif 'lmstat_bsub_command' in os.environ:
-            lmstat_command = str(os.environ['lmstat_bsub_command']) + ' "' + str(lmstat_command) + '"'
+            lmstat_command = shlex.split(os.environ['lmstat_bsub_command']) + [' '.join(lmstat_command)]
 
         return lmstat_command
 
+    async def run_lmstat(self, semaphore, specified_server=''):
+        """
+        Run lmstat command for specified license server, return (specified_server, stdout, error_message).
+        lmstat command is killed on timeout, and stdout is b'' on any failure.
+        """
+        lmstat_command = self.get_lmstat_command(specified_server=specified_server)
+
+        async with semaphore:
+            try:
+                process = await asyncio.create_subprocess_exec(*lmstat_command, stdin=asyncio.subprocess.DEVNULL, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+            except Exception as error:
+                common.bprint('Failed on running lmstat command "' + ' '.join(lmstat_command) + '".', date_format='%Y-%m-%d %H:%M:%S', level='Error')
+                common.bprint(error, color='red', display_method=1, indent=9)
+                return specified_server, b'', str(error)
+
+            try:
+                if self.timeout:
+                    (stdout, stderr) = await asyncio.wait_for(process.communicate(), timeout=self.timeout)
+                else:
+                    (stdout, stderr) = await process.communicate()
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                common.bprint('lmstat command for license server "' + str(specified_server) + '" is killed after ' + str(self.timeout) + ' seconds timeout.', date_format='%Y-%m-%d %H:%M:%S', level='Warning')
+                return specified_server, b'', 'timeout after ' + str(self.timeout) + ' seconds.'
+
+        return specified_server, stdout, ''
+
+    async def get_server_license_dic(self, semaphore, executor, specified_server=''):
+        """
+        Run lmstat for specified license server and parse its output, return (specified_server, server_license_dic, error_message).
+        lmstat output is parsed on executor (worker process) if it is specified, so the servers are parsed in parallel while the other lmstat commands are still running.
+        Parse failure only fails the specified license server (server_license_dic is {}), if the worker processes die, the output is parsed on current process instead.
+        """
+        (specified_server, stdout, error_message) = await self.run_lmstat(semaphore, specified_server)
+
+        try:
+            if executor:
+                try:
+                    server_license_dic = await asyncio.get_running_loop().run_in_executor(executor, parse_lmstat_stdout, stdout)
+                except BrokenProcessPool:
+                    common.bprint('lmstat parse worker processes are terminated, parse lmstat output of license server "' + str(specified_server) + '" on current process.', date_format='%Y-%m-%d %H:%M:%S', level='Warning')
+                    server_license_dic = parse_lmstat_stdout(stdout)
+            else:
+                server_license_dic = parse_lmstat_stdout(stdout)
+        except Exception as error:
+            common.bprint('Failed on parsing lmstat output of license server "' + str(specified_server) + '".', date_format='%Y-%m-%d %H:%M:%S', level='Error')
+            common.bprint(error, color='red', display_method=1, indent=9)
+            return specified_server, {}, 'failed on parsing lmstat output: ' + str(error)
+
+        return specified_server, server_license_dic, error_message
+
+    async def collect_license_info(self, license_server_list):
+        """
+        Get license info for specified license servers, at most self.max_workers lmstat commands are run at the same time.
+        lmstat outputs are parsed on at most self.max_workers (or cpu count) worker processes.
+        """
+        semaphore = asyncio.Semaphore(self.max_workers)
+        parse_worker_num = min(self.max_workers, os.cpu_count() or 1, len(license_server_list))
+
+        if parse_worker_num > 1:
+            # Do not fork current process, it may be multithreaded (licenseMonitor runs GetLicenseInfo on QThread).
+            # Worker processes are forked from a clean forkserver process, which only preloads this module.
+            mp_context = multiprocessing.get_context('forkserver')
+            mp_context.set_forkserver_preload(['common.common_license'])
+
+            with ProcessPoolExecutor(max_workers=parse_worker_num, mp_context=mp_context) as executor:
+                job_list = [self.get_server_license_dic(semaphore, executor, license_server) for license_server in license_server_list]
+                return await asyncio.gather(*job_list)
+        else:
+            job_list = [self.get_server_license_dic(semaphore, None, license_server) for license_server in license_server_list]
+            return await asyncio.gather(*job_list)
+
+    def load_server_state(self):
+        """
+        Load license server state from self.server_state_file.
+        server_state_dic = {license_server: {'fail_num': 0, 'next_retry_second': 0, 'last_error': '', 'last_good_second': 0, 'license_dic': {}}}
+        """
+        server_state_dic = {}
+
+        if self.server_state_file and os.path.exists(self.server_state_file):
+            try:
+                with open(self.server_state_file, 'r') as SSF:
+                    server_state_dic = json.load(SSF)
+            except Exception as error:
+                common.bprint('Failed on loading license server state file "' + str(self.server_state_file) + '", ignore it.', date_format='%Y-%m-%d %H:%M:%S', level='Warning')
+                common.bprint(error, color='yellow', display_method=1, indent=11)
+
+        return server_state_dic
+
+    def save_server_state(self, server_state_dic):
+        """
+        Save license server state into self.server_state_file, replace it atomically so readers never see a partial file.
+        """
+        save_json_file(self.server_state_file, server_state_dic)
+
+    def update_server_state(self, server_state_dic, server_license_info_list, current_second):
+        """
+        Update the failure state and last good license info of the license servers on server_state_dic with this run.
+        Return {license_server: error_message} of the failed license servers.
+        """
+        server_error_dic = {}
+
+        for (license_server, server_license_dic, error_message) in server_license_info_list:
+            if not license_server:
+                continue
+
+            if (not error_message) and (not any(server_dic['license_server_status'] == 'UP' for server_dic in server_license_dic.values())):
+                error_message = 'license server is not UP.'
+
+            if error_message:
+                fail_num = server_state_dic.get(license_server, {}).get('fail_num', 0) + 1
+                backoff_second = min(self.backoff_second * 2**(fail_num - 1), self.max_backoff_second)
+                server_state_dic.setdefault(license_server, {})
+                server_state_dic[license_server].update({'fail_num': fail_num, 'next_retry_second': current_second + backoff_second, 'last_error': error_message})
+                server_error_dic[license_server] = error_message
+                common.bprint('Failed on getting license info from license server "' + str(license_server) + '" (' + str(error_message) + '), retry it after ' + str(backoff_second) + ' seconds.', date_format='%Y-%m-%d %H:%M:%S', level='Warning')
+            else:
+                server_state_dic[license_server] = {'fail_num': 0, 'next_retry_second': 0, 'last_error': '', 'last_good_second': current_second, 'license_dic': server_license_dic}
+
+        return server_error_dic
+
+    def save_server_state_with_lock(self, server_license_info_list, current_second):
+        """
+        Reload self.server_state_file, update it with this run and save it, with a lock on the load-modify-save sequence.
+        So the updates of the license_sample processes running at the same time are not lost.
+        Return (server_state_dic, server_error_dic).
+        """
+        lock_file = os.path.join(os.path.dirname(os.path.abspath(self.server_state_file)), '.' + os.path.basename(self.server_state_file) + '.lock')
+
+        with open(lock_file, 'a') as LF:
+            fcntl.flock(LF, fcntl.LOCK_EX)
+
+            try:
+                server_state_dic = self.load_server_state()
+                server_error_dic = self.update_server_state(server_state_dic, server_license_info_list, current_second)
+                self.save_server_state(server_state_dic)
+            finally:
+                fcntl.flock(LF, fcntl.LOCK_UN)
+
+        return server_state_dic, server_error_dic
+
+    def load_license_snapshot(self):
+        """
+        Load license_dic of self.license_server_list from self.snapshot_file.
+        Return None if the snapshot is missing, older than self.fresh_interval seconds, or does not cover all of self.license_server_list.
+        """
+        if not os.path.exists(self.snapshot_file):
+            return None
+
+        try:
+            with open(self.snapshot_file, 'r') as SF:
+                snapshot_dic = json.load(SF)
+        except Exception as error:
+            common.bprint('Failed on loading license snapshot file "' + str(self.snapshot_file) + '", ignore it.', date_format='%Y-%m-%d %H:%M:%S', level='Warning')
+            common.bprint(error, color='yellow', display_method=1, indent=11)
+            return None
+
+        sample_second = snapshot_dic.get('sample_second', 0)
+
+        if int(time.time()) - sample_second > int(self.fresh_interval):
+            return None
+
+        license_dic = {}
+        snapshot_license_dic = snapshot_dic.get('license_dic', {})
+        server_license_key_dic = snapshot_dic.get('license_server', {})
+
+        for license_server in (self.license_server_list or ['']):
+            if license_server not in server_license_key_dic:
+                return None
+
+            for key in server_license_key_dic[license_server]:
+                if key in snapshot_license_dic:
+                    license_dic.setdefault(key, snapshot_license_dic[key])
+
+        common.bprint('Load license info from snapshot "' + str(self.snapshot_file) + '" (sampled on ' + datetime.datetime.fromtimestamp(sample_second).strftime('%Y-%m-%d %H:%M:%S') + ').', date_format='%Y-%m-%d %H:%M:%S')
+
+        return license_dic
+
+    def save_license_snapshot(self, snapshot_file, license_dic):
+        """
+        Save license_dic (got with get_license_info) into snapshot_file, replace it atomically so readers never see a partial file.
+        Readers only load the license servers they need with the "license_server" index.
+        """
+        snapshot_dic = {'sample_second': self.sample_second,
+                        'license_server': self.server_license_key_dic,
+                        'license_dic': license_dic}
+
+        save_json_file(snapshot_file, snapshot_dic)
+
+    def get_stale_license_dic(self, server_state, current_second):
+        """
+        Get last good license info of one license server, every license server is marked with "stale" and "stale_second" (when it is got).
+        Return {} if there is no last good license info in self.max_stale_second seconds.
+        """
+        stale_license_dic = {}
+
+        if server_state.get('license_dic', {}) and (current_second - server_state.get('last_good_second', 0) <= self.max_stale_second):
+            for (license_server, server_dic) in server_state['license_dic'].items():
+                stale_license_dic[license_server] = dict(server_dic)
+                stale_license_dic[license_server]['stale'] = True
+                stale_license_dic[license_server]['stale_second'] = server_state['last_good_second']
+
+        return stale_license_dic
+
     def get_license_info(self):
         """
         Get EDA liecnse feature usage and expires information on license_dic.
@@ -79,92 +329,189 @@ class GetLicenseInfo():
                                                                                       },
                                                                           },
                                                          },
+                                        'stale': True,
+                                        'stale_second': 0,
                                        },
                       }
+        "stale"/"stale_second" only exist when the license server fails and its last good license info (got on stale_second) is reused.
+        license_dic is loaded from self.snapshot_file instead if it is fresh enough.
         """
-        # Get lmstat output message.
-        if 'LM_LICENSE_FILE' in os.environ:
-            stdout_list = []
-            lm_license_file_list = os.environ['LM_LICENSE_FILE'].split(':')
+        if self.snapshot_file and self.fresh_interval and (not self.specified_feature):
+            license_dic = self.load_license_snapshot()
 
-            with ProcessPoolExecutor(max_workers=len(lm_license_file_list)) as executor:
-                job_list = []
+            if license_dic is not None:
+                return license_dic
 
-                for lm_license_file in lm_license_file_list:
-                    if lm_license_file:
-                        lmstat_command = self.get_lmstat_command(specified_server=lm_license_file)
-                        job_list.append(executor.submit(common.run_command, lmstat_command))
+        license_dic = {}
+        current_second = int(time.time())
+        self.sample_second = current_second
+        self.server_license_key_dic = {}
+        server_state_dic = self.load_server_state()
+        run_server_list = []
 
-                for job in as_completed(job_list):
-                    for tuple_line in job.result():
-                        if isinstance(tuple_line, bytes):
-                            stdout_list.extend(str(tuple_line, 'unicode_escape').split('\n'))
-        else:
-            lmstat_command = self.get_lmstat_command()
-            (return_code, stdout, stderr) = common.run_command(lmstat_command)
-            stdout_list = str(stdout, 'unicode_escape').split('\n')
+        # Skip the license servers which are still in backoff time.
+        for license_server in self.license_server_list:
+            next_retry_second = server_state_dic.get(license_server, {}).get('next_retry_second', 0)
 
-        # Parse lmstat output message.
-        license_dic = {}
-        license_server = ''
-        vendor_daemon = ''
-        feature = ''
-        expires_mark = False
-        vendor_daemon_status_mark = False
-
-        license_compile_dic = {'empty_line': re.compile(r'^\s*$'),
-                               'license_server_status': re.compile(r'^\s*License server status: (\S+)\s*$'),
-                               'license_files': re.compile(r'^\s*License file\(s\) on (\S+): (\S+):\s*$'),
-                               'license_server': re.compile(r'^\s*(\S+): license server (\S+?) .* (\S+?)\s*$'),
-                               'vendor_daemon_status': re.compile(r'^\s*Vendor daemon status \(on (.+)\):\s*$'),
-                               'vendor_daemon_up': re.compile(r'^\s*(\S+): UP (\S+)\s*$'),
-                               'vendor_daemon_down': re.compile(r'^\s*(\S+): (The desired vendor daemon is down|Cannot read data from license server system)\..*$'),
-                               'users_of_feature': re.compile(r'^Users of (\S+):  \(Total of ([0-9]+) license(s?) issued;  Total of ([0-9]+) license(s?) in use\)\s*$'),
-                               'users_of_feature_uncounted': re.compile(r'^Users of (\S+):  \(Uncounted,.*\)\s*$'),
-                               'in_use_info': re.compile(r'^\s*(\S+)\s+(\S+)\s+(\S+)?\s*(.+)?\s*\((\S+)\)\s+\((\S+)\s+(\d+)\), start (.+?)(,\s+(\d+)\s+licenses)?(\s*\(linger:.+\))?\s*$'),
-                               'reservation': re.compile(r'^\s*(\d+)\s+RESERVATION(s)? for (\S+)\s+(\S+)\s+\((\S+)(\s+(\d+))?\)\s*$'),
-                               'feature_expires': re.compile(r'^Feature .* Expires\s*$'),
-                               'expire_info': re.compile(r'^(\S+)\s+(\S+)\s+(\S+)\s+(\S+)\s+(permanent\(no expiration date\)|[0-9]{1,2}-[a-zA-Z]{3}-[0-9]{4})\s*$')}
-
-        for line in stdout_list:
-            line = line.strip()
+            if next_retry_second > current_second:
+                common.bprint('Skip license server "' + str(license_server) + '" until ' + datetime.datetime.fromtimestamp(next_retry_second).strftime('%Y-%m-%d %H:%M:%S') + ' after ' + str(server_state_dic[license_server]['fail_num']) + ' failure(s).', date_format='%Y-%m-%d %H:%M:%S', level='Warning')
+            else:
+                run_server_list.append(license_server)
 
-            if license_compile_dic['empty_line'].match(line):
+        # Get license info server by server (lmstat and parse).
+        loop = asyncio.new_event_loop()
+
+        try:
+            if self.license_server_list:
+                server_license_info_list = loop.run_until_complete(self.collect_license_info(run_server_list))
+            else:
+                server_license_info_list = loop.run_until_complete(self.collect_license_info(['']))
+        finally:
+            loop.close()
+
+        # Update license server state, it is only saved if it is not readonly.
+        server_error_dic = {}
+
+        if self.license_server_list and self.server_state_file:
+            if self.server_state_readonly:
+                server_error_dic = self.update_server_state(server_state_dic, server_license_info_list, current_second)
+            else:
+                (server_state_dic, server_error_dic) = self.save_server_state_with_lock(server_license_info_list, current_second)
+
+        # Merge license info.
+        for (license_server, server_license_dic, error_message) in server_license_info_list:
+            # Failed license server is replaced with its last good license info if possible.
+            if (license_server in server_error_dic) and self.get_stale_license_dic(server_state_dic[license_server], current_second):
                 continue
-            elif expires_mark and license_compile_dic['expire_info'].match(line):
-                my_match = license_compile_dic['expire_info'].match(line)
+
+            self.server_license_key_dic[license_server] = list(server_license_dic.keys())
+
+            for (server, server_dic) in server_license_dic.items():
+                license_dic.setdefault(server, server_dic)
+
+        # Reuse last good license info (marked as stale) for the skipped/failed license servers.
+        for license_server in self.license_server_list:
+            if server_state_dic.get(license_server, {}).get('fail_num', 0) > 0:
+                stale_license_dic = self.get_stale_license_dic(server_state_dic[license_server], current_second)
+                self.server_license_key_dic.setdefault(license_server, list(stale_license_dic.keys()))
+
+                for (server, server_dic) in stale_license_dic.items():
+                    license_dic.setdefault(server, server_dic)
+
+        return license_dic
+
+
+def save_json_file(json_file, data):
+    """
+    Save data into json_file, write a temporary file on the same directory and replace json_file with it, so readers never see a partial file.
+    """
+    try:
+        json_dir = os.path.dirname(os.path.abspath(json_file))
+
+        with tempfile.NamedTemporaryFile('w', dir=json_dir, prefix='.' + os.path.basename(json_file) + '.', delete=False) as JF:
+            json.dump(data, JF)
+
+        os.chmod(JF.name, 0o644)
+        os.replace(JF.name, json_file)
+    except Exception as error:
+        common.bprint('Failed on saving json file "' + str(json_file) + '".', date_format='%Y-%m-%d %H:%M:%S', level='Warning')
+        common.bprint(error, color='yellow', display_method=1, indent=11)
+
+        if ('JF' in locals()) and os.path.exists(JF.name):
+            os.remove(JF.name)
+
+
+def get_license_snapshot_file(config):
+    """
+    Get license snapshot file (published by license_sample) path with config.db_path, return '' if db_path is not set.
+    """
+    if hasattr(config, 'db_path') and config.db_path:
+        return str(config.db_path) + '/license_snapshot.json'
+
+    return ''
+
+
+def parse_lmstat_output(stdout_list):
+    """
+    Parse lmstat output message (line list) and get license_dic.
+    Every line is dispatched with cheap prefix/token checks first, and the regular expression is only matched (once) for the possible line type.
+    The result is the same as parse_lmstat_output_by_regex, use tools/check_lmstat_parser to compare them.
+    """
+    license_dic = {}
+    license_server = ''
+    vendor_daemon = ''
+    feature = ''
+    expires_mark = False
+    vendor_daemon_status_mark = False
+
+    # feature_vendor_daemon_dic = {license_server: {feature: [vendor_daemon, ...]}}, it is used to find vendor daemons for expire info.
+    feature_vendor_daemon_dic = {}
+
+    expire_info_compile = LMSTAT_COMPILE_DIC['expire_info']
+    users_of_feature_compile = LMSTAT_COMPILE_DIC['users_of_feature']
+    users_of_feature_uncounted_compile = LMSTAT_COMPILE_DIC['users_of_feature_uncounted']
+    in_use_info_compile = LMSTAT_COMPILE_DIC['in_use_info']
+    display_setting_compile = LMSTAT_COMPILE_DIC['display_setting']
+    start_time_compile = LMSTAT_COMPILE_DIC['start_time']
+
+    for line in stdout_list:
+        line = line.strip()
+
+        if not line:
+            continue
+
+        # The line types are checked with the same priority as parse_lmstat_output_by_regex.
+        if expires_mark and (line[-1].isdigit() or line.endswith('(no expiration date)')):
+            my_match = expire_info_compile.match(line)
+
+            if my_match:
                 feature = my_match.group(1)
                 expire_dic = {'version': my_match.group(2),
                               'license': my_match.group(3),
                               'vendor': my_match.group(4),
                               'expires': my_match.group(5)}
 
-                for vendor_daemon in license_dic[license_server]['vendor_daemon'].keys():
-                    if feature in license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature']:
-                        license_dic[license_server]['vendor_daemon'][vendor_daemon]['expires'].setdefault(feature, [])
-                        license_dic[license_server]['vendor_daemon'][vendor_daemon]['expires'][feature].append(expire_dic)
-            elif license_compile_dic['users_of_feature'].match(line):
-                my_match = license_compile_dic['users_of_feature'].match(line)
+                for vendor_daemon in feature_vendor_daemon_dic.get(license_server, {}).get(feature, []):
+                    license_dic[license_server]['vendor_daemon'][vendor_daemon]['expires'].setdefault(feature, [])
+                    license_dic[license_server]['vendor_daemon'][vendor_daemon]['expires'][feature].append(expire_dic)
+
+                # Same as parse_lmstat_output_by_regex, vendor_daemon is the last one of the license server after expire info.
+                if license_dic[license_server]['vendor_daemon']:
+                    vendor_daemon = next(reversed(license_dic[license_server]['vendor_daemon']))
+
+                continue
+
+        if line.startswith('Users of '):
+            my_match = users_of_feature_compile.match(line)
+
+            if my_match:
                 feature = my_match.group(1)
                 issued_num = my_match.group(2)
                 in_use_num = my_match.group(4)
+            else:
+                my_match = users_of_feature_uncounted_compile.match(line)
 
-                license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'].setdefault(feature, {'issued': issued_num,
-                                                                                                            'in_use': in_use_num,
-                                                                                                            'in_use_info_string': [],
-                                                                                                            'in_use_info': []})
-            elif license_compile_dic['users_of_feature_uncounted'].match(line):
-                my_match = license_compile_dic['users_of_feature_uncounted'].match(line)
-                feature = my_match.group(1)
-                issued_num = 'Uncounted'
-                in_use_num = '0'
-
-                license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'].setdefault(feature, {'issued': issued_num,
-                                                                                                            'in_use': in_use_num,
-                                                                                                            'in_use_info_string': [],
-                                                                                                            'in_use_info': []})
-            elif license_compile_dic['in_use_info'].match(line):
-                my_match = license_compile_dic['in_use_info'].match(line)
+                if my_match:
+                    feature = my_match.group(1)
+                    issued_num = 'Uncounted'
+                    in_use_num = '0'
+
+            if my_match:
+                feature_dic = license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature']
+
+                if feature not in feature_dic:
+                    feature_dic[feature] = {'issued': issued_num,
+                                            'in_use': in_use_num,
+                                            'in_use_info_string': [],
+                                            'in_use_info': []}
+                    feature_vendor_daemon_dic.setdefault(license_server, {}).setdefault(feature, []).append(vendor_daemon)
+
+                continue
+
+        if ', start ' in line:
+            my_match = in_use_info_compile.match(line)
+
+            if my_match:
                 usage_dic = {'user': my_match.group(1),
                              'execute_host': my_match.group(2),
                              'submit_host': 'N/A',
@@ -176,28 +523,37 @@ class GetLicenseInfo():
                 # Update submit_host.
                 display_setting = my_match.group(3)
 
-                if display_setting:
-                    if re.match(r'^(.+):.+$', display_setting):
-                        display_match = re.match(r'^(.+):.+$', display_setting)
+                if display_setting and (':' in display_setting):
+                    display_match = display_setting_compile.match(display_setting)
+
+                    if display_match:
                         usage_dic['submit_host'] = display_match.group(1)
 
                 # Update start_time.
-                if re.match(r'^(.+?)\s*\(.*\)\s*$', usage_dic['start_time']):
-                    start_time_match = re.match(r'^(.+?)\s*\(.*\)\s*$', usage_dic['start_time'])
-                    usage_dic['start_time'] = start_time_match.group(1)
+                if '(' in usage_dic['start_time']:
+                    start_time_match = start_time_compile.match(usage_dic['start_time'])
+
+                    if start_time_match:
+                        usage_dic['start_time'] = start_time_match.group(1)
 
                 # Update license_num.
                 if my_match.group(9):
                     usage_dic['license_num'] = my_match.group(10)
 
-                license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][feature]['in_use_info_string'].append(line.strip())
-                license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][feature]['in_use_info'].append(usage_dic)
+                feature_dic = license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][feature]
+                feature_dic['in_use_info_string'].append(line)
+                feature_dic['in_use_info'].append(usage_dic)
 
                 # Update in_use num with "Uncounted" issued num.
-                if license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][feature]['issued'] == 'Uncounted':
-                    license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][feature]['in_use'] = str(int(license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][feature]['in_use']) + int(usage_dic['license_num']))
-            elif license_compile_dic['reservation'].match(line):
-                my_match = license_compile_dic['reservation'].match(line)
+                if feature_dic['issued'] == 'Uncounted':
+                    feature_dic['in_use'] = str(int(feature_dic['in_use']) + int(usage_dic['license_num']))
+
+                continue
+
+        if 'RESERVATION' in line:
+            my_match = LMSTAT_COMPILE_DIC['reservation'].match(line)
+
+            if my_match:
                 reservation_type = my_match.group(3)
                 user = 'N/A'
                 execute_host = 'N/A'
@@ -215,10 +571,15 @@ class GetLicenseInfo():
                              'start_time': 'RESERVATION',
                              'license_num': my_match.group(1)}
 
-                license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][feature]['in_use_info_string'].append(line.strip())
-                license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][feature]['in_use_info'].append(usage_dic)
-            elif license_compile_dic['license_server_status'].match(line):
-                my_match = license_compile_dic['license_server_status'].match(line)
+                feature_dic = license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][feature]
+                feature_dic['in_use_info_string'].append(line)
+                feature_dic['in_use_info'].append(usage_dic)
+                continue
+
+        if line.startswith('License server status: '):
+            my_match = LMSTAT_COMPILE_DIC['license_server_status'].match(line)
+
+            if my_match:
                 license_server = my_match.group(1)
                 license_dic.setdefault(license_server, {'license_files': '',
                                                         'license_server_status': 'UNKNOWN',
@@ -227,41 +588,231 @@ class GetLicenseInfo():
                 expires_mark = False
                 vendor_daemon_status_mark = False
                 vendor_daemon = ''
-            elif license_compile_dic['license_files'].match(line):
-                my_match = license_compile_dic['license_files'].match(line)
+                continue
+
+        if line.startswith('License file(s) on '):
+            my_match = LMSTAT_COMPILE_DIC['license_files'].match(line)
+
+            if my_match:
                 license_dic[license_server]['license_files'] = my_match.group(2)
-            elif license_compile_dic['license_server'].match(line):
-                # License Manager Status—Status of each license server manager. Click the Update Status button to immediately refresh the status display for the license server.
-                # • Up—License server is currently running.
-                # • Down—License server is currently not running.
-                # • Unknown—License server status is not known.
-                # • Lost quorum—For license-server triads, this means that the quorum has been lost. A quorum requires that at least two of the three license servers are running and communicating with each other.
-                my_match = license_compile_dic['license_server'].match(line)
+                continue
+
+        if ': license server ' in line:
+            my_match = LMSTAT_COMPILE_DIC['license_server'].match(line)
+
+            if my_match:
                 license_dic[license_server]['license_server_status'] = my_match.group(2)
                 license_dic[license_server]['license_server_version'] = my_match.group(3)
-            elif license_compile_dic['vendor_daemon_status'].match(line):
+                continue
+
+        if line.startswith('Vendor daemon status (on '):
+            if LMSTAT_COMPILE_DIC['vendor_daemon_status'].match(line):
                 vendor_daemon_status_mark = True
-            elif vendor_daemon_status_mark and license_compile_dic['vendor_daemon_up'].match(line):
-                my_match = license_compile_dic['vendor_daemon_up'].match(line)
+                continue
+
+        if vendor_daemon_status_mark and (': UP ' in line):
+            my_match = LMSTAT_COMPILE_DIC['vendor_daemon_up'].match(line)
+
+            if my_match:
                 vendor_daemon = my_match.group(1)
                 license_dic[license_server]['vendor_daemon'].setdefault(vendor_daemon, {'vendor_daemon_status': 'UP',
                                                                                         'vendor_daemon_version': my_match.group(2),
                                                                                         'feature': {},
                                                                                         'expires': {}})
-            elif license_compile_dic['feature_expires'].match(line):
+                continue
+
+        if line.startswith('Feature ') and line.endswith(' Expires'):
+            if LMSTAT_COMPILE_DIC['feature_expires'].match(line):
                 expires_mark = True
 
                 if vendor_daemon:
                     license_dic[license_server]['vendor_daemon'][vendor_daemon].setdefault('expires', {})
-            elif vendor_daemon_status_mark and license_compile_dic['vendor_daemon_down'].match(line):
-                my_match = license_compile_dic['vendor_daemon_down'].match(line)
+
+                continue
+
+        if vendor_daemon_status_mark and ((': The desired vendor daemon is down.' in line) or (': Cannot read data from license server system.' in line)):
+            my_match = LMSTAT_COMPILE_DIC['vendor_daemon_down'].match(line)
+
+            if my_match:
                 down_vendor_daemon = my_match.group(1)
                 license_dic[license_server]['vendor_daemon'].setdefault(down_vendor_daemon, {'vendor_daemon_status': 'DOWN',
                                                                                              'vendor_daemon_version': '',
                                                                                              'feature': {},
                                                                                              'expires': {}})
 
-        return license_dic
+    return license_dic
+
+
+def parse_lmstat_output_by_regex(stdout_list):
+    """
+    Parse lmstat output message (line list) and get license_dic.
+    Every line is matched with the regular expressions one by one, it is the original parser and kept as reference of parse_lmstat_output.
+    """
+    license_dic = {}
+    license_server = ''
+    vendor_daemon = ''
+    feature = ''
+    expires_mark = False
+    vendor_daemon_status_mark = False
+
+    license_compile_dic = {'empty_line': re.compile(r'^\s*$'),
+                           'license_server_status': re.compile(r'^\s*License server status: (\S+)\s*$'),
+                           'license_files': re.compile(r'^\s*License file\(s\) on (\S+): (\S+):\s*$'),
+                           'license_server': re.compile(r'^\s*(\S+): license server (\S+?) .* (\S+?)\s*$'),
+                           'vendor_daemon_status': re.compile(r'^\s*Vendor daemon status \(on (.+)\):\s*$'),
+                           'vendor_daemon_up': re.compile(r'^\s*(\S+): UP (\S+)\s*$'),
+                           'vendor_daemon_down': re.compile(r'^\s*(\S+): (The desired vendor daemon is down|Cannot read data from license server system)\..*$'),
+                           'users_of_feature': re.compile(r'^Users of (\S+):  \(Total of ([0-9]+) license(s?) issued;  Total of ([0-9]+) license(s?) in use\)\s*$'),
+                           'users_of_feature_uncounted': re.compile(r'^Users of (\S+):  \(Uncounted,.*\)\s*$'),
+                           'in_use_info': re.compile(r'^\s*(\S+)\s+(\S+)\s+(\S+)?\s*(.+)?\s*\((\S+)\)\s+\((\S+)\s+(\d+)\), start (.+?)(,\s+(\d+)\s+licenses)?(\s*\(linger:.+\))?\s*$'),
+                           'reservation': re.compile(r'^\s*(\d+)\s+RESERVATION(s)? for (\S+)\s+(\S+)\s+\((\S+)(\s+(\d+))?\)\s*$'),
+                           'feature_expires': re.compile(r'^Feature .* Expires\s*$'),
+                           'expire_info': re.compile(r'^(\S+)\s+(\S+)\s+(\S+)\s+(\S+)\s+(permanent\(no expiration date\)|[0-9]{1,2}-[a-zA-Z]{3}-[0-9]{4})\s*$')}
+
+    for line in stdout_list:
+        line = line.strip()
+
+        if license_compile_dic['empty_line'].match(line):
+            continue
+        elif expires_mark and license_compile_dic['expire_info'].match(line):
+            my_match = license_compile_dic['expire_info'].match(line)
+            feature = my_match.group(1)
+            expire_dic = {'version': my_match.group(2),
+                          'license': my_match.group(3),
+                          'vendor': my_match.group(4),
+                          'expires': my_match.group(5)}
+
+            for vendor_daemon in license_dic[license_server]['vendor_daemon'].keys():
+                if feature in license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature']:
+                    license_dic[license_server]['vendor_daemon'][vendor_daemon]['expires'].setdefault(feature, [])
+                    license_dic[license_server]['vendor_daemon'][vendor_daemon]['expires'][feature].append(expire_dic)
+        elif license_compile_dic['users_of_feature'].match(line):
+            my_match = license_compile_dic['users_of_feature'].match(line)
+            feature = my_match.group(1)
+            issued_num = my_match.group(2)
+            in_use_num = my_match.group(4)
+
+            license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'].setdefault(feature, {'issued': issued_num,
+                                                                                                        'in_use': in_use_num,
+                                                                                                        'in_use_info_string': [],
+                                                                                                        'in_use_info': []})
+        elif license_compile_dic['users_of_feature_uncounted'].match(line):
+            my_match = license_compile_dic['users_of_feature_uncounted'].match(line)
+            feature = my_match.group(1)
+            issued_num = 'Uncounted'
+            in_use_num = '0'
+
+            license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'].setdefault(feature, {'issued': issued_num,
+                                                                                                        'in_use': in_use_num,
+                                                                                                        'in_use_info_string': [],
+                                                                                                        'in_use_info': []})
+        elif license_compile_dic['in_use_info'].match(line):
+            my_match = license_compile_dic['in_use_info'].match(line)
+            usage_dic = {'user': my_match.group(1),
+                         'execute_host': my_match.group(2),
+                         'submit_host': 'N/A',
+                         'version': my_match.group(5),
+                         'license_server': my_match.group(6),
+                         'start_time': my_match.group(8),
+                         'license_num': '1'}
+
+            # Update submit_host.
+            display_setting = my_match.group(3)
+
+            if display_setting:
+                if re.match(r'^(.+):.+$', display_setting):
+                    display_match = re.match(r'^(.+):.+$', display_setting)
+                    usage_dic['submit_host'] = display_match.group(1)
+
+            # Update start_time.
+            if re.match(r'^(.+?)\s*\(.*\)\s*$', usage_dic['start_time']):
+                start_time_match = re.match(r'^(.+?)\s*\(.*\)\s*$', usage_dic['start_time'])
+                usage_dic['start_time'] = start_time_match.group(1)
+
+            # Update license_num.
+            if my_match.group(9):
+                usage_dic['license_num'] = my_match.group(10)
+
+            license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][feature]['in_use_info_string'].append(line.strip())
+            license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][feature]['in_use_info'].append(usage_dic)
+
+            # Update in_use num with "Uncounted" issued num.
+            if license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][feature]['issued'] == 'Uncounted':
+                license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][feature]['in_use'] = str(int(license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][feature]['in_use']) + int(usage_dic['license_num']))
+        elif license_compile_dic['reservation'].match(line):
+            my_match = license_compile_dic['reservation'].match(line)
+            reservation_type = my_match.group(3)
+            user = 'N/A'
+            execute_host = 'N/A'
+
+            if (reservation_type == 'USER') or (reservation_type == 'GROUP'):
+                user = my_match.group(4)
+            elif (reservation_type == 'HOST') or (reservation_type == 'HOST_GROUP'):
+                execute_host = my_match.group(4)
+
+            usage_dic = {'user': user,
+                         'execute_host': execute_host,
+                         'submit_host': 'N/A',
+                         'version': 'N/A',
+                         'license_server': my_match.group(5),
+                         'start_time': 'RESERVATION',
+                         'license_num': my_match.group(1)}
+
+            license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][feature]['in_use_info_string'].append(line.strip())
+            license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][feature]['in_use_info'].append(usage_dic)
+        elif license_compile_dic['license_server_status'].match(line):
+            my_match = license_compile_dic['license_server_status'].match(line)
+            license_server = my_match.group(1)
+            license_dic.setdefault(license_server, {'license_files': '',
+                                                    'license_server_status': 'UNKNOWN',
+                                                    'license_server_version': '',
+                                                    'vendor_daemon': {}})
+            expires_mark = False
+            vendor_daemon_status_mark = False
+            vendor_daemon = ''
+        elif license_compile_dic['license_files'].match(line):
+            my_match = license_compile_dic['license_files'].match(line)
+            license_dic[license_server]['license_files'] = my_match.group(2)
+        elif license_compile_dic['license_server'].match(line):
+            # License Manager Status—Status of each license server manager. Click the Update Status button to immediately refresh the status display for the license server.
+            # • Up—License server is currently running.
+            # • Down—License server is currently not running.
+            # • Unknown—License server status is not known.
+            # • Lost quorum—For license-server triads, this means that the quorum has been lost. A quorum requires that at least two of the three license servers are running and communicating with each other.
+            my_match = license_compile_dic['license_server'].match(line)
+            license_dic[license_server]['license_server_status'] = my_match.group(2)
+            license_dic[license_server]['license_server_version'] = my_match.group(3)
+        elif license_compile_dic['vendor_daemon_status'].match(line):
+            vendor_daemon_status_mark = True
+        elif vendor_daemon_status_mark and license_compile_dic['vendor_daemon_up'].match(line):
+            my_match = license_compile_dic['vendor_daemon_up'].match(line)
+            vendor_daemon = my_match.group(1)
+            license_dic[license_server]['vendor_daemon'].setdefault(vendor_daemon, {'vendor_daemon_status': 'UP',
+                                                                                    'vendor_daemon_version': my_match.group(2),
+                                                                                    'feature': {},
+                                                                                    'expires': {}})
+        elif license_compile_dic['feature_expires'].match(line):
+            expires_mark = True
+
+            if vendor_daemon:
+                license_dic[license_server]['vendor_daemon'][vendor_daemon].setdefault('expires', {})
+        elif vendor_daemon_status_mark and license_compile_dic['vendor_daemon_down'].match(line):
+            my_match = license_compile_dic['vendor_daemon_down'].match(line)
+            down_vendor_daemon = my_match.group(1)
+            license_dic[license_server]['vendor_daemon'].setdefault(down_vendor_daemon, {'vendor_daemon_status': 'DOWN',
+                                                                                         'vendor_daemon_version': '',
+                                                                                         'feature': {},
+                                                                                         'expires': {}})
+
+    return license_dic
+
+
+def parse_lmstat_stdout(stdout):
+    """
+    Decode lmstat stdout (bytes) of one license server and parse it into license_dic.
+    It is run on GetLicenseInfo parse worker processes, so it must be a picklable module level function.
+    """
+    return parse_lmstat_output(str(stdout, 'unicode_escape').split('\n'))
 
 
 class FilterLicenseDic():
@@ -369,7 +920,7 @@ class FilterLicenseDic():
                         if self.fuzzy_mode:
                             for feature_usage_attribute_value in feature_usage_attribute_value_list:
                                 if re.search(re.escape(feature_usage_attribute_value.lower()), usage_dic[feature_usage_attribute].lower()):
-                                    if usage_dic[feature_usage_attribute] not in exact_feature_usage_attribute_value_list:
+                                    if usage_dic[feature_usage_attribute] not in fuzzy_feature_usage_attribute_value_list:
                                         fuzzy_feature_usage_attribute_value_list.append(usage_dic[feature_usage_attribute])
 
         if exact_feature_usage_attribute_value_list:
@@ -640,3 +1191,21 @@ def parse_license_file(license_file):
                                               'vendor_daemon_path': my_match.group(3)}
 
     return license_file_dic
+
+
+def parse_lm_license_file(lm_license_file_file):
+    """
+    Parse config/LM_LICENSE_FILE and get license server list (skip empty lines and comments).
+    """
+    license_server_list = []
+
+    with open(lm_license_file_file, 'r') as LLF:
+        for line in LLF.readlines():
+            line = line.strip()
+
+            if (not re.match(r'^\s*$', line)) and (not re.match(r'^\s*#.*$', line)):
+                for license_server in line.split(':'):
+                    if license_server and (license_server not in license_server_list):
+                        license_server_list.append(license_server)
+
+    return license_server_list
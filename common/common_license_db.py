@@ -0,0 +1,745 @@
+import os
+import re
+import sys
+import time
+import json
+import fcntl
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.environ['LICENSE_MONITOR_INSTALL_PATH'])
+from common import common
+from common import common_sqlite3
+from common import common_license
+
+# Database layout on config.db_path/license_server/<license_server>/<vendor_daemon>.
+#   legacy       : usage.db/utilization.db/utilization_day.db, every feature is a table.
+#   consolidated : consolidated_usage.db/consolidated_utilization.db/consolidated_utilization_day.db,
+#                  one table for all features (keyed by feature), and a "feature" table with all feature names.
+# cost_day (daily license runtime rollup of usage) only has consolidated layout, consolidated_cost_day.db is used with both db layouts.
+DB_LAYOUT_LIST = ['legacy', 'consolidated']
+DB_KIND_LIST = ['usage', 'utilization', 'utilization_day']
+CONSOLIDATED_ONLY_DB_KIND_LIST = ['cost_day']
+
+# Table keys (legacy layout).
+USAGE_KEY_LIST = ['id', 'sample_second', 'sample_time', 'server', 'vendor', 'feature', 'user', 'submit_host', 'execute_host', 'num', 'version', 'start_second', 'start_time']
+USAGE_KEY_TYPE_LIST = ['INTEGER PRIMARY KEY AUTOINCREMENT', 'INTEGER', 'TEXT', 'TEXT', 'TEXT', 'TEXT', 'TEXT', 'TEXT', 'TEXT', 'TEXT', 'TEXT', 'INTEGER', 'TEXT']
+USAGE_CHECKOUT_KEY_LIST = ['server', 'vendor', 'feature', 'user', 'submit_host', 'execute_host', 'num', 'version', 'start_time']
+UTILIZATION_KEY_LIST = ['sample_second', 'sample_time', 'issued', 'in_use', 'utilization']
+UTILIZATION_KEY_TYPE_LIST = ['INTEGER PRIMARY KEY', 'TEXT', 'TEXT', 'INTEGER', 'TEXT']
+UTILIZATION_DAY_KEY_LIST = ['sample_date', 'issued', 'in_use', 'utilization']
+UTILIZATION_DAY_KEY_TYPE_LIST = ['TEXT PRIMARY KEY', 'TEXT', 'INTEGER', 'TEXT']
+
+# Running state of utilization day average, it is updated with every new utilization sample.
+UTILIZATION_DAY_SUM_KEY_LIST = ['sample_num', 'issued_sum', 'in_use_sum', 'utilization_sum']
+UTILIZATION_DAY_SUM_KEY_TYPE_LIST = ['INTEGER', 'TEXT', 'INTEGER', 'REAL']
+
+# License runtime (num * seconds) on sample_date (format "%Y%m%d") for feature/project, project is '' if no project is found for the usage.
+# runtime is split into projects with project proportion, full_runtime is the runtime before splitting, it is counted into "others" project.
+COST_DAY_KEY_LIST = ['feature', 'sample_date', 'project', 'runtime', 'full_runtime']
+
+# Table keys (consolidated layout), table name is the same as the db kind.
+CONSOLIDATED_TABLE_DIC = {'usage': {'key_list': USAGE_KEY_LIST,
+                                    'key_type_list': ['INTEGER PRIMARY KEY'] + USAGE_KEY_TYPE_LIST[1:],
+                                    'primary_key_list': [],
+                                    'index_dic': {'usage_checkout': {'key_list': ['feature'] + [key for key in USAGE_CHECKOUT_KEY_LIST if key != 'feature'], 'unique': True},
+                                                  'usage_feature_sample_second': {'key_list': ['feature', 'sample_second'], 'unique': False},
+                                                  'usage_sample_second': {'key_list': ['sample_second'], 'unique': False}}},
+                          'utilization': {'key_list': ['feature'] + UTILIZATION_KEY_LIST,
+                                          'key_type_list': ['TEXT', 'INTEGER', 'TEXT', 'TEXT', 'INTEGER', 'TEXT'],
+                                          'primary_key_list': ['feature', 'sample_second'],
+                                          'index_dic': {'utilization_sample_second': {'key_list': ['sample_second'], 'unique': False}}},
+                          'utilization_day': {'key_list': ['feature'] + UTILIZATION_DAY_KEY_LIST + UTILIZATION_DAY_SUM_KEY_LIST,
+                                              'key_type_list': ['TEXT', 'TEXT', 'TEXT', 'INTEGER', 'TEXT'] + UTILIZATION_DAY_SUM_KEY_TYPE_LIST,
+                                              'primary_key_list': ['feature', 'sample_date'],
+                                              'index_dic': {'utilization_day_sample_date': {'key_list': ['sample_date'], 'unique': False}}},
+                          'cost_day': {'key_list': COST_DAY_KEY_LIST,
+                                       'key_type_list': ['TEXT', 'TEXT', 'TEXT', 'REAL', 'INTEGER'],
+                                       'primary_key_list': ['feature', 'sample_date', 'project'],
+                                       'index_dic': {'cost_day_sample_date': {'key_list': ['sample_date'], 'unique': False}}}}
+
+# How long the consolidated tables keep data, unit is "day".
+# (Legacy tables keep 100000 usage/utilization items and 3650 utilization_day items for every feature.)
+CONSOLIDATED_RETENTION_DAY_DIC = {'usage': 365, 'utilization': 365, 'utilization_day': 3650, 'cost_day': 3650}
+
+# Database catalog on config.db_path/db_catalog.json, it is maintained by license_sample, format is like below:
+#   {'mtime': <config.db_path/license_server mtime>,
+#    'db_layout': <config.db_layout, the db files of it are preferred>,
+#    'license_server': {license_server: {'mtime': <license_server directory mtime>,
+#                                        'vendor_daemon': {vendor_daemon: {'mtime': <vendor_daemon directory mtime>,
+#                                                                          'db_file': {db_kind: {'file': <db file>,
+#                                                                                                'mtime': <db file mtime>,
+#                                                                                                'feature_list': [...],
+#                                                                                                'sample_second_range': [<min>, <max>]}}}}}}}
+# mtime is st_mtime_ns, unchanged directories are not scanned again.
+# feature_list/sample_second_range may cover more than the db file (deleted features/samples are not removed), they are only reliable if the db file mtime is unchanged.
+
+
+def get_db_layout(config):
+    """
+    Get db layout from config, default is "legacy".
+    """
+    db_layout = 'legacy'
+
+    if hasattr(config, 'db_layout') and config.db_layout:
+        db_layout = config.db_layout
+
+    return db_layout
+
+
+def get_legacy_db_file(vendor_daemon_path, db_kind):
+    """
+    Get legacy db file path for usage/utilization/utilization_day.
+    """
+    return str(vendor_daemon_path) + '/' + str(db_kind) + '.db'
+
+
+def get_consolidated_db_file(vendor_daemon_path, db_kind):
+    """
+    Get consolidated db file path for usage/utilization/utilization_day.
+    """
+    return str(vendor_daemon_path) + '/consolidated_' + str(db_kind) + '.db'
+
+
+def get_db_file(vendor_daemon_path, db_kind, db_layout='legacy'):
+    """
+    Get existing db file for usage/utilization/utilization_day/cost_day, the db file of db_layout (config.db_layout, license_sample writes it) is preferred.
+    The db file of the other layout is only used if the db file of db_layout is missing.
+    Return '' if no db file exists.
+    """
+    consolidated_db_file = get_consolidated_db_file(vendor_daemon_path, db_kind)
+    legacy_db_file = get_legacy_db_file(vendor_daemon_path, db_kind)
+
+    if (db_layout == 'consolidated') or (db_kind in CONSOLIDATED_ONLY_DB_KIND_LIST):
+        db_file_list = [consolidated_db_file, legacy_db_file]
+    else:
+        db_file_list = [legacy_db_file, consolidated_db_file]
+
+    for db_file in db_file_list:
+        if os.path.exists(db_file):
+            return db_file
+
+    return ''
+
+
+def get_consolidated_db_kind(db_file):
+    """
+    Get db kind (usage/utilization/utilization_day/cost_day) from consolidated db file, return '' for legacy db file.
+    """
+    my_match = re.match(r'^consolidated_(\S+)\.db$', os.path.basename(str(db_file)))
+
+    if my_match and (my_match.group(1) in (DB_KIND_LIST + CONSOLIDATED_ONLY_DB_KIND_LIST)):
+        return my_match.group(1)
+
+    return ''
+
+
+def init_consolidated_db(db_file, conn, db_kind, commit=True):
+    """
+    Create consolidated table/indexes and feature table if they not exist.
+    """
+    table_dic = CONSOLIDATED_TABLE_DIC[db_kind]
+    key_string = common_sqlite3.gen_sql_table_key_string(table_dic['key_list'], table_dic['key_type_list'])
+
+    if table_dic['primary_key_list']:
+        key_string = re.sub(r'\);$', ', PRIMARY KEY ' + common_sqlite3.gen_sql_name_string(table_dic['primary_key_list']) + ');', key_string)
+
+    common_sqlite3.create_sql_table(db_file, conn, db_kind, key_string, commit=False)
+    common_sqlite3.create_sql_table(db_file, conn, 'feature', "('feature' TEXT PRIMARY KEY);", commit=False)
+    add_missing_columns(db_file, conn, db_kind, table_dic['key_list'], table_dic['key_type_list'])
+
+    for (index_name, index_dic) in table_dic['index_dic'].items():
+        common_sqlite3.create_sql_index(db_file, conn, index_name, db_kind, index_dic['key_list'], unique=index_dic['unique'], commit=False)
+
+    if commit:
+        conn.commit()
+
+
+def add_missing_columns(db_file, conn, table_name, key_list, key_type_list):
+    """
+    Add the columns which are on key_list but not on table (the table is created by old version).
+    """
+    column_list = common_sqlite3.get_sql_table_column_list(db_file, conn, table_name)
+
+    for (i, key) in enumerate(key_list):
+        if key not in column_list:
+            common_sqlite3.add_sql_table_column(db_file, conn, table_name, key, key_type_list[i], commit=False)
+
+
+def save_consolidated_feature_list(db_file, conn, feature_list, commit=True):
+    """
+    Save feature names into the feature table of consolidated db.
+    """
+    common_sqlite3.insert_many_into_sql_table(db_file, conn, 'feature', ['feature'], [[feature] for feature in feature_list], commit=commit)
+
+
+def cleanup_consolidated_db(db_file, conn, db_kind, sample_second, commit=True):
+    """
+    Delete out-of-date data from consolidated db, based on CONSOLIDATED_RETENTION_DAY_DIC.
+    """
+    retention_second = int(sample_second) - CONSOLIDATED_RETENTION_DAY_DIC[db_kind]*86400
+
+    if db_kind in ['utilization_day', 'cost_day']:
+        retention_date = datetime.datetime.fromtimestamp(retention_second).strftime('%Y%m%d')
+        where_condition = "WHERE sample_date<'" + str(retention_date) + "'"
+    else:
+        where_condition = 'WHERE sample_second<' + str(retention_second)
+
+    common_sqlite3.delete_sql_table_data(db_file, conn, db_kind, where_condition, commit=commit)
+
+
+def get_feature_list(db_file, conn):
+    """
+    Get all feature names from usage/utilization/utilization_day db file (legacy or consolidated).
+    """
+    if get_consolidated_db_kind(db_file):
+        feature_list = sorted(common_sqlite3.get_sql_table_key_list(db_file, conn, 'feature', 'feature'))
+    else:
+        feature_list = common_sqlite3.get_sql_table_list(db_file, conn)
+
+        if 'sqlite_sequence' in feature_list:
+            feature_list.remove('sqlite_sequence')
+
+    return feature_list
+
+
+def get_feature_data(db_file, conn, feature, key_list=[], select_condition=''):
+    """
+    Get specified feature data from usage/utilization/utilization_day db file (legacy or consolidated).
+    select_condition is a "WHERE ..." clause, just like common_sqlite3.get_sql_table_data.
+    """
+    db_kind = get_consolidated_db_kind(db_file)
+
+    if not db_kind:
+        return common_sqlite3.get_sql_table_data(db_file, conn, feature, key_list, select_condition)
+
+    feature_condition = "WHERE feature='" + str(feature).replace("'", "''") + "'"
+
+    if re.match(r'^\s*WHERE\s+', select_condition, re.I):
+        select_condition = str(feature_condition) + ' AND (' + re.sub(r'^\s*WHERE\s+', '', select_condition, flags=re.I) + ')'
+    else:
+        select_condition = str(feature_condition) + ' ' + str(select_condition)
+
+    return common_sqlite3.get_sql_table_data(db_file, conn, db_kind, key_list, select_condition)
+
+
+def get_sample_date_condition(sample_date):
+    """
+    Get select condition for all of the utilization samples on sample_date (format "%Y%m%d").
+    """
+    begin_second = int(time.mktime(time.strptime(str(sample_date) + ' 00:00:00', '%Y%m%d %H:%M:%S')))
+    end_second = int(time.mktime(time.strptime(str(sample_date) + ' 23:59:59', '%Y%m%d %H:%M:%S')))
+    select_condition = 'WHERE sample_second BETWEEN ' + str(begin_second) + ' AND ' + str(end_second)
+
+    return select_condition
+
+
+def count_utilization_day_sum(sum_dic, issued, in_use, utilization):
+    """
+    Add one utilization sample into utilization day running state (sample_num/issued_sum/in_use_sum/utilization_sum).
+    Empty sum_dic means no sample yet.
+    """
+    if not sum_dic:
+        sum_dic = {'sample_num': 0, 'issued_sum': 0, 'in_use_sum': 0, 'utilization_sum': 0}
+
+    if (issued == 'Uncounted') or (sum_dic['issued_sum'] == 'Uncounted'):
+        issued_sum = 'Uncounted'
+    else:
+        issued_sum = int(sum_dic['issued_sum']) + int(issued)
+
+    return {'sample_num': int(sum_dic['sample_num']) + 1,
+            'issued_sum': issued_sum,
+            'in_use_sum': int(sum_dic['in_use_sum']) + int(in_use),
+            'utilization_sum': float(sum_dic['utilization_sum']) + float(utilization)}
+
+
+def count_utilization_day_average(sum_dic):
+    """
+    Count issued_avg/in_use_avg/utilization_avg with utilization day running state.
+    """
+    if sum_dic['issued_sum'] == 'Uncounted':
+        issued_avg = 'Uncounted'
+    else:
+        issued_avg = round(int(sum_dic['issued_sum'])/sum_dic['sample_num'], 1)
+
+    in_use_avg = round(int(sum_dic['in_use_sum'])/sum_dic['sample_num'], 1)
+    utilization_avg = round(float(sum_dic['utilization_sum'])/sum_dic['sample_num'], 1)
+
+    return {'issued': issued_avg, 'in_use': in_use_avg, 'utilization': utilization_avg}
+
+
+def get_utilization_day_sum_from_raw(utilization_db_file, conn, sample_date, feature_list=[]):
+    """
+    Recount utilization day running state from the raw samples on utilization db file (legacy or consolidated).
+    Return {feature: sum_dic}, only specified features are counted if feature_list is not empty.
+    """
+    feature_sum_dic = {}
+    select_condition = get_sample_date_condition(sample_date) + ' ORDER BY sample_second'
+
+    if get_consolidated_db_kind(utilization_db_file):
+        data_dic = common_sqlite3.get_sql_table_data(utilization_db_file, conn, 'utilization', ['feature', 'issued', 'in_use', 'utilization'], select_condition)
+
+        for (i, feature) in enumerate(data_dic.get('feature', [])):
+            if (not feature_list) or (feature in feature_list):
+                feature_sum_dic[feature] = count_utilization_day_sum(feature_sum_dic.get(feature, {}), data_dic['issued'][i], data_dic['in_use'][i], data_dic['utilization'][i])
+    else:
+        for feature in get_feature_list(utilization_db_file, conn):
+            if (not feature_list) or (feature in feature_list):
+                data_dic = common_sqlite3.get_sql_table_data(utilization_db_file, conn, feature, ['issued', 'in_use', 'utilization'], select_condition)
+
+                for i in range(len(data_dic.get('issued', []))):
+                    feature_sum_dic[feature] = count_utilization_day_sum(feature_sum_dic.get(feature, {}), data_dic['issued'][i], data_dic['in_use'][i], data_dic['utilization'][i])
+
+    return feature_sum_dic
+
+
+def get_utilization_day_info(utilization_day_db_file, conn, sample_date, feature_list=[]):
+    """
+    Get saved utilization day info (average and running state) of sample_date from utilization_day db file (legacy or consolidated).
+    Return {feature: {'issued': ..., 'in_use': ..., 'utilization': ..., 'sample_num': ..., ...}}, running state is None if the row is saved by old version.
+    """
+    utilization_day_dic = {}
+    key_list = UTILIZATION_DAY_KEY_LIST + UTILIZATION_DAY_SUM_KEY_LIST
+    select_condition = "WHERE sample_date='" + str(sample_date) + "'"
+
+    if get_consolidated_db_kind(utilization_day_db_file):
+        column_list = common_sqlite3.get_sql_table_column_list(utilization_day_db_file, conn, 'utilization_day')
+        data_dic = common_sqlite3.get_sql_table_data(utilization_day_db_file, conn, 'utilization_day', ['feature'] + [key for key in key_list if key in column_list], select_condition)
+
+        for (i, feature) in enumerate(data_dic.get('feature', [])):
+            if (not feature_list) or (feature in feature_list):
+                utilization_day_dic[feature] = {key: (data_dic[key][i] if key in data_dic else None) for key in key_list}
+    else:
+        for feature in get_feature_list(utilization_day_db_file, conn):
+            if (not feature_list) or (feature in feature_list):
+                column_list = common_sqlite3.get_sql_table_column_list(utilization_day_db_file, conn, feature)
+                data_dic = common_sqlite3.get_sql_table_data(utilization_day_db_file, conn, feature, [key for key in key_list if key in column_list], select_condition)
+
+                if data_dic.get('sample_date', []):
+                    utilization_day_dic[feature] = {key: (data_dic[key][0] if key in data_dic else None) for key in key_list}
+
+    return utilization_day_dic
+
+
+def save_utilization_day_sum(utilization_day_db_file, conn, sample_date, feature_sum_dic, commit=True):
+    """
+    Save utilization day average and running state of sample_date into utilization_day db file (legacy or consolidated).
+    """
+    key_list = UTILIZATION_DAY_KEY_LIST + UTILIZATION_DAY_SUM_KEY_LIST
+    value_list_dic = {}
+
+    for (feature, sum_dic) in feature_sum_dic.items():
+        average_dic = count_utilization_day_average(sum_dic)
+        value_list_dic[feature] = [sample_date, average_dic['issued'], average_dic['in_use'], average_dic['utilization'], sum_dic['sample_num'], sum_dic['issued_sum'], sum_dic['in_use_sum'], sum_dic['utilization_sum']]
+
+    if get_consolidated_db_kind(utilization_day_db_file):
+        init_consolidated_db(utilization_day_db_file, conn, 'utilization_day', commit=False)
+        save_consolidated_feature_list(utilization_day_db_file, conn, list(feature_sum_dic.keys()), commit=False)
+        common_sqlite3.upsert_into_sql_table(utilization_day_db_file, conn, 'utilization_day', ['feature'] + key_list, [[feature] + value_list for (feature, value_list) in value_list_dic.items()], ['feature', 'sample_date'], key_list[1:], commit=False)
+    else:
+        table_list = common_sqlite3.get_sql_table_list(utilization_day_db_file, conn)
+
+        for (feature, value_list) in value_list_dic.items():
+            if feature not in table_list:
+                key_string = common_sqlite3.gen_sql_table_key_string(key_list, UTILIZATION_DAY_KEY_TYPE_LIST + UTILIZATION_DAY_SUM_KEY_TYPE_LIST)
+                common_sqlite3.create_sql_table(utilization_day_db_file, conn, feature, key_string, commit=False)
+            else:
+                add_missing_columns(utilization_day_db_file, conn, feature, UTILIZATION_DAY_SUM_KEY_LIST, UTILIZATION_DAY_SUM_KEY_TYPE_LIST)
+
+            common_sqlite3.upsert_into_sql_table(utilization_day_db_file, conn, feature, key_list, [value_list], ['sample_date'], key_list[1:], commit=False)
+
+    if commit:
+        conn.commit()
+
+
+def get_feature_sample_partial_sum(db_file, filter_feature_list_function, time_key, range_key, begin_value, end_value):
+    """
+    Sum up issued/in_use of the same feature and time (time_key is "sample_time" on utilization db, or "sample_date" on utilization_day db) on one db file with GROUP BY,
+    it connects db_file with readonly mode, so the db files of different license servers can be read on db reader threads (read_db_files) at the same time.
+    The samples with range_key between begin_value and end_value are counted, filter_feature_list_function gets the specified features from all of the features on db_file.
+    Return (specified_feature_list, [(feature, time, uncounted, issued_sum, in_use_sum), ...]), the partial sums are merged with sum_feature_sample_partial_list.
+    """
+    sample_list = []
+    (result, conn) = common_sqlite3.connect_db_file(db_file, mode='readonly')
+
+    if result == 'failed':
+        return [], sample_list
+
+    specified_feature_list = filter_feature_list_function(get_feature_list(db_file, conn))
+
+    if specified_feature_list:
+        db_kind = get_consolidated_db_kind(db_file)
+
+        # sample_second is INTEGER and sample_date is TEXT, begin_value/end_value should be bound with the same type, so the comparison is right and the indexes are used.
+        sample_select_string = "SELECT " + str(time_key) + ", MAX(issued='Uncounted'), SUM(CAST(issued AS REAL)), SUM(CAST(in_use AS REAL))"
+        sample_where_string = " WHERE " + str(range_key) + " BETWEEN ? AND ?"
+
+        try:
+            if db_kind:
+                # Specified features are saved on a temp table (readonly connection can still write temp db), there may be too many of them for "IN (?, ...)".
+                conn.execute("CREATE TEMP TABLE specified_feature (feature TEXT PRIMARY KEY)")
+                conn.executemany("INSERT OR IGNORE INTO specified_feature VALUES (?)", [(feature,) for feature in specified_feature_list])
+                sample_list = conn.execute(sample_select_string.replace('SELECT ', 'SELECT feature, ', 1) + " FROM " + str(db_kind) + sample_where_string + " AND feature IN (SELECT feature FROM specified_feature) GROUP BY feature, " + str(time_key), [begin_value, end_value]).fetchall()
+            else:
+                for feature in specified_feature_list:
+                    sample_list.extend(conn.execute(sample_select_string.replace('SELECT ', 'SELECT ?, ', 1) + " FROM " + common_sqlite3.gen_sql_name_string([feature])[1:-1] + sample_where_string + " GROUP BY " + str(time_key), [feature, begin_value, end_value]).fetchall())
+        except Exception as error:
+            common.bprint('Failed on getting feature samples from db_file "' + str(db_file) + '".', level='Error')
+            common.bprint(error, color='red', display_method=1, indent=9)
+
+    conn.close()
+
+    return specified_feature_list, sample_list
+
+
+def sum_feature_sample_partial_list(partial_sum_list):
+    """
+    Sum up the partial sums (get_feature_sample_partial_sum) of the db files from different license servers, the series and summaries are counted with GROUP BY on an in-memory db, only the final results are returned.
+    Return {feature: {'sample_data': {time: {'issued': <float or 'Uncounted'>, 'in_use': <float>}}, 'summary': {'sample_num': ..., 'issued_sum': <float or 'Uncounted'>, 'in_use_sum': ..., 'peak_in_use': ...}}}.
+    ("Uncounted" issued on any license server makes the sum "Uncounted".)
+    """
+    feature_sample_dic = {}
+    feature_order_dic = {}
+    (result, conn) = common_sqlite3.connect_memory_db()
+
+    if result != 'passed':
+        return feature_sample_dic
+
+    common_sqlite3.execute_sql_command(conn, "CREATE TABLE sample (feature TEXT, time TEXT, uncounted INTEGER, issued REAL, in_use REAL)")
+
+    for (specified_feature_list, sample_list) in partial_sum_list:
+        for feature in specified_feature_list:
+            feature_order_dic.setdefault(feature, len(feature_order_dic))
+
+        conn.executemany("INSERT INTO sample VALUES (?, ?, ?, ?, ?)", sample_list)
+
+    conn.commit()
+
+    series_string = "SELECT feature, time, MAX(uncounted) AS uncounted, SUM(issued) AS issued, SUM(in_use) AS in_use FROM sample GROUP BY feature, time"
+    data_dic = common_sqlite3.get_sql_query_data(conn, series_string + " ORDER BY feature, time")
+
+    # Keep the features with the order they are found on db files.
+    for feature in sorted(set(data_dic.get('feature', [])), key=lambda feature: feature_order_dic.get(feature, len(feature_order_dic))):
+        feature_sample_dic[feature] = {'sample_data': {}, 'summary': {}}
+
+    for (i, feature) in enumerate(data_dic.get('feature', [])):
+        feature_sample_dic[feature]['sample_data'][data_dic['time'][i]] = {'issued': ('Uncounted' if data_dic['uncounted'][i] else data_dic['issued'][i]), 'in_use': data_dic['in_use'][i]}
+
+    data_dic = common_sqlite3.get_sql_query_data(conn, "SELECT feature, COUNT(*) AS sample_num, MAX(uncounted) AS uncounted, SUM(issued) AS issued_sum, SUM(in_use) AS in_use_sum, MAX(in_use) AS peak_in_use FROM (" + series_string + ") GROUP BY feature")
+
+    for (i, feature) in enumerate(data_dic.get('feature', [])):
+        feature_sample_dic[feature]['summary'] = {'sample_num': data_dic['sample_num'][i],
+                                                  'issued_sum': ('Uncounted' if data_dic['uncounted'][i] else data_dic['issued_sum'][i]),
+                                                  'in_use_sum': data_dic['in_use_sum'][i],
+                                                  'peak_in_use': data_dic['peak_in_use'][i]}
+
+    conn.close()
+
+    return feature_sample_dic
+
+
+def split_second_range_by_date(begin_second, end_second):
+    """
+    Split second range [begin_second, end_second) by local date, return [(sample_date, seconds), ...].
+    """
+    date_second_list = []
+    begin_second = int(begin_second)
+    end_second = int(end_second)
+
+    while begin_second < end_second:
+        sample_date = datetime.date.fromtimestamp(begin_second)
+        next_date_second = int(time.mktime((sample_date + datetime.timedelta(days=1)).timetuple()))
+        date_second_list.append((sample_date.strftime('%Y%m%d'), min(next_date_second, end_second) - begin_second))
+        begin_second = next_date_second
+
+    return date_second_list
+
+
+def init_cost_day_db(cost_day_db_file, conn, commit=True):
+    """
+    Create cost_day table/indexes, feature table and setting table if they not exist.
+    """
+    init_consolidated_db(cost_day_db_file, conn, 'cost_day', commit=False)
+    common_sqlite3.create_sql_table(cost_day_db_file, conn, 'setting', "('name' TEXT PRIMARY KEY, 'value' TEXT);", commit=False)
+
+    if commit:
+        conn.commit()
+
+
+def get_cost_day_begin_date(cost_day_db_file, conn):
+    """
+    Get the first sample_date which cost_day db has complete runtime info for, return None if it is unknown.
+    ('' means cost_day db is backfilled with all of the usage history.)
+    """
+    if 'setting' in common_sqlite3.get_sql_table_list(cost_day_db_file, conn):
+        data_dic = common_sqlite3.get_sql_table_data(cost_day_db_file, conn, 'setting', ['value'], "WHERE name='begin_date'")
+
+        if data_dic and data_dic['value']:
+            return data_dic['value'][0]
+
+    return None
+
+
+def set_cost_day_begin_date(cost_day_db_file, conn, begin_date, commit=True):
+    """
+    Save the first sample_date which cost_day db has complete runtime info for.
+    """
+    common_sqlite3.upsert_into_sql_table(cost_day_db_file, conn, 'setting', ['name', 'value'], [['begin_date', begin_date]], ['name'], ['value'], commit=commit)
+
+
+def save_cost_day_runtime(cost_day_db_file, conn, cost_day_runtime_dic, commit=True):
+    """
+    Add runtime into cost_day db, cost_day_runtime_dic format is {(feature, sample_date, project): [runtime, full_runtime]}.
+    """
+    init_cost_day_db(cost_day_db_file, conn, commit=False)
+    save_consolidated_feature_list(cost_day_db_file, conn, sorted(set([key[0] for key in cost_day_runtime_dic.keys()])), commit=False)
+    value_list_list = [list(key) + list(value) for (key, value) in cost_day_runtime_dic.items()]
+    common_sqlite3.upsert_into_sql_table(cost_day_db_file, conn, 'cost_day', COST_DAY_KEY_LIST, value_list_list, ['feature', 'sample_date', 'project'], [], commit=False, add_key_list=['runtime', 'full_runtime'])
+
+    if commit:
+        conn.commit()
+
+
+def cleanup_cost_day_db(cost_day_db_file, conn, sample_second, commit=True):
+    """
+    Delete out-of-date data from cost_day db, and move begin_date forward to the retention date.
+    """
+    cleanup_consolidated_db(cost_day_db_file, conn, 'cost_day', sample_second, commit=False)
+    retention_date = datetime.datetime.fromtimestamp(int(sample_second) - CONSOLIDATED_RETENTION_DAY_DIC['cost_day']*86400).strftime('%Y%m%d')
+    begin_date = get_cost_day_begin_date(cost_day_db_file, conn)
+
+    if (begin_date is not None) and (begin_date < retention_date):
+        set_cost_day_begin_date(cost_day_db_file, conn, retention_date, commit=False)
+
+    if commit:
+        conn.commit()
+
+
+def get_db_catalog_file(db_path):
+    """
+    Get db catalog file path with config.db_path.
+    """
+    return str(db_path) + '/db_catalog.json'
+
+
+def get_path_mtime(path):
+    """
+    Get st_mtime_ns of file/directory, return 0 if it does not exist.
+    """
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def get_db_file_sample_second_range(db_file, conn, db_kind, feature_list):
+    """
+    Get [min, max] sample second of usage/utilization/utilization_day/cost_day db file (legacy or consolidated), return [] if no sample.
+    """
+    if db_kind in ['utilization_day', 'cost_day']:
+        key = 'sample_date'
+    else:
+        key = 'sample_second'
+
+    if get_consolidated_db_kind(db_file):
+        table_list = [db_kind]
+    else:
+        table_list = feature_list
+
+    min_value_list = []
+    max_value_list = []
+
+    for table_name in table_list:
+        (min_value, max_value) = common_sqlite3.get_sql_table_key_range(db_file, conn, table_name, key)
+
+        if (min_value is not None) and (max_value is not None):
+            min_value_list.append(int(min_value))
+            max_value_list.append(int(max_value))
+
+    if not min_value_list:
+        return []
+
+    if db_kind in ['utilization_day', 'cost_day']:
+        begin_second = int(time.mktime(time.strptime(str(min(min_value_list)) + ' 00:00:00', '%Y%m%d %H:%M:%S')))
+        end_second = int(time.mktime(time.strptime(str(max(max_value_list)) + ' 23:59:59', '%Y%m%d %H:%M:%S')))
+
+        return [begin_second, end_second]
+
+    return [min(min_value_list), max(max_value_list)]
+
+
+def scan_db_file_catalog(db_file, db_kind):
+    """
+    Get catalog info (feature list and sample second range) of db file.
+    """
+    db_file_dic = {'file': db_file, 'mtime': get_path_mtime(db_file), 'feature_list': [], 'sample_second_range': []}
+    (result, conn) = common_sqlite3.connect_db_file(db_file, mode='read')
+
+    if result == 'passed':
+        db_file_dic['feature_list'] = sorted(get_feature_list(db_file, conn))
+        db_file_dic['sample_second_range'] = get_db_file_sample_second_range(db_file, conn, db_kind, db_file_dic['feature_list'])
+        conn.close()
+
+    return db_file_dic
+
+
+def scan_vendor_daemon_catalog(vendor_daemon_path, old_vendor_daemon_dic={}, scan_db=True, db_layout='legacy'):
+    """
+    Get catalog info of vendor_daemon directory.
+    The catalog info of known db files is kept (even if they are updated), new db files are scanned only if scan_db is True.
+    """
+    vendor_daemon_dic = {'mtime': get_path_mtime(vendor_daemon_path), 'db_file': {}}
+
+    for db_kind in DB_KIND_LIST + CONSOLIDATED_ONLY_DB_KIND_LIST:
+        db_file = get_db_file(vendor_daemon_path, db_kind, db_layout)
+
+        if db_file:
+            old_db_file_dic = old_vendor_daemon_dic.get('db_file', {}).get(db_kind, {})
+
+            if old_db_file_dic.get('file', '') == db_file:
+                vendor_daemon_dic['db_file'][db_kind] = old_db_file_dic
+            elif scan_db:
+                vendor_daemon_dic['db_file'][db_kind] = scan_db_file_catalog(db_file, db_kind)
+            else:
+                vendor_daemon_dic['db_file'][db_kind] = {'file': db_file}
+
+    return vendor_daemon_dic
+
+
+def revalidate_db_catalog(db_path, db_catalog_dic={}, scan_db=True, db_layout='legacy'):
+    """
+    Revalidate db catalog with directory mtime, only the changed directories are scanned again.
+    All of the directories are scanned again if db_layout is changed.
+    """
+    license_server_db_path = str(db_path) + '/license_server'
+    new_db_catalog_dic = {'mtime': get_path_mtime(license_server_db_path), 'db_layout': db_layout, 'license_server': {}}
+
+    if not new_db_catalog_dic['mtime']:
+        return new_db_catalog_dic
+
+    if db_catalog_dic.get('db_layout', '') != db_layout:
+        db_catalog_dic = {}
+
+    old_license_server_dic = db_catalog_dic.get('license_server', {})
+
+    if new_db_catalog_dic['mtime'] == db_catalog_dic.get('mtime', 0):
+        license_server_list = list(old_license_server_dic.keys())
+    else:
+        license_server_list = [license_server for license_server in os.listdir(license_server_db_path) if re.match(r'^\d+@\S+$', license_server)]
+
+    for license_server in sorted(license_server_list):
+        license_server_path = str(license_server_db_path) + '/' + str(license_server)
+        old_server_dic = old_license_server_dic.get(license_server, {})
+        server_mtime = get_path_mtime(license_server_path)
+
+        if (not server_mtime) or (not os.path.isdir(license_server_path)):
+            continue
+
+        new_db_catalog_dic['license_server'][license_server] = {'mtime': server_mtime, 'vendor_daemon': {}}
+        old_vendor_daemon_dic = old_server_dic.get('vendor_daemon', {})
+
+        if server_mtime == old_server_dic.get('mtime', 0):
+            vendor_daemon_list = list(old_vendor_daemon_dic.keys())
+        else:
+            vendor_daemon_list = [vendor_daemon for vendor_daemon in os.listdir(license_server_path) if os.path.isdir(str(license_server_path) + '/' + str(vendor_daemon))]
+
+        for vendor_daemon in sorted(vendor_daemon_list):
+            vendor_daemon_path = str(license_server_path) + '/' + str(vendor_daemon)
+            vendor_daemon_mtime = get_path_mtime(vendor_daemon_path)
+
+            if not vendor_daemon_mtime:
+                continue
+            elif vendor_daemon_mtime == old_vendor_daemon_dic.get(vendor_daemon, {}).get('mtime', 0):
+                new_db_catalog_dic['license_server'][license_server]['vendor_daemon'][vendor_daemon] = old_vendor_daemon_dic[vendor_daemon]
+            else:
+                new_db_catalog_dic['license_server'][license_server]['vendor_daemon'][vendor_daemon] = scan_vendor_daemon_catalog(vendor_daemon_path, old_vendor_daemon_dic.get(vendor_daemon, {}), scan_db, db_layout)
+
+    return new_db_catalog_dic
+
+
+def load_db_catalog(db_path):
+    """
+    Load db catalog from config.db_path/db_catalog.json, return {} if it is missing or broken.
+    """
+    db_catalog_file = get_db_catalog_file(db_path)
+    db_catalog_dic = {}
+
+    if os.path.exists(db_catalog_file):
+        try:
+            with open(db_catalog_file, 'r') as DCF:
+                db_catalog_dic = json.load(DCF)
+        except Exception as warning:
+            common.bprint('Failed on loading db catalog file "' + str(db_catalog_file) + '", ignore it.', date_format='%Y-%m-%d %H:%M:%S', level='Warning')
+            common.bprint(warning, color='yellow', display_method=1, indent=11)
+
+    return db_catalog_dic
+
+
+def update_db_catalog(db_path, sample_dic={}, db_layout='legacy'):
+    """
+    Revalidate db catalog and save it, new samples on sample_dic are added into the catalog info of the db files.
+    sample_dic format is {license_server: {vendor_daemon: {db_kind: {'feature_list': [...], 'sample_second': ...}}}}.
+    It is locked with config.db_path/.db_catalog.lock, since usage and utilization are sampled on different processes.
+    """
+    with open(str(db_path) + '/.db_catalog.lock', 'a') as LF:
+        fcntl.flock(LF, fcntl.LOCK_EX)
+
+        try:
+            db_catalog_dic = revalidate_db_catalog(db_path, load_db_catalog(db_path), scan_db=True, db_layout=db_layout)
+
+            for (license_server, vendor_daemon_dic) in sample_dic.items():
+                for (vendor_daemon, db_kind_dic) in vendor_daemon_dic.items():
+                    for (db_kind, db_kind_sample_dic) in db_kind_dic.items():
+                        db_file_dic = db_catalog_dic['license_server'].get(license_server, {}).get('vendor_daemon', {}).get(vendor_daemon, {}).get('db_file', {}).get(db_kind, {})
+
+                        if 'feature_list' in db_file_dic:
+                            db_file_dic['feature_list'] = sorted(set(db_file_dic['feature_list']) | set(db_kind_sample_dic['feature_list']))
+                            sample_second = int(db_kind_sample_dic['sample_second'])
+
+                            if db_file_dic['sample_second_range']:
+                                db_file_dic['sample_second_range'] = [min(db_file_dic['sample_second_range'][0], sample_second), max(db_file_dic['sample_second_range'][1], sample_second)]
+                            else:
+                                db_file_dic['sample_second_range'] = [sample_second, sample_second]
+
+                            db_file_dic['mtime'] = get_path_mtime(db_file_dic['file'])
+
+            common_license.save_json_file(get_db_catalog_file(db_path), db_catalog_dic)
+        finally:
+            fcntl.flock(LF, fcntl.LOCK_UN)
+
+
+def is_db_file_in_range(db_file_dic, begin_second, end_second=None):
+    """
+    Check whether the db file (catalog info) may have samples in [begin_second, end_second] (no end_second means no upper limit).
+    Return True if the db file is updated after it is cataloged, since the catalog info is not reliable then.
+    """
+    if ('sample_second_range' not in db_file_dic) or (db_file_dic.get('mtime', 0) != get_path_mtime(db_file_dic['file'])):
+        return True
+
+    if not db_file_dic['sample_second_range']:
+        return False
+
+    (min_second, max_second) = db_file_dic['sample_second_range']
+
+    if max_second < begin_second:
+        return False
+
+    if (end_second is not None) and (min_second > end_second):
+        return False
+
+    return True
+
+
+def read_db_files(read_function, task_list, max_workers=8):
+    """
+    Run read_function on every task of task_list with a thread pool, and return the results with the same order as task_list.
+    read_function should connect db files with "readonly" mode by itself (sqlite connection cannot be shared between threads).
+    sqlite releases GIL while reading, so the query time of many db files (on network storage) depends on the slowest one instead of the sum of them.
+    """
+    max_workers = min(int(max_workers), len(task_list))
+
+    if max_workers <= 1:
+        return [read_function(task) for task in task_list]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(read_function, task_list))
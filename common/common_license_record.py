@@ -0,0 +1,607 @@
+import os
+import sys
+
+sys.path.append(os.environ['LICENSE_MONITOR_INSTALL_PATH'])
+from common import common
+from common import common_license
+
+os.environ['PYTHONUNBUFFERED'] = '1'
+
+
+class LicenseRecord():
+    """
+    Base class of license records.
+    A record can be read like the dict on license_dic (record['key'], record.get('key'), record.keys() ...), the values are in license_dic format (counts are strings).
+    """
+    __slots__ = ()
+    legacy_key_list = ()
+
+    def get_legacy_key_list(self):
+        return self.legacy_key_list
+
+    def get_legacy_value(self, key):
+        return getattr(self, key)
+
+    def __getitem__(self, key):
+        if key in self.get_legacy_key_list():
+            return self.get_legacy_value(key)
+
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self.get_legacy_key_list()
+
+    def __iter__(self):
+        return iter(self.get_legacy_key_list())
+
+    def __len__(self):
+        return len(self.get_legacy_key_list())
+
+    def get(self, key, default=None):
+        if key in self.get_legacy_key_list():
+            return self.get_legacy_value(key)
+
+        return default
+
+    def keys(self):
+        return list(self.get_legacy_key_list())
+
+    def values(self):
+        return [self.get_legacy_value(key) for key in self.get_legacy_key_list()]
+
+    def items(self):
+        return [(key, self.get_legacy_value(key)) for key in self.get_legacy_key_list()]
+
+
+class UsageRecord(LicenseRecord):
+    """
+    One checkout (or reservation) of license feature, license_num is int, start_second is start_time in seconds from 1970 (0 for RESERVATION).
+    line is the original lmstat line, it is only kept on demand.
+    """
+    __slots__ = ('user', 'execute_host', 'submit_host', 'version', 'license_server', 'start_time', 'start_second', 'license_num', 'line')
+    legacy_key_list = ('user', 'execute_host', 'submit_host', 'version', 'license_server', 'start_time', 'license_num')
+
+    def __init__(self, user, execute_host, submit_host, version, license_server, start_time, start_second, license_num, line=None):
+        self.user = user
+        self.execute_host = execute_host
+        self.submit_host = submit_host
+        self.version = version
+        self.license_server = license_server
+        self.start_time = start_time
+        self.start_second = start_second
+        self.license_num = license_num
+        self.line = line
+
+    def get_legacy_value(self, key):
+        if key == 'license_num':
+            return str(self.license_num)
+
+        return getattr(self, key)
+
+
+class FeatureRecord(LicenseRecord):
+    """
+    Usage of one license feature, issued/in_use are int (issued is None for "Uncounted"), in_use_info is UsageRecord list.
+    """
+    __slots__ = ('issued', 'in_use', 'in_use_info')
+    legacy_key_list = ('issued', 'in_use', 'in_use_info_string', 'in_use_info')
+
+    def __init__(self, issued, in_use, in_use_info):
+        self.issued = issued
+        self.in_use = in_use
+        self.in_use_info = in_use_info
+
+    def get_legacy_value(self, key):
+        if key == 'issued':
+            return 'Uncounted' if self.issued is None else str(self.issued)
+        elif key == 'in_use':
+            return str(self.in_use)
+        elif key == 'in_use_info_string':
+            return [usage_record.line for usage_record in self.in_use_info if usage_record.line is not None]
+
+        return getattr(self, key)
+
+
+class VendorDaemonRecord(LicenseRecord):
+    """
+    One vendor daemon, feature is {feature: FeatureRecord}, expires is the same as license_dic.
+    """
+    __slots__ = ('vendor_daemon_status', 'vendor_daemon_version', 'feature', 'expires')
+    legacy_key_list = ('vendor_daemon_status', 'vendor_daemon_version', 'feature', 'expires')
+
+    def __init__(self, vendor_daemon_status, vendor_daemon_version, feature, expires):
+        self.vendor_daemon_status = vendor_daemon_status
+        self.vendor_daemon_version = vendor_daemon_version
+        self.feature = feature
+        self.expires = expires
+
+
+class LicenseServerRecord(LicenseRecord):
+    """
+    One license server, vendor_daemon is {vendor_daemon: VendorDaemonRecord}.
+    stale/stale_second are only shown as keys if the license info is stale (see common_license.GetLicenseInfo.get_license_info).
+    """
+    __slots__ = ('license_files', 'license_server_status', 'license_server_version', 'vendor_daemon', 'stale', 'stale_second')
+    legacy_key_list = ('license_files', 'license_server_status', 'license_server_version', 'vendor_daemon')
+
+    def __init__(self, license_files, license_server_status, license_server_version, vendor_daemon, stale=False, stale_second=0):
+        self.license_files = license_files
+        self.license_server_status = license_server_status
+        self.license_server_version = license_server_version
+        self.vendor_daemon = vendor_daemon
+        self.stale = stale
+        self.stale_second = stale_second
+
+    def get_legacy_key_list(self):
+        if self.stale:
+            return self.legacy_key_list + ('stale', 'stale_second')
+
+        return self.legacy_key_list
+
+
+def get_license_record_dic(license_dic, keep_line=False):
+    """
+    Switch license_dic (got with common_license.GetLicenseInfo) into license_record_dic = {license_server: LicenseServerRecord}.
+    Repeated strings (user/host/version ...) are interned, start_time is switched into start_second once for every different start_time.
+    The original lmstat lines (in_use_info_string) are only kept with keep_line=True.
+    """
+    license_record_dic = {}
+    start_second_dic = {}
+    intern = sys.intern
+
+    for (license_server, server_dic) in license_dic.items():
+        vendor_daemon_record_dic = {}
+
+        for (vendor_daemon, vendor_daemon_dic) in server_dic['vendor_daemon'].items():
+            feature_record_dic = {}
+
+            for (feature, feature_dic) in vendor_daemon_dic['feature'].items():
+                usage_record_list = []
+                in_use_info_string_list = feature_dic.get('in_use_info_string', [])
+
+                for (i, usage_dic) in enumerate(feature_dic['in_use_info']):
+                    start_time = usage_dic['start_time']
+
+                    if start_time not in start_second_dic:
+                        try:
+                            start_second_dic[start_time] = common_license.switch_start_time_to_seconds(start_time)
+                        except Exception:
+                            start_second_dic[start_time] = 0
+
+                    if keep_line and (i < len(in_use_info_string_list)):
+                        line = in_use_info_string_list[i]
+                    else:
+                        line = None
+
+                    usage_record_list.append(UsageRecord(user=intern(usage_dic['user']),
+                                                         execute_host=intern(usage_dic['execute_host']),
+                                                         submit_host=intern(usage_dic['submit_host']),
+                                                         version=intern(usage_dic['version']),
+                                                         license_server=intern(usage_dic['license_server']),
+                                                         start_time=intern(start_time),
+                                                         start_second=start_second_dic[start_time],
+                                                         license_num=int(usage_dic['license_num']),
+                                                         line=line))
+
+                issued = None if feature_dic['issued'] == 'Uncounted' else int(feature_dic['issued'])
+                feature_record_dic[intern(feature)] = FeatureRecord(issued=issued, in_use=int(feature_dic['in_use']), in_use_info=usage_record_list)
+
+            vendor_daemon_record_dic[vendor_daemon] = VendorDaemonRecord(vendor_daemon_status=vendor_daemon_dic['vendor_daemon_status'],
+                                                                         vendor_daemon_version=vendor_daemon_dic['vendor_daemon_version'],
+                                                                         feature=feature_record_dic,
+                                                                         expires=vendor_daemon_dic['expires'])
+
+        license_record_dic[license_server] = LicenseServerRecord(license_files=server_dic['license_files'],
+                                                                 license_server_status=server_dic['license_server_status'],
+                                                                 license_server_version=server_dic['license_server_version'],
+                                                                 vendor_daemon=vendor_daemon_record_dic,
+                                                                 stale=server_dic.get('stale', False),
+                                                                 stale_second=server_dic.get('stale_second', 0))
+
+    return license_record_dic
+
+
+def get_license_dic(license_record_dic):
+    """
+    Switch license_record_dic back into license_dic format (plain dicts and strings), for the callers which need to save or modify it.
+    """
+    license_dic = {}
+
+    for (license_server, server_record) in license_record_dic.items():
+        license_dic[license_server] = {'license_files': server_record.license_files,
+                                       'license_server_status': server_record.license_server_status,
+                                       'license_server_version': server_record.license_server_version,
+                                       'vendor_daemon': {}}
+
+        if server_record.stale:
+            license_dic[license_server]['stale'] = True
+            license_dic[license_server]['stale_second'] = server_record.stale_second
+
+        for (vendor_daemon, vendor_daemon_record) in server_record.vendor_daemon.items():
+            license_dic[license_server]['vendor_daemon'][vendor_daemon] = {'vendor_daemon_status': vendor_daemon_record.vendor_daemon_status,
+                                                                           'vendor_daemon_version': vendor_daemon_record.vendor_daemon_version,
+                                                                           'feature': {},
+                                                                           'expires': vendor_daemon_record.expires}
+
+            for (feature, feature_record) in vendor_daemon_record.feature.items():
+                license_dic[license_server]['vendor_daemon'][vendor_daemon]['feature'][feature] = {'issued': feature_record['issued'],
+                                                                                                   'in_use': feature_record['in_use'],
+                                                                                                   'in_use_info_string': feature_record['in_use_info_string'],
+                                                                                                   'in_use_info': [dict(usage_record.items()) for usage_record in feature_record.in_use_info]}
+
+    return license_dic
+
+
+class FilterLicenseRecordDic():
+    """
+    Filter license_record_dic with server/vendor/feature/submit_host/execute_host/user/show_mode specification, same as common_license.FilterLicenseDic.
+    The records are shared with the original license_record_dic, only the filtered containers are new.
+    """
+    def __init__(self, fuzzy_mode=True):
+        self.fuzzy_mode = fuzzy_mode
+
+    def get_filtered_value_set(self, value_set, specified_value_list):
+        """
+        Get exact matched values (or fuzzy matched values if no exact one) on value_set, every different value is only checked once.
+        """
+        if 'ALL' in specified_value_list:
+            return set(value_set)
+
+        exact_value_set = value_set & set(specified_value_list)
+
+        if exact_value_set or (not self.fuzzy_mode):
+            return exact_value_set
+
+        lower_specified_value_list = [specified_value.lower() for specified_value in specified_value_list]
+
+        return set(value for value in value_set if any((specified_value in value.lower()) for specified_value in lower_specified_value_list))
+
+    def copy_server_record(self, server_record, vendor_daemon_record_dic):
+        return LicenseServerRecord(license_files=server_record.license_files,
+                                   license_server_status=server_record.license_server_status,
+                                   license_server_version=server_record.license_server_version,
+                                   vendor_daemon=vendor_daemon_record_dic)
+
+    def filter_by_server(self, license_record_dic, server_list):
+        """
+        Filter license_record_dic with specified license_server(s).
+        """
+        return {license_server: server_record for (license_server, server_record) in license_record_dic.items() if (license_server in server_list) or ('ALL' in server_list)}
+
+    def filter_by_vendor(self, license_record_dic, vendor_list):
+        """
+        Filter license_record_dic with specified vendor_daemon(s).
+        """
+        new_license_record_dic = {}
+
+        for (license_server, server_record) in license_record_dic.items():
+            vendor_daemon_record_dic = {vendor_daemon: vendor_daemon_record for (vendor_daemon, vendor_daemon_record) in server_record.vendor_daemon.items() if (vendor_daemon in vendor_list) or ('ALL' in vendor_list)}
+
+            if vendor_daemon_record_dic:
+                new_license_record_dic[license_server] = self.copy_server_record(server_record, vendor_daemon_record_dic)
+
+        return new_license_record_dic
+
+    def filter_by_feature(self, license_record_dic, feature_list):
+        """
+        Filter license_record_dic with specified feature(s).
+        """
+        feature_set = set()
+
+        for server_record in license_record_dic.values():
+            for vendor_daemon_record in server_record.vendor_daemon.values():
+                feature_set.update(vendor_daemon_record.feature.keys())
+
+        filtered_feature_set = self.get_filtered_value_set(feature_set, feature_list)
+        new_license_record_dic = {}
+
+        if filtered_feature_set:
+            for (license_server, server_record) in license_record_dic.items():
+                vendor_daemon_record_dic = {}
+
+                for (vendor_daemon, vendor_daemon_record) in server_record.vendor_daemon.items():
+                    feature_record_dic = {feature: feature_record for (feature, feature_record) in vendor_daemon_record.feature.items() if feature in filtered_feature_set}
+
+                    if feature_record_dic:
+                        expires_dic = {feature: vendor_daemon_record.expires[feature] for feature in feature_record_dic if feature in vendor_daemon_record.expires}
+                        vendor_daemon_record_dic[vendor_daemon] = VendorDaemonRecord(vendor_daemon_record.vendor_daemon_status, vendor_daemon_record.vendor_daemon_version, feature_record_dic, expires_dic)
+
+                if vendor_daemon_record_dic:
+                    new_license_record_dic[license_server] = self.copy_server_record(server_record, vendor_daemon_record_dic)
+
+        return new_license_record_dic
+
+    def filter_by_feature_usage_attribute(self, license_record_dic, feature_usage_attribute, feature_usage_attribute_value_list):
+        """
+        Filter license_record_dic with specified feature_usage_attribute (user/execute_host/submit_host/version/license_server/start_time).
+        """
+        value_set = set()
+
+        for server_record in license_record_dic.values():
+            for vendor_daemon_record in server_record.vendor_daemon.values():
+                for feature_record in vendor_daemon_record.feature.values():
+                    value_set.update(getattr(usage_record, feature_usage_attribute) for usage_record in feature_record.in_use_info)
+
+        filtered_value_set = self.get_filtered_value_set(value_set, feature_usage_attribute_value_list)
+        new_license_record_dic = {}
+
+        if filtered_value_set:
+            for (license_server, server_record) in license_record_dic.items():
+                vendor_daemon_record_dic = {}
+
+                for (vendor_daemon, vendor_daemon_record) in server_record.vendor_daemon.items():
+                    feature_record_dic = {}
+
+                    for (feature, feature_record) in vendor_daemon_record.feature.items():
+                        usage_record_list = [usage_record for usage_record in feature_record.in_use_info if getattr(usage_record, feature_usage_attribute) in filtered_value_set]
+
+                        if usage_record_list:
+                            feature_record_dic[feature] = FeatureRecord(feature_record.issued, feature_record.in_use, usage_record_list)
+
+                    if feature_record_dic:
+                        vendor_daemon_record_dic[vendor_daemon] = VendorDaemonRecord(vendor_daemon_record.vendor_daemon_status, vendor_daemon_record.vendor_daemon_version, feature_record_dic, vendor_daemon_record.expires)
+
+                if vendor_daemon_record_dic:
+                    new_license_record_dic[license_server] = self.copy_server_record(server_record, vendor_daemon_record_dic)
+
+        return new_license_record_dic
+
+    def filter_show_mode_feature(self, license_record_dic, show_mode):
+        """
+        Filter license_record_dic with show_mode.
+        show_mode could be "IN_USE/NOT_USED" or "Expired/Nearly_Expired/Unexpired".
+        """
+        new_license_record_dic = {}
+        expire_mark_dic = {}
+
+        for (license_server, server_record) in license_record_dic.items():
+            vendor_daemon_record_dic = {}
+
+            for (vendor_daemon, vendor_daemon_record) in server_record.vendor_daemon.items():
+                feature_record_dic = {}
+                expires_dic = {}
+
+                for (feature, feature_record) in vendor_daemon_record.feature.items():
+                    expire_dic_list = []
+
+                    if show_mode in ['IN_USE', 'NOT_USED']:
+                        if (show_mode == 'IN_USE') and (feature_record.in_use == 0):
+                            continue
+                        elif (show_mode == 'NOT_USED') and (feature_record.in_use != 0):
+                            continue
+
+                        expire_dic_list = list(vendor_daemon_record.expires.get(feature, []))
+                    elif show_mode in ['Expired', 'Nearly_Expired', 'Unexpired']:
+                        for expire_dic in vendor_daemon_record.expires.get(feature, []):
+                            if expire_dic['expires'] not in expire_mark_dic:
+                                expire_mark_dic[expire_dic['expires']] = common_license.check_expire_date(expire_dic['expires'])
+
+                            expire_mark = expire_mark_dic[expire_dic['expires']]
+
+                            if (show_mode == 'Expired') and (expire_mark == -1):
+                                expire_dic_list.append(expire_dic)
+                            elif (show_mode == 'Nearly_Expired') and ((expire_mark != -1) and (expire_mark != 0)):
+                                expire_dic_list.append(expire_dic)
+                            elif (show_mode == 'Unexpired') and (expire_mark == 0):
+                                expire_dic_list.append(expire_dic)
+
+                        if not expire_dic_list:
+                            continue
+
+                    feature_record_dic[feature] = feature_record
+                    expires_dic[feature] = expire_dic_list
+
+                if feature_record_dic:
+                    vendor_daemon_record_dic[vendor_daemon] = VendorDaemonRecord(vendor_daemon_record.vendor_daemon_status, vendor_daemon_record.vendor_daemon_version, feature_record_dic, expires_dic)
+
+            if vendor_daemon_record_dic:
+                new_license_record_dic[license_server] = self.copy_server_record(server_record, vendor_daemon_record_dic)
+
+        return new_license_record_dic
+
+    def run(self, license_record_dic, server_list=[], vendor_list=[], feature_list=[], submit_host_list=[], execute_host_list=[], user_list=[], show_mode='ALL'):
+        """
+        Main function for class FilterLicenseRecordDic.
+        """
+        filtered_license_record_dic = license_record_dic
+
+        if server_list:
+            filtered_license_record_dic = self.filter_by_server(filtered_license_record_dic, server_list)
+
+        if vendor_list:
+            filtered_license_record_dic = self.filter_by_vendor(filtered_license_record_dic, vendor_list)
+
+        if feature_list:
+            filtered_license_record_dic = self.filter_by_feature(filtered_license_record_dic, feature_list)
+
+        if submit_host_list:
+            filtered_license_record_dic = self.filter_by_feature_usage_attribute(filtered_license_record_dic, 'submit_host', submit_host_list)
+
+        if execute_host_list:
+            filtered_license_record_dic = self.filter_by_feature_usage_attribute(filtered_license_record_dic, 'execute_host', execute_host_list)
+
+        if user_list:
+            filtered_license_record_dic = self.filter_by_feature_usage_attribute(filtered_license_record_dic, 'user', user_list)
+
+        if show_mode != 'ALL':
+            filtered_license_record_dic = self.filter_show_mode_feature(filtered_license_record_dic, show_mode)
+
+        return filtered_license_record_dic
+
+
+class LicenseRecordIndex():
+    """
+    Inverted indexes over license_record_dic, it is built once for every license snapshot.
+    Features and usages get ids on license_record_dic order, server/vendor/feature are mapped to feature ids, and user/execute_host/submit_host are mapped to usage ids.
+    run() has the same result as FilterLicenseRecordDic.run(), the filters are done with id set intersections on one pass.
+    """
+    def __init__(self, license_record_dic, fuzzy_mode=True):
+        self.license_record_dic = license_record_dic
+        self.my_filter_license_record_dic = FilterLicenseRecordDic(fuzzy_mode=fuzzy_mode)
+
+        # feature_list[feature_id] = (license_server, vendor_daemon, feature, feature_record)
+        self.feature_list = []
+        self.feature_usage_id_list = []
+
+        # usage_list[usage_id] = usage_record, usage_feature_id_list[usage_id] = feature_id
+        self.usage_list = []
+        self.usage_feature_id_list = []
+
+        self.index_dic = {'server': {}, 'vendor': {}, 'feature': {}, 'user': {}, 'execute_host': {}, 'submit_host': {}}
+        self.trigram_index_dic = {}
+
+        for (license_server, server_record) in license_record_dic.items():
+            for (vendor_daemon, vendor_daemon_record) in server_record.vendor_daemon.items():
+                for (feature, feature_record) in vendor_daemon_record.feature.items():
+                    feature_id = len(self.feature_list)
+                    self.feature_list.append((license_server, vendor_daemon, feature, feature_record))
+                    self.index_dic['server'].setdefault(license_server, set()).add(feature_id)
+                    self.index_dic['vendor'].setdefault(vendor_daemon, set()).add(feature_id)
+                    self.index_dic['feature'].setdefault(feature, set()).add(feature_id)
+                    usage_id_list = []
+
+                    for usage_record in feature_record.in_use_info:
+                        usage_id = len(self.usage_list)
+                        usage_id_list.append(usage_id)
+                        self.usage_list.append(usage_record)
+                        self.usage_feature_id_list.append(feature_id)
+                        self.index_dic['user'].setdefault(usage_record.user, set()).add(usage_id)
+                        self.index_dic['execute_host'].setdefault(usage_record.execute_host, set()).add(usage_id)
+                        self.index_dic['submit_host'].setdefault(usage_record.submit_host, set()).add(usage_id)
+
+                    self.feature_usage_id_list.append(usage_id_list)
+
+    def get_id_set(self, index_name, value_list, candidate_id_set=None, exact_only=False):
+        """
+        Get the ids (on candidate_id_set) of exact matched values, or fuzzy matched values if no exact one, same as FilterLicenseDic.
+        Only the values which exist on candidate_id_set are taken into account, candidate_id_set None means all ids, and None is returned for "ALL".
+        With exact_only (for server/vendor, FilterLicenseDic.filter_by_server/filter_by_vendor only match exactly), there is no fuzzy match.
+        """
+        index = self.index_dic[index_name]
+
+        if 'ALL' in value_list:
+            return candidate_id_set
+
+        id_set = set()
+
+        for value in value_list:
+            if value in index:
+                id_set |= (index[value] if candidate_id_set is None else (index[value] & candidate_id_set))
+
+        if id_set or exact_only or (not self.my_filter_license_record_dic.fuzzy_mode):
+            return id_set
+
+        # Fuzzy match with trigram index, the index may be shared and contain the values which are not on this snapshot.
+        trigram_index = self.get_trigram_index(index_name)
+
+        for value in value_list:
+            for matched_value in trigram_index.search(value):
+                if matched_value in index:
+                    id_set |= (index[matched_value] if candidate_id_set is None else (index[matched_value] & candidate_id_set))
+
+        return id_set
+
+    def get_trigram_index(self, index_name):
+        """
+        Get trigram index (common.TrigramIndex) of the values on specified index, it is built on the first use.
+        """
+        if index_name not in self.trigram_index_dic:
+            self.trigram_index_dic[index_name] = common.TrigramIndex(self.index_dic[index_name].keys())
+
+        return self.trigram_index_dic[index_name]
+
+    def run(self, server_list=[], vendor_list=[], feature_list=[], submit_host_list=[], execute_host_list=[], user_list=[], show_mode='ALL'):
+        """
+        Filter self.license_record_dic, it has the same arguments as FilterLicenseDic.run (without license_dic).
+        """
+        usage_filter_list = [(index_name, value_list) for (index_name, value_list) in [('submit_host', submit_host_list), ('execute_host', execute_host_list), ('user', user_list)] if value_list]
+
+        # Server/vendor filters only select dict items, they are not indexed.
+        if (not feature_list) and (not usage_filter_list):
+            return self.my_filter_license_record_dic.run(self.license_record_dic, server_list=server_list, vendor_list=vendor_list, show_mode=show_mode)
+
+        # feature_id_set None means all features.
+        feature_id_set = None
+
+        if server_list:
+            feature_id_set = self.get_id_set('server', server_list, feature_id_set, exact_only=True)
+
+        if vendor_list:
+            feature_id_set = self.get_id_set('vendor', vendor_list, feature_id_set, exact_only=True)
+
+        if feature_list:
+            feature_id_set = self.get_id_set('feature', feature_list, feature_id_set)
+
+        if feature_id_set is None:
+            feature_id_set = range(len(self.feature_list))
+
+        # vendor_daemon_expires_dic = {(license_server, vendor_daemon): expires}, expires of the features got with feature filter (before usage filters).
+        vendor_daemon_expires_dic = {}
+
+        if feature_list:
+            for feature_id in sorted(feature_id_set):
+                (license_server, vendor_daemon, feature, feature_record) = self.feature_list[feature_id]
+                expires_dic = vendor_daemon_expires_dic.setdefault((license_server, vendor_daemon), {})
+                vendor_daemon_expires = self.license_record_dic[license_server].vendor_daemon[vendor_daemon].expires
+
+                if feature in vendor_daemon_expires:
+                    expires_dic[feature] = vendor_daemon_expires[feature]
+
+        # feature_usage_dic = {feature_id: [usage_record, ...]}, it is only for usage filters.
+        feature_usage_dic = None
+
+        if usage_filter_list:
+            # usage_id_set None means all usages of feature_id_set.
+            if len(feature_id_set) == len(self.feature_list):
+                usage_id_set = None
+            else:
+                usage_id_set = set()
+
+                for feature_id in feature_id_set:
+                    usage_id_set.update(self.feature_usage_id_list[feature_id])
+
+            for (index_name, value_list) in usage_filter_list:
+                usage_id_set = self.get_id_set(index_name, value_list, usage_id_set)
+
+            feature_usage_dic = {}
+
+            if usage_id_set is None:
+                for feature_id in feature_id_set:
+                    if self.feature_list[feature_id][3].in_use_info:
+                        feature_usage_dic[feature_id] = list(self.feature_list[feature_id][3].in_use_info)
+            else:
+                for usage_id in sorted(usage_id_set):
+                    feature_usage_dic.setdefault(self.usage_feature_id_list[usage_id], []).append(self.usage_list[usage_id])
+
+            feature_id_set = feature_usage_dic.keys()
+
+        # Generate filtered license_record_dic.
+        filtered_license_record_dic = {}
+
+        for feature_id in sorted(feature_id_set):
+            (license_server, vendor_daemon, feature, feature_record) = self.feature_list[feature_id]
+            server_record = self.license_record_dic[license_server]
+            vendor_daemon_record = server_record.vendor_daemon[vendor_daemon]
+
+            if license_server not in filtered_license_record_dic:
+                filtered_license_record_dic[license_server] = self.my_filter_license_record_dic.copy_server_record(server_record, {})
+
+            filtered_vendor_daemon_record_dic = filtered_license_record_dic[license_server].vendor_daemon
+
+            if vendor_daemon not in filtered_vendor_daemon_record_dic:
+                if feature_list:
+                    expires_dic = vendor_daemon_expires_dic[(license_server, vendor_daemon)]
+                else:
+                    expires_dic = vendor_daemon_record.expires
+
+                filtered_vendor_daemon_record_dic[vendor_daemon] = VendorDaemonRecord(vendor_daemon_record.vendor_daemon_status, vendor_daemon_record.vendor_daemon_version, {}, expires_dic)
+
+            if feature_usage_dic is None:
+                filtered_vendor_daemon_record_dic[vendor_daemon].feature[feature] = feature_record
+            else:
+                filtered_vendor_daemon_record_dic[vendor_daemon].feature[feature] = FeatureRecord(feature_record.issued, feature_record.in_use, feature_usage_dic[feature_id])
+
+        if show_mode != 'ALL':
+            filtered_license_record_dic = self.my_filter_license_record_dic.filter_show_mode_feature(filtered_license_record_dic, show_mode)
+
+        return filtered_license_record_dic
@@ -0,0 +1,223 @@
+import re
+import datetime
+import numpy
+
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5 import NavigationToolbar2QT
+from matplotlib.dates import num2date, date2num
+
+
+class FigureCanvasQTAgg(FigureCanvasQTAgg):
+    """
+    Generate a new figure canvas.
+    """
+    def __init__(self):
+        self.figure = Figure()
+        self.axes = None
+        super().__init__(self.figure)
+
+
+def get_lttb_index_array(x_array, y_array, threshold):
+    """
+    Downsample points with Largest-Triangle-Three-Buckets, return the indexes of the kept points.
+    The first and last points are always kept, and one point is kept for every bucket which makes the largest triangle with the points kept on the neighbor buckets.
+    """
+    point_num = len(x_array)
+
+    if (threshold >= point_num) or (threshold < 3):
+        return numpy.arange(point_num)
+
+    index_array = numpy.zeros(threshold, dtype=int)
+    index_array[-1] = point_num - 1
+    bucket_edge_array = numpy.linspace(1, point_num - 1, threshold - 1).astype(int)
+    last_index = 0
+
+    for i in range(threshold - 2):
+        (start, end) = (bucket_edge_array[i], bucket_edge_array[i + 1])
+
+        # The next point is the average of next bucket (or the last point).
+        if i < threshold - 3:
+            (next_x, next_y) = (x_array[end:bucket_edge_array[i + 2]].mean(), y_array[end:bucket_edge_array[i + 2]].mean())
+        else:
+            (next_x, next_y) = (x_array[-1], y_array[-1])
+
+        area_array = numpy.abs((x_array[last_index] - next_x) * (y_array[start:end] - y_array[last_index]) - (x_array[last_index] - x_array[start:end]) * (next_y - y_array[last_index]))
+        last_index = start + int(area_array.argmax())
+        index_array[i + 1] = last_index
+
+    return index_array
+
+
+class DownsampleCurve():
+    """
+    Draw curves (lines/filled areas with the same x data) on axes with about one point per pixel, the points are downsampled with LTTB.
+    Full data are kept, and the curves are downsampled again on the shown x range if it is changed (zoom/pan with NavigationToolbar2QT), so finer detail is shown on zooming in.
+    The object must be kept (like on a class variable) while the curves are shown, axes callbacks only keep weak references to it.
+    """
+    def __init__(self, axes, x_list):
+        self.axes = axes
+        self.x_list = list(x_list)
+        self.x_array = numpy.asarray(date2num(self.x_list) if (self.x_list and isinstance(self.x_list[0], datetime.datetime)) else self.x_list, dtype=float)
+        self.line_list = []
+        self.fill_list = []
+        self.range_index = None
+
+        self.axes.callbacks.connect('xlim_changed', self.update)
+
+    def get_range_index(self, full_range=False):
+        """
+        Get (start, end, threshold) for the shown x range, threshold is the axes width (pixel).
+        """
+        if full_range:
+            (start, end) = (0, len(self.x_array))
+        else:
+            (xmin, xmax) = self.axes.get_xlim()
+            start = max(int(numpy.searchsorted(self.x_array, xmin)) - 1, 0)
+            end = min(int(numpy.searchsorted(self.x_array, xmax, side='right')) + 1, len(self.x_array))
+
+        threshold = max(int(self.axes.get_window_extent().width), 100)
+
+        return start, end, threshold
+
+    def downsample(self, range_index):
+        """
+        Set the downsampled points of range_index into the lines and filled areas, the points kept for any curve are kept for all curves.
+        """
+        (start, end, threshold) = range_index
+        index_set = set()
+
+        for (line, y_array) in self.line_list:
+            index_set.update((start + get_lttb_index_array(self.x_array[start:end], y_array[start:end], threshold)).tolist())
+
+        for (fill, y_array, fill_kwargs) in self.fill_list:
+            index_set.update((start + get_lttb_index_array(self.x_array[start:end], y_array[start:end], threshold)).tolist())
+
+        index_array = numpy.array(sorted(index_set), dtype=int)
+        x_list = [self.x_list[i] for i in index_array]
+
+        for (line, y_array) in self.line_list:
+            line.set_data(x_list, y_array[index_array])
+
+        for (i, (fill, y_array, fill_kwargs)) in enumerate(self.fill_list):
+            if fill is not None:
+                fill.remove()
+
+            self.fill_list[i] = (self.axes.fill_between(x_list, 0, y_array[index_array], **fill_kwargs), y_array, fill_kwargs)
+
+        self.range_index = range_index
+
+    def plot(self, y_list, *args, **kwargs):
+        """
+        Same as axes.plot(x_list, y_list, *args, **kwargs), but with downsampled points.
+        """
+        (line, ) = self.axes.plot([], [], *args, **kwargs)
+        self.line_list.append((line, numpy.asarray(y_list)))
+        self.downsample(self.get_range_index(full_range=True))
+        self.axes.relim()
+        self.axes.autoscale_view()
+
+        return line
+
+    def fill_between(self, y_list, **kwargs):
+        """
+        Same as axes.fill_between(x_list, 0, y_list, **kwargs), but with downsampled points.
+        """
+        self.fill_list.append((None, numpy.asarray(y_list), kwargs))
+        self.downsample(self.get_range_index(full_range=True))
+
+    def update(self, axes):
+        """
+        Downsample curves again if the shown x range is changed.
+        """
+        range_index = self.get_range_index()
+
+        if range_index != self.range_index:
+            self.downsample(range_index)
+            self.axes.figure.canvas.draw_idle()
+
+
+class NavigationToolbar2QT(NavigationToolbar2QT):
+    """
+    Enhancement for NavigationToolbar2QT, can get and show label value.
+    """
+    def __init__(self, canvas, parent, coordinates=True, x_is_date=True):
+        super().__init__(canvas, parent, coordinates)
+        self.x_is_date = x_is_date
+
+    @staticmethod
+    def bisection(event_xdata, xdata_list):
+        xdata = None
+        index = None
+        lower = 0
+        upper = len(xdata_list) - 1
+        bisection_index = (upper - lower) // 2
+
+        if xdata_list:
+            if event_xdata > xdata_list[upper]:
+                xdata = xdata_list[upper]
+                index = upper
+            elif (event_xdata < xdata_list[lower]) or (len(xdata_list) <= 2):
+                xdata = xdata_list[lower]
+                index = lower
+            elif event_xdata in xdata_list:
+                xdata = event_xdata
+                index = xdata_list.index(event_xdata)
+
+            while xdata is None:
+                if upper - lower == 1:
+                    if event_xdata - xdata_list[lower] <= xdata_list[upper] - event_xdata:
+                        xdata = xdata_list[lower]
+                        index = lower
+                    else:
+                        xdata = xdata_list[upper]
+                        index = upper
+
+                    break
+
+                if event_xdata > xdata_list[bisection_index]:
+                    lower = bisection_index
+                elif event_xdata < xdata_list[bisection_index]:
+                    upper = bisection_index
+
+                bisection_index = (upper - lower) // 2 + lower
+
+        return xdata, index
+
+    def _mouse_event_to_message(self, event):
+        if event.inaxes and event.inaxes.get_navigate():
+            try:
+                if self.x_is_date:
+                    event_xdata = num2date(event.xdata).strftime('%Y,%m,%d,%H,%M,%S')
+                else:
+                    event_xdata = event.xdata
+            except (ValueError, OverflowError):
+                pass
+            else:
+                if self.x_is_date and (len(event_xdata.split(',')) == 6):
+                    (year, month, day, hour, minute, second) = event_xdata.split(',')
+                    event_xdata = datetime.datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
+
+                xdata_list = list(self.canvas.figure.gca().get_lines()[0].get_xdata())
+                (xdata, index) = self.bisection(event_xdata, sorted(xdata_list))
+
+                if xdata is not None:
+                    info_list = []
+
+                    for line in self.canvas.figure.gca().get_lines():
+                        label = line.get_label()
+                        ydata_string = line.get_ydata()
+                        ydata_list = list(ydata_string)
+                        ydata = ydata_list[index]
+
+                        info_list.append('%s=%s' % (label, ydata))
+
+                    info_string = '  '.join(info_list)
+
+                    if self.x_is_date:
+                        xdata_string = xdata.strftime('%Y-%m-%d %H:%M:%S')
+                        xdata_string = re.sub(r' 00:00:00', '', xdata_string)
+                        info_string = '[%s]\n%s' % (xdata_string, info_string)
+
+                    return info_string
+        return ''
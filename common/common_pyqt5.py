@@ -1,16 +1,26 @@
-import re
 import math
-import datetime
+import operator
 import screeninfo
 
 from PyQt5.QtWidgets import QDesktopWidget, QComboBox, QLineEdit, QListWidget, QCheckBox, QListWidgetItem, QCompleter
 from PyQt5.QtGui import QTextCursor, QFont
 from PyQt5.Qt import QFontMetrics
-from PyQt5.QtCore import Qt, QEvent, QObject
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_qt5 import NavigationToolbar2QT
-from matplotlib.dates import num2date
+from PyQt5.QtCore import Qt, QEvent, QObject, QStringListModel, QAbstractTableModel, QModelIndex
+
+# Figure classes are on common_matplotlib, it is only imported on first use since matplotlib is slow to import.
+FIGURE_ATTRIBUTE_LIST = ['FigureCanvasQTAgg', 'NavigationToolbar2QT', 'DownsampleCurve', 'get_lttb_index_array']
+
+
+def __getattr__(name):
+    """
+    Get figure classes from common_matplotlib on first use, so common_pyqt5.FigureCanvasQTAgg (and so on) still work.
+    """
+    if name in FIGURE_ATTRIBUTE_LIST:
+        from common import common_matplotlib
+
+        return getattr(common_matplotlib, name)
+
+    raise AttributeError("module '" + str(__name__) + "' has no attribute '" + str(name) + "'")
 
 
 def center_window(window):
@@ -65,11 +75,15 @@ def text_edit_visible_position(text_edit_item, position='End'):
     text_edit_item.ensureCursorVisible()
 
 
-def get_completer(item_list):
+def get_completer(item_list, trigram_index=None):
     """
     Instantiate and config QCompleter.
+    If trigram_index (common.TrigramIndex) is specified, the candidates are got from trigram_index instead of scanning all items.
     """
-    completer_ins = QCompleter(item_list)
+    if trigram_index is None:
+        completer_ins = QCompleter(item_list)
+    else:
+        completer_ins = TrigramCompleter(item_list, trigram_index)
 
     # Enable Qt.MatchContains mode (just like re.search()), not Qt.MatchStartsWith or Qt.MatchEndsWith.
     completer_ins.setFilterMode(Qt.MatchContains)
@@ -86,6 +100,195 @@ def get_completer(item_list):
     return completer_ins
 
 
+class TrigramCompleter(QCompleter):
+    """
+    QCompleter which only keeps the items matched by trigram index on its model, so the popup does not scan all items on every key stroke.
+    """
+    def __init__(self, item_list, trigram_index):
+        self.item_list = list(item_list)
+        self.item_order_dic = {item: i for (i, item) in enumerate(self.item_list)}
+        self.trigram_index = trigram_index
+        self.trigram_index.add_item_list(self.item_list)
+        self.string_list_model = QStringListModel(self.item_list)
+
+        super().__init__(self.string_list_model, None)
+
+    def splitPath(self, path):
+        """
+        Reset the model with the matched items (keep the original order), QCompleter still filters them with Qt.MatchContains.
+        """
+        # trigram_index may be shared with other completers, so only the items of this completer are kept.
+        matched_item_list = sorted((item for item in self.trigram_index.search(path) if item in self.item_order_dic), key=self.item_order_dic.get)
+
+        if matched_item_list != self.string_list_model.stringList():
+            self.string_list_model.setStringList(matched_item_list)
+
+        return [path]
+
+
+class TableModel(QAbstractTableModel):
+    """
+    Read-only table model on row list, for QTableView with big data (no QTableWidgetItem for every cell).
+    Cells are rendered on demand:
+    display_function_dic : {column: function(value)}, get display text of the cell value, default is str(value).
+    foreground_function_dic : {column: function(row_value_list)}, get foreground color (or None) of the cell.
+    font_function_dic : {column: function(row_value_list)}, get font (or None) of the cell.
+    Numbers (int/float) are sorted as numbers, other cells are sorted with display text, just like QTableWidget.
+    """
+    def __init__(self, title_list, row_list=[], display_function_dic={}, foreground_function_dic={}, font_function_dic={}):
+        super().__init__()
+        self.title_list = title_list
+        self.row_list = list(row_list)
+        self.display_function_dic = display_function_dic
+        self.foreground_function_dic = foreground_function_dic
+        self.font_function_dic = font_function_dic
+
+    def set_row_list(self, row_list):
+        """
+        Replace all rows.
+        """
+        self.beginResetModel()
+        self.row_list = list(row_list)
+        self.endResetModel()
+
+    def update_row_list(self, row_list, key_column_list=[]):
+        """
+        Update rows with keyed diff, only removed/changed/inserted rows are applied, so scroll position and selection are kept.
+        Rows are matched with the values on key_column_list (all columns by default), repeated keys are matched in order.
+        Return (inserted_num, removed_num, changed_num).
+        """
+        if not self.row_list:
+            self.set_row_list(row_list)
+            return len(self.row_list), 0, 0
+
+        get_key = operator.itemgetter(*(key_column_list or range(len(self.title_list))))
+
+        def get_key_list(row_list):
+            key_list = []
+            key_count_dic = {}
+
+            for row_value_list in row_list:
+                key = get_key(row_value_list)
+                key_count_dic[key] = key_count_dic.get(key, 0) + 1
+                key_list.append((key, key_count_dic[key]))
+
+            return key_list
+
+        new_row_dic = dict(zip(get_key_list(row_list), row_list))
+        old_key_list = get_key_list(self.row_list)
+
+        # Remove rows (block by block from the end, so the row numbers before them are not changed).
+        removed_row_list = [row for (row, key) in enumerate(old_key_list) if key not in new_row_dic]
+        removed_num = len(removed_row_list)
+
+        while removed_row_list:
+            last_row = removed_row_list.pop()
+            first_row = last_row
+
+            while removed_row_list and (removed_row_list[-1] == first_row - 1):
+                first_row = removed_row_list.pop()
+
+            self.beginRemoveRows(QModelIndex(), first_row, last_row)
+            del self.row_list[first_row:last_row + 1]
+            del old_key_list[first_row:last_row + 1]
+            self.endRemoveRows()
+
+        # Update changed rows.
+        changed_num = 0
+
+        for (row, key) in enumerate(old_key_list):
+            new_row_value_list = new_row_dic.pop(key)
+
+            if tuple(new_row_value_list) != tuple(self.row_list[row]):
+                self.row_list[row] = new_row_value_list
+                self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.title_list) - 1))
+                changed_num += 1
+
+        # Append inserted rows.
+        inserted_num = len(new_row_dic)
+
+        if inserted_num:
+            self.beginInsertRows(QModelIndex(), len(self.row_list), len(self.row_list) + inserted_num - 1)
+            self.row_list.extend(new_row_dic.values())
+            self.endInsertRows()
+
+        return inserted_num, removed_num, changed_num
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+
+        return len(self.row_list)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+
+        return len(self.title_list)
+
+    def get_text(self, row, column):
+        """
+        Get display text of specified cell.
+        """
+        value = self.row_list[row][column]
+
+        if column in self.display_function_dic:
+            return self.display_function_dic[column](value)
+        else:
+            return str(value)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if role == Qt.DisplayRole:
+            return self.get_text(index.row(), index.column())
+        elif (role == Qt.ForegroundRole) and (index.column() in self.foreground_function_dic):
+            return self.foreground_function_dic[index.column()](self.row_list[index.row()])
+        elif (role == Qt.FontRole) and (index.column() in self.font_function_dic):
+            return self.font_function_dic[index.column()](self.row_list[index.row()])
+
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            if orientation == Qt.Horizontal:
+                return self.title_list[section]
+            else:
+                return str(section + 1)
+
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """
+        Sort rows on the model, sort key is only counted once for every row.
+        """
+        if (column < 0) or (column >= len(self.title_list)):
+            return
+
+        key_list = []
+
+        for (i, row_value_list) in enumerate(self.row_list):
+            value = row_value_list[column]
+
+            if isinstance(value, (int, float)) and (column not in self.display_function_dic):
+                key_list.append((0, value, ''))
+            else:
+                key_list.append((1, 0, self.get_text(i, column)))
+
+        row_id_list = sorted(range(len(self.row_list)), key=key_list.__getitem__, reverse=(order == Qt.DescendingOrder))
+        new_row_dic = {old_row: new_row for (new_row, old_row) in enumerate(row_id_list)}
+
+        self.layoutAboutToBeChanged.emit()
+        self.row_list = [self.row_list[i] for i in row_id_list]
+
+        # Keep selection/current index on the same rows.
+        persistent_index_list = self.persistentIndexList()
+        self.changePersistentIndexList(persistent_index_list, [self.index(new_row_dic[index.row()], index.column()) for index in persistent_index_list])
+
+        self.layoutChanged.emit()
+
+
 class MyCheckBox(QCheckBox):
     """
     Re-Write eventFilter function for QCheckBox.
@@ -282,99 +485,3 @@ class QComboCheckBox(QComboBox):
         """
         super().clear()
         self.checkBoxList = []
-
-
-class FigureCanvasQTAgg(FigureCanvasQTAgg):
-    """
-    Generate a new figure canvas.
-    """
-    def __init__(self):
-        self.figure = Figure()
-        self.axes = None
-        super().__init__(self.figure)
-
-
-class NavigationToolbar2QT(NavigationToolbar2QT):
-    """
-    Enhancement for NavigationToolbar2QT, can get and show label value.
-    """
-    def __init__(self, canvas, parent, coordinates=True, x_is_date=True):
-        super().__init__(canvas, parent, coordinates)
-        self.x_is_date = x_is_date
-
-    @staticmethod
-    def bisection(event_xdata, xdata_list):
-        xdata = None
-        index = None
-        lower = 0
-        upper = len(xdata_list) - 1
-        bisection_index = (upper - lower) // 2
-
-        if xdata_list:
-            if event_xdata > xdata_list[upper]:
-                xdata = xdata_list[upper]
-                index = upper
-            elif (event_xdata < xdata_list[lower]) or (len(xdata_list) <= 2):
-                xdata = xdata_list[lower]
-                index = lower
-            elif event_xdata in xdata_list:
-                xdata = event_xdata
-                index = xdata_list.index(event_xdata)
-
-            while xdata is None:
-                if upper - lower == 1:
-                    if event_xdata - xdata_list[lower] <= xdata_list[upper] - event_xdata:
-                        xdata = xdata_list[lower]
-                        index = lower
-                    else:
-                        xdata = xdata_list[upper]
-                        index = upper
-
-                    break
-
-                if event_xdata > xdata_list[bisection_index]:
-                    lower = bisection_index
-                elif event_xdata < xdata_list[bisection_index]:
-                    upper = bisection_index
-
-                bisection_index = (upper - lower) // 2 + lower
-
-        return xdata, index
-
-    def _mouse_event_to_message(self, event):
-        if event.inaxes and event.inaxes.get_navigate():
-            try:
-                if self.x_is_date:
-                    event_xdata = num2date(event.xdata).strftime('%Y,%m,%d,%H,%M,%S')
-                else:
-                    event_xdata = event.xdata
-            except (ValueError, OverflowError):
-                pass
-            else:
-                if self.x_is_date and (len(event_xdata.split(',')) == 6):
-                    (year, month, day, hour, minute, second) = event_xdata.split(',')
-                    event_xdata = datetime.datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
-
-                xdata_list = list(self.canvas.figure.gca().get_lines()[0].get_xdata())
-                (xdata, index) = self.bisection(event_xdata, sorted(xdata_list))
-
-                if xdata is not None:
-                    info_list = []
-
-                    for line in self.canvas.figure.gca().get_lines():
-                        label = line.get_label()
-                        ydata_string = line.get_ydata()
-                        ydata_list = list(ydata_string)
-                        ydata = ydata_list[index]
-
-                        info_list.append('%s=%s' % (label, ydata))
-
-                    info_string = '  '.join(info_list)
-
-                    if self.x_is_date:
-                        xdata_string = xdata.strftime('%Y-%m-%d %H:%M:%S')
-                        xdata_string = re.sub(r' 00:00:00', '', xdata_string)
-                        info_string = '[%s]\n%s' % (xdata_string, info_string)
-
-                    return info_string
-        return ''
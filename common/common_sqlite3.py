@@ -2,6 +2,7 @@ import os
 import re
 import sys
 import sqlite3
+import urllib.parse
 
 sys.path.append(os.environ['LICENSE_MONITOR_INSTALL_PATH'])
 from common import common
@@ -9,7 +10,8 @@ from common import common
 
 def connect_db_file(db_file, mode='read'):
     """
-    Connect specified db_file with read/write mode.
+    Connect specified db_file with read/write/readonly mode.
+    readonly connection (file URI with mode=ro) never creates or changes the db file, it is used to read db files on worker threads.
     """
     result = 'passed'
     conn = ''
@@ -21,14 +23,17 @@ def connect_db_file(db_file, mode='read'):
             common.bprint('Database file "' + str(db_file) + '" is on another connection, will not connect it.', level='Warning')
             result = 'locked'
             return result, conn
-    elif mode == 'read':
+    elif mode in ['read', 'readonly']:
         if not os.path.exists(db_file):
             common.bprint('"' + str(db_file) + '" No such database file.', level='Error')
             result = 'failed'
             return result, conn
 
     try:
-        conn = sqlite3.connect(db_file)
+        if mode == 'readonly':
+            conn = sqlite3.connect('file:' + urllib.parse.quote(os.path.abspath(db_file)) + '?mode=ro', uri=True)
+        else:
+            conn = sqlite3.connect(db_file)
     except Exception as error:
         common.bprint('Failed on connecting database file "' + str(db_file) + '".', level='Error')
         common.bprint(error, color='red', display_method=1, indent=9)
@@ -37,6 +42,60 @@ def connect_db_file(db_file, mode='read'):
     return result, conn
 
 
+def connect_memory_db():
+    """
+    Connect a new in-memory db.
+    """
+    result = 'passed'
+    conn = ''
+
+    try:
+        conn = sqlite3.connect('file::memory:', uri=True)
+    except Exception as error:
+        common.bprint('Failed on connecting in-memory database.', level='Error')
+        common.bprint(error, color='red', display_method=1, indent=9)
+        result = 'failed'
+
+    return result, conn
+
+
+def execute_sql_command(conn, command, value_list=[]):
+    """
+    Execute one sql command (like "INSERT INTO ... SELECT ...") with value_list on conn, return True if it passed.
+    """
+    try:
+        conn.execute(command, value_list)
+    except Exception as error:
+        common.bprint('Failed on executing sql command "' + str(command) + '".', level='Error')
+        common.bprint(error, color='red', display_method=1, indent=9)
+        return False
+
+    return True
+
+
+def get_sql_query_data(conn, command, value_list=[]):
+    """
+    Run sql query (SELECT ...) with value_list on conn, get the data just like get_sql_table_data, {column: [value, ...]}.
+    """
+    data_dic = {}
+
+    try:
+        curs = conn.execute(command, value_list)
+        key_list = [tuple[0] for tuple in curs.description]
+        data_dic = {key: [] for key in key_list}
+
+        for item in curs.fetchall():
+            for (i, key) in enumerate(key_list):
+                data_dic[key].append(item[i])
+
+        curs.close()
+    except Exception as error:
+        common.bprint('Failed on running sql query "' + str(command) + '".', level='Warning')
+        common.bprint(error, color='yellow', display_method=1, indent=11)
+
+    return data_dic
+
+
 def connect_preprocess(db_file, orig_conn, mode='read'):
     """
     Extension for connect_db_file(), can use orig_conn instead of repeated connection.
@@ -110,6 +169,32 @@ def get_sql_table_count(db_file, orig_conn, table_name):
     return count
 
 
+def get_sql_table_key_range(db_file, orig_conn, table_name, key):
+    """
+    Get (min, max) value of specified key on the database table, (None, None) if the table is empty.
+    """
+    key_range = (None, None)
+
+    (result, conn, curs) = connect_preprocess(db_file, orig_conn)
+
+    if result == 'failed':
+        return key_range
+
+    try:
+        command = "SELECT min(" + str(key) + "), max(" + str(key) + ") FROM '" + str(table_name) + "'"
+        curs.execute(command)
+        key_range = tuple(curs.fetchone())
+        curs.close()
+
+        if orig_conn == '':
+            conn.close()
+    except Exception as error:
+        common.bprint('Failed on getting key range from table "' + str(table_name) + '" on db_file "' + str(db_file) + '".', level='Error')
+        common.bprint(error, color='red', display_method=1, indent=9)
+
+    return key_range
+
+
 def get_sql_table_key_list(db_file, orig_conn, table_name, key):
     """
     Get key list from the specified table on specified db file.
@@ -136,6 +221,39 @@ def get_sql_table_key_list(db_file, orig_conn, table_name, key):
     return key_list
 
 
+def get_sql_table_match_value_list(db_file, orig_conn, table_name, key, match_key_list, match_value_list_list):
+    """
+    For every match_value_list on match_value_list_list, get key value of the row whose match_key_list values are the same (None if no such row).
+    match_key_list should be covered by an index, since it is queried once for every match_value_list.
+    """
+    value_list = [None for match_value_list in match_value_list_list]
+
+    (result, conn, curs) = connect_preprocess(db_file, orig_conn)
+
+    if result == 'failed':
+        return value_list
+
+    try:
+        command = "SELECT \"" + str(key) + "\" FROM '" + str(table_name) + "' WHERE " + ' AND '.join(['"' + str(match_key) + '"=?' for match_key in match_key_list]) + ' LIMIT 1'
+
+        for (i, match_value_list) in enumerate(match_value_list_list):
+            curs.execute(command, match_value_list)
+            row = curs.fetchone()
+
+            if row:
+                value_list[i] = row[0]
+
+        curs.close()
+
+        if orig_conn == '':
+            conn.close()
+    except Exception as error:
+        common.bprint('Failed on getting table match values from table "' + str(table_name) + '" of db_file "' + str(db_file) + '".', level='Error')
+        common.bprint(error, color='red', display_method=1, indent=9)
+
+    return value_list
+
+
 def get_sql_table_data(db_file, orig_conn, table_name, key_list=[], select_condition=''):
     """
     With specified db_file-table_name, get all data from specified key_list.
@@ -333,6 +451,280 @@ def update_sql_table_data(db_file, orig_conn, table_name, set_condition='', wher
             common.bprint(error, color='red', display_method=1, indent=9)
 
 
+def delete_sql_table_data(db_file, orig_conn, table_name, where_condition='', commit=True):
+    """
+    Delete sql table rows on where_condition.
+    """
+    if where_condition:
+        (result, conn, curs) = connect_preprocess(db_file, orig_conn, mode='write')
+
+        if (result == 'failed') or (result == 'locked'):
+            return
+
+        try:
+            command = "DELETE FROM '" + str(table_name) + "' " + str(where_condition)
+            curs.execute(command)
+            curs.close()
+
+            if commit:
+                conn.commit()
+
+                if orig_conn == '':
+                    conn.close()
+        except Exception as error:
+            common.bprint('Failed on deleting data from table "' + str(table_name) + '" on db file "' + str(db_file) + '".', level='Error')
+            common.bprint(error, color='red', display_method=1, indent=9)
+
+
+def get_sql_index_list(db_file, orig_conn):
+    """
+    Get all of the indexes from the specified db file.
+    """
+    index_list = []
+    (result, conn, curs) = connect_preprocess(db_file, orig_conn)
+
+    if result == 'failed':
+        return index_list
+
+    try:
+        command = "SELECT name FROM sqlite_master WHERE type='index' ORDER BY name"
+        results = curs.execute(command)
+        index_list = [item[0] for item in results.fetchall()]
+        curs.close()
+
+        if orig_conn == '':
+            conn.close()
+    except Exception as error:
+        common.bprint('Failed on getting index list on db_file "' + str(db_file) + '".', level='Error')
+        common.bprint(error, color='red', display_method=1, indent=9)
+
+    return index_list
+
+
+def create_sql_index(db_file, orig_conn, index_name, table_name, key_list, unique=False, commit=True):
+    """
+    Create an index on table key_list if it not exists, return True if the index is ready.
+    """
+    (result, conn, curs) = connect_preprocess(db_file, orig_conn, mode='write')
+
+    if (result == 'failed') or (result == 'locked'):
+        return False
+
+    try:
+        if unique:
+            command = "CREATE UNIQUE INDEX IF NOT EXISTS '" + str(index_name) + "' ON '" + str(table_name) + "' " + gen_sql_name_string(key_list)
+        else:
+            command = "CREATE INDEX IF NOT EXISTS '" + str(index_name) + "' ON '" + str(table_name) + "' " + gen_sql_name_string(key_list)
+
+        curs.execute(command)
+        curs.close()
+
+        if commit:
+            conn.commit()
+
+            if orig_conn == '':
+                conn.close()
+    except Exception as error:
+        common.bprint('Failed on creating index "' + str(index_name) + '" for table "' + str(table_name) + '" on db file "' + str(db_file) + '".', level='Error')
+        common.bprint(error, color='red', display_method=1, indent=9)
+        return False
+
+    return True
+
+
+def get_sql_table_column_list(db_file, orig_conn, table_name):
+    """
+    Get all of the column names from the specified table.
+    """
+    column_list = []
+    (result, conn, curs) = connect_preprocess(db_file, orig_conn)
+
+    if result == 'failed':
+        return column_list
+
+    try:
+        command = "PRAGMA table_info('" + str(table_name) + "')"
+        results = curs.execute(command)
+        column_list = [item[1] for item in results.fetchall()]
+        curs.close()
+
+        if orig_conn == '':
+            conn.close()
+    except Exception as error:
+        common.bprint('Failed on getting column list of table "' + str(table_name) + '" on db_file "' + str(db_file) + '".', level='Error')
+        common.bprint(error, color='red', display_method=1, indent=9)
+
+    return column_list
+
+
+def add_sql_table_column(db_file, orig_conn, table_name, key, key_type, commit=True):
+    """
+    Add a new column into the specified table, return True if the column is added.
+    """
+    (result, conn, curs) = connect_preprocess(db_file, orig_conn, mode='write')
+
+    if (result == 'failed') or (result == 'locked'):
+        return False
+
+    try:
+        command = "ALTER TABLE '" + str(table_name) + "' ADD COLUMN '" + str(key) + "' " + str(key_type)
+        curs.execute(command)
+        curs.close()
+
+        if commit:
+            conn.commit()
+
+            if orig_conn == '':
+                conn.close()
+    except Exception as error:
+        common.bprint('Failed on adding column "' + str(key) + '" into table "' + str(table_name) + '" on db file "' + str(db_file) + '".', level='Error')
+        common.bprint(error, color='red', display_method=1, indent=9)
+        return False
+
+    return True
+
+
+def delete_sql_table_duplicate_rows(db_file, orig_conn, table_name, row_id, key_list, commit=True):
+    """
+    Delete duplicate rows on key_list, only keep the row with the biggest row_id.
+    """
+    (result, conn, curs) = connect_preprocess(db_file, orig_conn, mode='write')
+
+    if (result == 'failed') or (result == 'locked'):
+        return
+
+    try:
+        command = "DELETE FROM '" + str(table_name) + "' WHERE " + str(row_id) + " NOT IN (SELECT MAX(" + str(row_id) + ") FROM '" + str(table_name) + "' GROUP BY " + gen_sql_name_string(key_list)[1:-1] + ")"
+        curs.execute(command)
+        curs.close()
+
+        if commit:
+            conn.commit()
+
+            if orig_conn == '':
+                conn.close()
+    except Exception as error:
+        common.bprint('Failed on deleting duplicate rows from table "' + str(table_name) + '" on db file "' + str(db_file) + '".', level='Error')
+        common.bprint(error, color='red', display_method=1, indent=9)
+
+
+def insert_many_into_sql_table(db_file, orig_conn, table_name, key_list, value_list_list, commit=True):
+    """
+    Insert value_list_list into sql table with one batch, ignore the rows which already exist.
+    """
+    if not value_list_list:
+        return
+
+    (result, conn, curs) = connect_preprocess(db_file, orig_conn, mode='write')
+
+    if (result == 'failed') or (result == 'locked'):
+        return
+
+    try:
+        command = "INSERT OR IGNORE INTO '" + str(table_name) + "' " + gen_sql_name_string(key_list) + " VALUES (" + ', '.join(['?' for key in key_list]) + ")"
+        curs.executemany(command, value_list_list)
+        curs.close()
+
+        if commit:
+            conn.commit()
+
+            if orig_conn == '':
+                conn.close()
+    except Exception as error:
+        common.bprint('Failed on inserting specified values into table "' + str(table_name) + '" on db file "' + str(db_file) + '".', level='Error')
+        common.bprint(error, color='red', display_method=1, indent=9)
+
+
+def upsert_into_sql_table(db_file, orig_conn, table_name, key_list, value_list_list, conflict_key_list, update_key_list, commit=True, add_key_list=[]):
+    """
+    Insert value_list_list into sql table with one batch, update update_key_list for the rows which conflict on conflict_key_list.
+    For the keys on add_key_list, new values are added into the existing values instead of replacing them.
+    conflict_key_list must be covered by a unique index.
+    """
+    if not value_list_list:
+        return
+
+    (result, conn, curs) = connect_preprocess(db_file, orig_conn, mode='write')
+
+    if (result == 'failed') or (result == 'locked'):
+        return
+
+    try:
+        value_string = '(' + ', '.join(['?' for key in key_list]) + ')'
+
+        if sqlite3.sqlite_version_info >= (3, 24, 0):
+            set_string = ', '.join(['"' + str(key) + '"=excluded."' + str(key) + '"' for key in update_key_list] + ['"' + str(key) + '"="' + str(key) + '"+excluded."' + str(key) + '"' for key in add_key_list])
+            command = "INSERT INTO '" + str(table_name) + "' " + gen_sql_name_string(key_list) + " VALUES " + value_string + " ON CONFLICT " + gen_sql_name_string(conflict_key_list) + " DO UPDATE SET " + set_string
+            curs.executemany(command, value_list_list)
+        else:
+            # UPSERT is not supported before sqlite 3.24, update the existing rows and then insert the new ones.
+            set_string = ', '.join(['"' + str(key) + '"=?' for key in update_key_list] + ['"' + str(key) + '"="' + str(key) + '"+?' for key in add_key_list])
+            where_string = ' AND '.join(['"' + str(key) + '"=?' for key in conflict_key_list])
+            update_index_list = [key_list.index(key) for key in update_key_list] + [key_list.index(key) for key in add_key_list] + [key_list.index(key) for key in conflict_key_list]
+            command = "UPDATE '" + str(table_name) + "' SET " + set_string + " WHERE " + where_string
+            curs.executemany(command, [[value_list[i] for i in update_index_list] for value_list in value_list_list])
+            command = "INSERT OR IGNORE INTO '" + str(table_name) + "' " + gen_sql_name_string(key_list) + " VALUES " + value_string
+            curs.executemany(command, value_list_list)
+
+        curs.close()
+
+        if commit:
+            conn.commit()
+
+            if orig_conn == '':
+                conn.close()
+    except Exception as error:
+        common.bprint('Failed on upserting specified values into table "' + str(table_name) + '" on db file "' + str(db_file) + '".', level='Error')
+        common.bprint(error, color='red', display_method=1, indent=9)
+
+
+def update_or_insert_into_sql_table(db_file, orig_conn, table_name, key_list, value_list_list, match_key_list, update_key_list, commit=True):
+    """
+    Update update_key_list for the rows which match on match_key_list, insert the values which match no row.
+    It is the same as upsert_into_sql_table, but no unique index is required (and it is slower).
+    """
+    if not value_list_list:
+        return
+
+    (result, conn, curs) = connect_preprocess(db_file, orig_conn, mode='write')
+
+    if (result == 'failed') or (result == 'locked'):
+        return
+
+    try:
+        set_string = ', '.join(['"' + str(key) + '"=?' for key in update_key_list])
+        where_string = ' AND '.join(['"' + str(key) + '"=?' for key in match_key_list])
+        update_index_list = [key_list.index(key) for key in update_key_list] + [key_list.index(key) for key in match_key_list]
+        update_command = "UPDATE '" + str(table_name) + "' SET " + set_string + " WHERE " + where_string
+        insert_command = "INSERT INTO '" + str(table_name) + "' " + gen_sql_name_string(key_list) + " VALUES (" + ', '.join(['?' for key in key_list]) + ")"
+
+        for value_list in value_list_list:
+            curs.execute(update_command, [value_list[i] for i in update_index_list])
+
+            if curs.rowcount == 0:
+                curs.execute(insert_command, value_list)
+
+        curs.close()
+
+        if commit:
+            conn.commit()
+
+            if orig_conn == '':
+                conn.close()
+    except Exception as error:
+        common.bprint('Failed on updating or inserting specified values into table "' + str(table_name) + '" on db file "' + str(db_file) + '".', level='Error')
+        common.bprint(error, color='red', display_method=1, indent=9)
+
+
+def gen_sql_name_string(key_list):
+    """
+    Switch the input key_list into the sqlite column name string, just like ("a", "b").
+    """
+    name_string = '(' + ', '.join(['"' + str(key).replace('"', '""') + '"' for key in key_list]) + ')'
+
+    return name_string
+
+
 def gen_sql_table_key_string(key_list, key_type_list=[]):
     """
     Switch the input key_list into the sqlite table key string.
@@ -36,7 +36,7 @@ def gen_shell_tools():
     """
     Generate shell scripts under <LICENSE_MONITOR_INSTALL_PATH>/tools.
     """
-    tool_list = ['bin/license_monitor', 'bin/license_sample', 'tools/collect_feature_record_from_license_log', 'tools/config_product_feature_relationship', 'tools/gen_LM_LICENSE_FILE', 'tools/get_license_log', 'tools/get_product_feature_relationship', 'tools/patch', 'tools/seedb', 'tools/show_license_log_info', 'tools/update_product_feature_relationship', 'tools/update_project_execute_host_with_lsf', 'tools/view_product_feature_relationship']
+    tool_list = ['bin/license_monitor', 'bin/license_sample', 'tools/backfill_cost_day', 'tools/check_lmstat_parser', 'tools/check_utilization_day', 'tools/collect_feature_record_from_license_log', 'tools/config_product_feature_relationship', 'tools/gen_LM_LICENSE_FILE', 'tools/get_license_log', 'tools/get_product_feature_relationship', 'tools/migrate_db_layout', 'tools/patch', 'tools/seedb', 'tools/show_license_log_info', 'tools/update_product_feature_relationship', 'tools/update_project_execute_host_with_lsf', 'tools/view_product_feature_relationship']
 
     for tool_name in tool_list:
         tool = str(CWD) + '/' + str(tool_name)
@@ -108,12 +108,22 @@ lmstat_path = "''' + str(lmstat_path) + '''"
 # Specify lmstat bsub command, example "bsub -q normal -Is".
 lmstat_bsub_command = ""
 
+# How many lmstat commands (one for every license server) are run at the same time.
+lmstat_max_workers = 16
+
+# lmstat command for one license server is killed after the timeout, unit is "second", 0 means no timeout.
+lmstat_timeout = 60
+
 # Excluded license servers, format is "27020@lic_server 5280@lic_server".
 excluded_license_servers = ""
 
 # Specify the database directory where to save sample data.
 db_path = "''' + str(db_path) + '''"
 
+# Specify the database layout, "legacy" (one table per feature) or "consolidated" (one table per kind).
+# Run tools/migrate_db_layout to migrate existing legacy databases before switching to "consolidated", licenseMonitor reads the databases of db_layout.
+db_layout = "legacy"
+
 # Specify which are the primary factors when getting project information.
 # It could be one or serveral items between "user/execute_host/submit_host".
 project_primary_factors = "user  execute_host  submit_host"
@@ -122,7 +132,16 @@ project_primary_factors = "user  execute_host  submit_host"
 max_record_num = 1000
 
 # The time interval to fresh license information automatically, unit is "second", default is 300 seconds.
+# License snapshot published by license_sample is used instead of running lmstat if it is not older than fresh_interval.
+# licenseMonitor GUI reloads the license snapshot every fresh_interval seconds while it is shown (not on live mode).
 fresh_interval = 300
+
+# Memory limit of the CURVE/UTILIZATION/COST query result cache on licenseMonitor GUI, unit is "MB", 0 means no cache.
+# Cached results are reused until the filter settings or the related database/config files are changed.
+query_cache_size = 200
+
+# How many database files are read at the same time on licenseMonitor GUI CURVE/UTILIZATION/COST tabs, 1 means reading them one by one.
+db_read_max_workers = 8
 ''')
 
             os.chmod(config_file, 0o755)
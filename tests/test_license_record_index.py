@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Differential test of license record index, common_license_record.LicenseRecordIndex.run must select the same licenses as the original filter common_license.FilterLicenseDic.run.
+license_dic is parsed from the recorded lmstat outputs on tests/lmstat, the license servers are renamed to get near-miss server names.
+Run it with "python -m unittest discover -s tests" or "python -m pytest tests".
+"""
+import os
+import sys
+import unittest
+
+INSTALL_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('LICENSE_MONITOR_INSTALL_PATH', INSTALL_PATH)
+sys.path.insert(0, INSTALL_PATH)
+from common import common_license
+from common import common_license_record
+
+LMSTAT_DIR = os.path.join(INSTALL_PATH, 'tests', 'lmstat')
+
+
+def load_license_dic():
+    """
+    Get license_dic with license servers "1717@lic1", "1717@lic10" and "1717@lic11" (vendor daemons snpslmd/cdslmd/mgcld).
+    """
+    license_dic = {}
+
+    for (file_name, license_server, new_license_server) in [('expires_multi_vendor.lmstat', '27020@lic03', '1717@lic1'),
+                                                             ('expires_multi_vendor.lmstat', '27021@lic04', '1717@lic10'),
+                                                             ('vendor_daemon_down.lmstat', '1717@lic05', '1717@lic11')]:
+        with open(os.path.join(LMSTAT_DIR, file_name), 'r') as LF:
+            license_dic[new_license_server] = common_license.parse_lmstat_output(LF.read().split('\n'))[license_server]
+
+    return license_dic
+
+
+def get_selected_license_list(license_dic):
+    """
+    Get the selected (license_server, vendor_daemon, feature, [user, ...]) of license_dic or license_record_dic.
+    """
+    selected_license_list = []
+
+    for (license_server, server_dic) in license_dic.items():
+        for (vendor_daemon, vendor_daemon_dic) in server_dic['vendor_daemon'].items():
+            for (feature, feature_dic) in vendor_daemon_dic['feature'].items():
+                selected_license_list.append((license_server, vendor_daemon, feature, sorted(usage_dic['user'] for usage_dic in feature_dic['in_use_info'])))
+
+    return sorted(selected_license_list)
+
+
+class TestLicenseRecordIndex(unittest.TestCase):
+    def setUp(self):
+        self.license_dic = load_license_dic()
+        self.license_record_index = common_license_record.LicenseRecordIndex(common_license_record.get_license_record_dic(self.license_dic))
+        self.my_filter_license_dic = common_license.FilterLicenseDic()
+
+    def check_run(self, **filter_dic):
+        """
+        Filter with both LicenseRecordIndex.run and FilterLicenseDic.run, they must select the same licenses.
+        """
+        expected_license_list = get_selected_license_list(self.my_filter_license_dic.run(self.license_dic, **filter_dic))
+        license_list = get_selected_license_list(self.license_record_index.run(**filter_dic))
+
+        self.assertEqual(expected_license_list, license_list)
+
+        return license_list
+
+    def test_near_miss_server(self):
+        self.assertEqual([], self.check_run(server_list=['1717@lic'], feature_list=['HSPICE']))
+        self.assertEqual([], self.check_run(server_list=['1717@lic1'], feature_list=['Verdi']))
+        self.assertTrue(all(license[0] == '1717@lic1' for license in self.check_run(server_list=['1717@lic1'], feature_list=['HSPICE'])))
+        self.check_run(server_list=['1717@lic1'], user_list=['user'])
+
+    def test_near_miss_vendor(self):
+        self.assertEqual([], self.check_run(vendor_list=['snps'], feature_list=['HSPICE']))
+        self.assertEqual([], self.check_run(vendor_list=['lmd'], user_list=['user21']))
+        self.assertTrue(all(license[1] == 'mgcld' for license in self.check_run(vendor_list=['mgcld'], feature_list=['calibre'])))
+
+    def test_fuzzy_feature_and_user(self):
+        self.assertTrue(self.check_run(server_list=['ALL'], vendor_list=['ALL'], feature_list=['calibre']))
+        self.assertTrue(self.check_run(server_list=['1717@lic1', '1717@lic10'], user_list=['user2']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Differential test of lmstat output parser, common_license.parse_lmstat_output must get the same license_dic as the original regex parser common_license.parse_lmstat_output_by_regex.
+The recorded (anonymized) "lmstat -a -i" outputs are on tests/lmstat, more recordings can be saved with "tools/check_lmstat_parser --record_dir".
+Run it with "python -m unittest discover -s tests" or "python -m pytest tests".
+"""
+import os
+import sys
+import json
+import unittest
+
+INSTALL_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('LICENSE_MONITOR_INSTALL_PATH', INSTALL_PATH)
+sys.path.insert(0, INSTALL_PATH)
+from common import common_license
+
+LMSTAT_DIR = os.path.join(INSTALL_PATH, 'tests', 'lmstat')
+
+
+def load_lmstat_output(file_name):
+    """
+    Get line list of recorded lmstat output.
+    """
+    with open(os.path.join(LMSTAT_DIR, file_name), 'r') as LF:
+        return LF.read().split('\n')
+
+
+def get_in_use_info_list(license_dic, key):
+    """
+    Get all of the in_use_info[key] values on license_dic.
+    """
+    return [usage_dic[key] for server_dic in license_dic.values() for vendor_daemon_dic in server_dic['vendor_daemon'].values() for feature_dic in vendor_daemon_dic['feature'].values() for usage_dic in feature_dic['in_use_info']]
+
+
+class TestLmstatParser(unittest.TestCase):
+    def check_lmstat_output(self, file_name):
+        """
+        Parse recorded lmstat output with both parsers, they must get the same license_dic (with the same key order).
+        """
+        stdout_list = load_lmstat_output(file_name)
+        expected_license_dic = common_license.parse_lmstat_output_by_regex(stdout_list)
+        license_dic = common_license.parse_lmstat_output(stdout_list)
+
+        self.assertTrue(expected_license_dic)
+        self.assertEqual(expected_license_dic, license_dic)
+        self.assertEqual(json.dumps(expected_license_dic), json.dumps(license_dic))
+
+        return license_dic
+
+    def test_all_recordings(self):
+        file_name_list = sorted(file_name for file_name in os.listdir(LMSTAT_DIR) if file_name.endswith('.lmstat'))
+        self.assertTrue(file_name_list)
+
+        for file_name in file_name_list:
+            with self.subTest(file_name=file_name):
+                self.check_lmstat_output(file_name)
+
+    def test_uncounted(self):
+        license_dic = self.check_lmstat_output('uncounted.lmstat')
+        feature_dic = license_dic['27000@lic01']['vendor_daemon']['snpslmd']['feature']
+
+        self.assertEqual(('Uncounted', '4'), (feature_dic['Verdi_Ultra']['issued'], feature_dic['Verdi_Ultra']['in_use']))
+        self.assertEqual(('Uncounted', '0'), (feature_dic['Siliconsmart']['issued'], feature_dic['Siliconsmart']['in_use']))
+
+    def test_reservation(self):
+        license_dic = self.check_lmstat_output('reservation.lmstat')
+
+        self.assertEqual(5, get_in_use_info_list(license_dic, 'start_time').count('RESERVATION'))
+        self.assertIn('layout_team', get_in_use_info_list(license_dic, 'user'))
+        self.assertIn('farm_a', get_in_use_info_list(license_dic, 'execute_host'))
+
+    def test_expires_multi_vendor(self):
+        license_dic = self.check_lmstat_output('expires_multi_vendor.lmstat')
+        expires_dic = license_dic['27020@lic03']['vendor_daemon']['mgcld']['expires']
+
+        self.assertEqual(['27020@lic03', '27021@lic04'], list(license_dic.keys()))
+        self.assertEqual(['31-dec-2024', '30-jun-2025'], [expire_dic['expires'] for expire_dic in expires_dic['HSPICE']])
+        self.assertEqual('permanent(no expiration date)', expires_dic['calibrehdrc'][0]['expires'])
+        self.assertNotIn('unknown_feature', expires_dic)
+        self.assertIn('HSPICE', license_dic['27021@lic04']['vendor_daemon']['snpslmd']['expires'])
+
+    def test_vendor_daemon_down(self):
+        license_dic = self.check_lmstat_output('vendor_daemon_down.lmstat')
+        vendor_daemon_dic = license_dic['1717@lic05']['vendor_daemon']
+
+        self.assertEqual({'snpslmd': 'UP', 'cdslmd': 'DOWN', 'mgcld': 'DOWN'}, {vendor_daemon: vendor_daemon_dic[vendor_daemon]['vendor_daemon_status'] for vendor_daemon in vendor_daemon_dic.keys()})
+        self.assertEqual('UNKNOWN', license_dic['1718@lic06']['license_server_status'])
+
+
+if __name__ == '__main__':
+    unittest.main()
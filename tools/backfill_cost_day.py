@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+import os
+import re
+import sys
+import time
+import argparse
+
+sys.path.append(os.environ['LICENSE_MONITOR_INSTALL_PATH'])
+from common import common
+from common import common_sqlite3
+from common import common_license_db
+from common import common_cost
+from config import config
+
+os.environ['PYTHONUNBUFFERED'] = '1'
+
+
+def read_args():
+    """
+    Read in arguments.
+    """
+    parser = argparse.ArgumentParser(description='Rebuild cost_day info (license runtime by day and project, it is used by licenseMonitor COST tab) from the usage history. It is maintained by license_sample incrementally, this tool is used to build it for the existing usage history or repair it.')
+
+    parser.add_argument('-d', '--db_path',
+                        default=config.db_path,
+                        help='Specify licenseMonitor database directory, default is "' + str(config.db_path) + '".')
+    parser.add_argument('-s', '--license_servers',
+                        nargs='+',
+                        default=[],
+                        help='Only rebuild specified license server(s), format is "27020@lic_server".')
+    parser.add_argument('-b', '--begin_date',
+                        default='',
+                        help='Only rebuild cost_day info from specified date, format is "YYYYMMDD", the cost_day info before it is kept. Default is to rebuild all of the cost_day info, then the cost_day info before usage history is removed.')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(str(args.db_path) + '/license_server'):
+        common.bprint('"' + str(args.db_path) + '/license_server": No such directory.', level='Error')
+        sys.exit(1)
+
+    if args.begin_date and (not re.match(r'^\d{8}$', args.begin_date)):
+        common.bprint('"' + str(args.begin_date) + '": Invalid date format, it should be "YYYYMMDD".', level='Error')
+        sys.exit(1)
+
+    return args.db_path, args.license_servers, args.begin_date
+
+
+class BackfillCostDay():
+    """
+    Recount cost_day info from usage db, and replace the saved cost_day info with it.
+    """
+    def __init__(self, db_path, license_server_list, begin_date):
+        self.db_path = db_path
+        self.license_server_list = license_server_list
+        self.begin_date = begin_date
+        self.begin_second = 0
+
+        if self.begin_date:
+            self.begin_second = int(time.mktime(time.strptime(str(self.begin_date), '%Y%m%d')))
+
+        self.project_resolver = common_cost.get_project_resolver(self.db_path, config.project_primary_factors if hasattr(config, 'project_primary_factors') else '')
+
+    def backfill_cost_day(self, vendor_daemon_path):
+        """
+        Rebuild cost_day info for one license_server/vendor_daemon.
+        """
+        usage_db_file = common_license_db.get_db_file(vendor_daemon_path, 'usage', common_license_db.get_db_layout(config))
+
+        if not usage_db_file:
+            return
+
+        cost_day_db_file = common_license_db.get_consolidated_db_file(vendor_daemon_path, 'cost_day')
+
+        print('>>> Rebuilding "' + str(cost_day_db_file) + '" ...')
+
+        (result, cost_day_db_conn) = common_sqlite3.connect_db_file(cost_day_db_file, mode='write')
+
+        if result != 'passed':
+            return
+
+        # Delete old cost_day info first, so license_sample cannot add runtime into cost_day db before it is rebuilt.
+        common_license_db.init_cost_day_db(cost_day_db_file, cost_day_db_conn)
+        begin_date = common_license_db.get_cost_day_begin_date(cost_day_db_file, cost_day_db_conn)
+
+        if self.begin_date:
+            common_sqlite3.delete_sql_table_data(cost_day_db_file, cost_day_db_conn, 'cost_day', "WHERE sample_date>='" + str(self.begin_date) + "'", commit=False)
+
+            if (begin_date is None) or (begin_date > self.begin_date):
+                begin_date = self.begin_date
+        else:
+            common_sqlite3.delete_sql_table_data(cost_day_db_file, cost_day_db_conn, 'cost_day', 'WHERE 1=1', commit=False)
+            begin_date = ''
+
+        (result, usage_db_conn) = common_sqlite3.connect_db_file(usage_db_file, mode='read')
+
+        if result != 'passed':
+            cost_day_db_conn.rollback()
+            cost_day_db_conn.close()
+            return
+
+        cost_day_runtime_dic = {}
+
+        # Reservations (start_second is "RESERVATION" text) are excluded by comparing start_second with sample_second, just like licenseMonitor COST tab.
+        select_condition = 'WHERE sample_second>' + str(self.begin_second) + ' AND start_second<sample_second'
+
+        for feature in common_license_db.get_feature_list(usage_db_file, usage_db_conn):
+            data_dic = common_license_db.get_feature_data(usage_db_file, usage_db_conn, feature, ['sample_second', 'user', 'submit_host', 'execute_host', 'num', 'start_second'], select_condition)
+
+            for i in range(len(data_dic.get('sample_second', []))):
+                start_second = int(data_dic['start_second'][i])
+                common_cost.add_cost_day_runtime(cost_day_runtime_dic, feature, data_dic['submit_host'][i], data_dic['execute_host'][i], data_dic['user'][i], data_dic['num'][i], start_second, max(start_second, self.begin_second), data_dic['sample_second'][i], self.project_resolver)
+
+        usage_db_conn.close()
+
+        common_license_db.save_cost_day_runtime(cost_day_db_file, cost_day_db_conn, cost_day_runtime_dic, commit=False)
+        common_license_db.set_cost_day_begin_date(cost_day_db_file, cost_day_db_conn, begin_date, commit=False)
+        cost_day_db_conn.commit()
+        cost_day_db_conn.close()
+
+        print('    Saved ' + str(len(cost_day_runtime_dic)) + ' cost_day item(s).')
+
+    def run(self):
+        license_server_db_path = str(self.db_path) + '/license_server'
+
+        for license_server in sorted(os.listdir(license_server_db_path)):
+            license_server_path = str(license_server_db_path) + '/' + str(license_server)
+
+            if (not re.match(r'^\d+@\S+$', license_server)) or (not os.path.isdir(license_server_path)):
+                continue
+
+            if self.license_server_list and (license_server not in self.license_server_list):
+                continue
+
+            for vendor_daemon in sorted(os.listdir(license_server_path)):
+                vendor_daemon_path = str(license_server_path) + '/' + str(vendor_daemon)
+
+                if os.path.isdir(vendor_daemon_path):
+                    self.backfill_cost_day(vendor_daemon_path)
+
+        print('')
+        print('Done.')
+
+
+################
+# Main Process #
+################
+def main():
+    (db_path, license_server_list, begin_date) = read_args()
+    my_backfill_cost_day = BackfillCostDay(db_path, license_server_list, begin_date)
+    my_backfill_cost_day.run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+sys.path.append(os.environ['LICENSE_MONITOR_INSTALL_PATH'])
+from common import common
+from common import common_license
+from config import config
+
+os.environ['PYTHONUNBUFFERED'] = '1'
+
+
+def read_args():
+    """
+    Read in arguments.
+    """
+    parser = argparse.ArgumentParser(description='Compare lmstat output parser (common_license.parse_lmstat_output) with the original regex parser (common_license.parse_lmstat_output_by_regex), on recorded lmstat outputs or live lmstat outputs.')
+
+    parser.add_argument('-f', '--files',
+                        nargs='+',
+                        default=[],
+                        help='Specify recorded lmstat output files ("lmstat -a -i" output).')
+    parser.add_argument('-s', '--license_servers',
+                        nargs='+',
+                        default=[],
+                        help='Run lmstat for specified license server(s) and compare, default is the license servers on config/LM_LICENSE_FILE (or LM_LICENSE_FILE) if no file is specified.')
+    parser.add_argument('-r', '--record_dir',
+                        default='',
+                        help='Save live lmstat outputs into specified directory, so they can be compared again with "--files".')
+
+    args = parser.parse_args()
+
+    for file in args.files:
+        if not os.path.isfile(file):
+            common.bprint('"' + str(file) + '": No such file.', level='Error')
+            sys.exit(1)
+
+    if (not args.files) and (not args.license_servers):
+        LM_LICENSE_FILE_file = str(os.environ['LICENSE_MONITOR_INSTALL_PATH']) + '/config/LM_LICENSE_FILE'
+
+        if os.path.exists(LM_LICENSE_FILE_file):
+            args.license_servers = common_license.parse_lm_license_file(LM_LICENSE_FILE_file)
+        else:
+            args.license_servers = [license_server for license_server in os.environ.get('LM_LICENSE_FILE', '').split(':') if license_server]
+
+        if not args.license_servers:
+            common.bprint('No lmstat output file or license server is specified.', level='Error')
+            sys.exit(1)
+
+    if args.record_dir and (not os.path.isdir(args.record_dir)):
+        common.bprint('"' + str(args.record_dir) + '": No such directory.', level='Error')
+        sys.exit(1)
+
+    return args.files, args.license_servers, args.record_dir
+
+
+class CheckLmstatParser():
+    """
+    Parse lmstat outputs with both parsers, and report the first difference of license_dic.
+    """
+    def __init__(self, file_list, license_server_list, record_dir):
+        self.file_list = file_list
+        self.license_server_list = license_server_list
+        self.record_dir = record_dir
+        self.failed_num = 0
+
+    def get_first_difference(self, expected, actual, path='license_dic'):
+        """
+        Get the path and values of the first difference between expected and actual, return '' if they are the same.
+        """
+        if type(expected) is not type(actual):
+            return str(path) + ': ' + repr(expected) + ' (expected) != ' + repr(actual)
+        elif isinstance(expected, dict):
+            if list(expected.keys()) != list(actual.keys()):
+                return str(path) + ' keys: ' + repr(list(expected.keys())) + ' (expected) != ' + repr(list(actual.keys()))
+
+            for key in expected.keys():
+                difference = self.get_first_difference(expected[key], actual[key], str(path) + '[' + repr(key) + ']')
+
+                if difference:
+                    return difference
+        elif isinstance(expected, list):
+            if len(expected) != len(actual):
+                return str(path) + ' length: ' + str(len(expected)) + ' (expected) != ' + str(len(actual))
+
+            for (i, item) in enumerate(expected):
+                difference = self.get_first_difference(item, actual[i], str(path) + '[' + str(i) + ']')
+
+                if difference:
+                    return difference
+        elif expected != actual:
+            return str(path) + ': ' + repr(expected) + ' (expected) != ' + repr(actual)
+
+        return ''
+
+    def run_parser(self, parser, stdout_list):
+        """
+        Run parser, return (license_dic or exception name, run time).
+        """
+        start_time = time.time()
+
+        try:
+            result = parser(stdout_list)
+        except Exception as error:
+            result = 'Exception ' + type(error).__name__ + ': ' + str(error)
+
+        return result, time.time() - start_time
+
+    def check_stdout(self, name, stdout):
+        """
+        Compare the two parsers on one lmstat output (bytes).
+        """
+        stdout_list = str(stdout, 'unicode_escape').split('\n')
+        (expected, expected_time) = self.run_parser(common_license.parse_lmstat_output_by_regex, stdout_list)
+        (actual, actual_time) = self.run_parser(common_license.parse_lmstat_output, stdout_list)
+        difference = self.get_first_difference(expected, actual)
+        time_string = '(' + str(len(stdout_list)) + ' lines, regex parser ' + str(round(expected_time, 3)) + 's, parser ' + str(round(actual_time, 3)) + 's)'
+
+        if difference:
+            self.failed_num += 1
+            common.bprint(str(name) + ' : failed ' + str(time_string), level='Error')
+            common.bprint(difference, color='red', display_method=1, indent=9)
+        else:
+            print(str(name) + ' : passed ' + str(time_string))
+
+    def get_lmstat_stdout(self, license_server):
+        """
+        Run lmstat for specified license server, return stdout (bytes).
+        """
+        lmstat_path = config.lmstat_path if hasattr(config, 'lmstat_path') else 'lmstat'
+        bsub_command = config.lmstat_bsub_command if hasattr(config, 'lmstat_bsub_command') else ''
+        timeout = config.lmstat_timeout if hasattr(config, 'lmstat_timeout') else 60
+        my_get_license_info = common_license.GetLicenseInfo(lmstat_path=lmstat_path, bsub_command=bsub_command, license_servers=[license_server])
+        lmstat_command = my_get_license_info.get_lmstat_command(specified_server=license_server)
+
+        try:
+            stdout = subprocess.run(lmstat_command, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=(timeout or None)).stdout
+        except Exception as error:
+            common.bprint('Failed on running lmstat command "' + ' '.join(lmstat_command) + '".', level='Error')
+            common.bprint(error, color='red', display_method=1, indent=9)
+            return b''
+
+        if self.record_dir:
+            with open(str(self.record_dir) + '/' + str(license_server) + '.lmstat', 'wb') as RF:
+                RF.write(stdout)
+
+        return stdout
+
+    def run(self):
+        for file in self.file_list:
+            with open(file, 'rb') as LF:
+                self.check_stdout(file, LF.read())
+
+        for license_server in self.license_server_list:
+            stdout = self.get_lmstat_stdout(license_server)
+
+            if stdout:
+                self.check_stdout(license_server, stdout)
+
+        print('')
+
+        if self.failed_num:
+            print('Done. ' + str(self.failed_num) + ' lmstat output(s) are parsed differently.')
+            sys.exit(1)
+        else:
+            print('Done. All of the lmstat outputs are parsed the same.')
+
+
+################
+# Main Process #
+################
+def main():
+    (file_list, license_server_list, record_dir) = read_args()
+    my_check_lmstat_parser = CheckLmstatParser(file_list, license_server_list, record_dir)
+    my_check_lmstat_parser.run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+import os
+import re
+import sys
+import datetime
+import argparse
+
+sys.path.append(os.environ['LICENSE_MONITOR_INSTALL_PATH'])
+from common import common
+from common import common_sqlite3
+from common import common_license_db
+from config import config
+
+os.environ['PYTHONUNBUFFERED'] = '1'
+
+
+def read_args():
+    """
+    Read in arguments.
+    """
+    parser = argparse.ArgumentParser(description='Recount utilization (day average) info of one day from the raw utilization samples, and compare it with the saved utilization_day info.')
+
+    parser.add_argument('-d', '--db_path',
+                        default=config.db_path,
+                        help='Specify licenseMonitor database directory, default is "' + str(config.db_path) + '".')
+    parser.add_argument('-s', '--license_servers',
+                        nargs='+',
+                        default=[],
+                        help='Only check specified license server(s), format is "27020@lic_server".')
+    parser.add_argument('-D', '--date',
+                        default=datetime.datetime.today().strftime('%Y%m%d'),
+                        help='Specify the date to check, format is "YYYYMMDD", default is today.')
+    parser.add_argument('-r', '--repair',
+                        action='store_true',
+                        default=False,
+                        help='Save the recounted utilization (day average) info if it is different from the saved one.')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(str(args.db_path) + '/license_server'):
+        common.bprint('"' + str(args.db_path) + '/license_server": No such directory.', level='Error')
+        sys.exit(1)
+
+    if not re.match(r'^\d{8}$', args.date):
+        common.bprint('"' + str(args.date) + '": Invalid date format, it should be "YYYYMMDD".', level='Error')
+        sys.exit(1)
+
+    return args.db_path, args.license_servers, args.date, args.repair
+
+
+class CheckUtilizationDay():
+    """
+    Recount utilization day info from utilization db, compare it with utilization_day db, and repair it on demand.
+    """
+    def __init__(self, db_path, license_server_list, sample_date, repair):
+        self.db_path = db_path
+        self.license_server_list = license_server_list
+        self.sample_date = sample_date
+        self.repair = repair
+        self.mismatch_num = 0
+
+    def is_same_value(self, saved_value, expected_value):
+        """
+        Numbers are compared as float, since sqlite column type may change saved value type (like "3.0" to 3).
+        """
+        try:
+            return float(saved_value) == float(expected_value)
+        except (TypeError, ValueError):
+            return str(saved_value) == str(expected_value)
+
+    def check_utilization_day(self, vendor_daemon_path):
+        """
+        Check utilization day info for one license_server/vendor_daemon.
+        """
+        utilization_db_file = common_license_db.get_db_file(vendor_daemon_path, 'utilization', common_license_db.get_db_layout(config))
+        utilization_day_db_file = common_license_db.get_db_file(vendor_daemon_path, 'utilization_day', common_license_db.get_db_layout(config))
+
+        if not utilization_db_file:
+            return
+
+        if not utilization_day_db_file:
+            if common_license_db.get_consolidated_db_kind(utilization_db_file):
+                utilization_day_db_file = common_license_db.get_consolidated_db_file(vendor_daemon_path, 'utilization_day')
+            else:
+                utilization_day_db_file = common_license_db.get_legacy_db_file(vendor_daemon_path, 'utilization_day')
+
+        print('>>> Checking "' + str(utilization_day_db_file) + '" ...')
+
+        (result, utilization_db_conn) = common_sqlite3.connect_db_file(utilization_db_file, mode='read')
+
+        if result != 'passed':
+            return
+
+        feature_sum_dic = common_license_db.get_utilization_day_sum_from_raw(utilization_db_file, utilization_db_conn, self.sample_date)
+        utilization_db_conn.close()
+
+        if self.repair:
+            (result, utilization_day_db_conn) = common_sqlite3.connect_db_file(utilization_day_db_file, mode='write')
+        else:
+            (result, utilization_day_db_conn) = common_sqlite3.connect_db_file(utilization_day_db_file, mode='read')
+
+        if result != 'passed':
+            return
+
+        utilization_day_dic = common_license_db.get_utilization_day_info(utilization_day_db_file, utilization_day_db_conn, self.sample_date)
+        repair_feature_sum_dic = {}
+
+        for feature in sorted(set(feature_sum_dic.keys()) | set(utilization_day_dic.keys())):
+            if feature not in feature_sum_dic:
+                common.bprint(str(feature) + ': no utilization sample on ' + str(self.sample_date) + ', but utilization_day info is saved.', level='Warning', indent=4)
+                continue
+
+            expected_dic = common_license_db.count_utilization_day_average(feature_sum_dic[feature])
+            expected_dic.update(feature_sum_dic[feature])
+
+            if feature not in utilization_day_dic:
+                message = 'utilization_day info is missing'
+            else:
+                diff_list = []
+
+                for (key, expected_value) in expected_dic.items():
+                    if not self.is_same_value(utilization_day_dic[feature][key], expected_value):
+                        diff_list.append(str(key) + ' ' + str(utilization_day_dic[feature][key]) + ' (expected ' + str(expected_value) + ')')
+
+                message = ', '.join(diff_list)
+
+            if message:
+                self.mismatch_num += 1
+                repair_feature_sum_dic[feature] = feature_sum_dic[feature]
+                common.bprint(str(feature) + ': ' + str(message), level='Warning', indent=4)
+            else:
+                print('    ' + str(feature) + ' : passed')
+
+        if self.repair and repair_feature_sum_dic:
+            common_license_db.save_utilization_day_sum(utilization_day_db_file, utilization_day_db_conn, self.sample_date, repair_feature_sum_dic)
+            print('    Repaired ' + str(len(repair_feature_sum_dic)) + ' feature(s).')
+
+        utilization_day_db_conn.close()
+
+    def run(self):
+        license_server_db_path = str(self.db_path) + '/license_server'
+
+        for license_server in sorted(os.listdir(license_server_db_path)):
+            license_server_path = str(license_server_db_path) + '/' + str(license_server)
+
+            if (not re.match(r'^\d+@\S+$', license_server)) or (not os.path.isdir(license_server_path)):
+                continue
+
+            if self.license_server_list and (license_server not in self.license_server_list):
+                continue
+
+            for vendor_daemon in sorted(os.listdir(license_server_path)):
+                vendor_daemon_path = str(license_server_path) + '/' + str(vendor_daemon)
+
+                if os.path.isdir(vendor_daemon_path):
+                    self.check_utilization_day(vendor_daemon_path)
+
+        print('')
+
+        if self.mismatch_num == 0:
+            print('Done. All of the utilization (day average) info on ' + str(self.sample_date) + ' are consistent with utilization samples.')
+        elif self.repair:
+            print('Done. ' + str(self.mismatch_num) + ' mismatched feature(s) are repaired.')
+        else:
+            print('Done. ' + str(self.mismatch_num) + ' mismatched feature(s) are found, re-run with "--repair" to fix them.')
+            sys.exit(1)
+
+
+################
+# Main Process #
+################
+def main():
+    (db_path, license_server_list, sample_date, repair) = read_args()
+    my_check_utilization_day = CheckUtilizationDay(db_path, license_server_list, sample_date, repair)
+    my_check_utilization_day.run()
+
+
+if __name__ == '__main__':
+    main()
@@ -32,6 +32,10 @@ def read_args():
     parser.add_argument('-o', '--output_file',
                         default=str(CWD) + '/feature_record_on_license_log.' + str(CURRENT_TIME) + '.yaml',
                         help='Output file, default is "<CWD>/feature_record_on_license_log.<CURRENT_TIME>.yaml".')
+    parser.add_argument('--live',
+                        action='store_true',
+                        default=False,
+                        help='Always get license info with lmstat, instead of the license snapshot published by license_sample.')
 
     args = parser.parse_args()
 
@@ -48,7 +52,7 @@ def read_args():
         common.bprint('License log configuration file "' + str(args.license_log_config_file) + '" is missing.', level='Error')
         sys.exit(1)
 
-    return args.LM_LICENSE_FILE_file, args.license_log_config_file, args.output_file
+    return args.LM_LICENSE_FILE_file, args.license_log_config_file, args.output_file, args.live
 
 
 class CollectFeatureRecord():
@@ -57,14 +61,16 @@ class CollectFeatureRecord():
     2. Get license information with "lmstat" command.
     3. Collect feature record from license log.
     """
-    def __init__(self, LM_LICENSE_FILE_file, license_log_config_file, output_file):
+    def __init__(self, LM_LICENSE_FILE_file, license_log_config_file, output_file, live=False):
         self.license_log_dic = self.parse_license_log_config_file(license_log_config_file)
         self.output_file = output_file
-        self.setenv(LM_LICENSE_FILE_file)
+        self.load_LM_LICENSE_FILE(LM_LICENSE_FILE_file)
 
         print('>>> Getting license feature list ...')
 
-        my_get_license_info = common_license.GetLicenseInfo(lmstat_path=config.lmstat_path, bsub_command=config.lmstat_bsub_command)
+        snapshot_file = '' if live else common_license.get_license_snapshot_file(config)
+        fresh_interval = config.fresh_interval if hasattr(config, 'fresh_interval') else 0
+        my_get_license_info = common_license.GetLicenseInfo(lmstat_path=config.lmstat_path, bsub_command=config.lmstat_bsub_command, license_servers=self.license_server_list, snapshot_file=snapshot_file, fresh_interval=fresh_interval)
         self.license_dic = my_get_license_info.get_license_info()
 
     def parse_license_log_config_file(self, license_log_config_file):
@@ -83,30 +89,17 @@ class CollectFeatureRecord():
 
         return license_log_dic
 
-    def setenv(self, LM_LICENSE_FILE_file):
+    def load_LM_LICENSE_FILE(self, LM_LICENSE_FILE_file):
         """
-        Setup environment variables LM_LICENSE_FILE with settings on LM_LICENSE_FILE file.
+        Get license server list (self.license_server_list) from LM_LICENSE_FILE file.
         """
-        print('>>> Setup env variable LM_LICENSE_FILE with "' + str(LM_LICENSE_FILE_file) + '"')
+        print('>>> Load license servers from "' + str(LM_LICENSE_FILE_file) + '"')
 
         if not os.path.exists(LM_LICENSE_FILE_file):
             common.bprint('"' + str(LM_LICENSE_FILE_file) + '": No such file.', level='Warning')
-            os.environ['LM_LICENSE_FILE'] = ''
+            self.license_server_list = []
         else:
-            LM_LICENSE_FILE_list = []
-
-            with open(LM_LICENSE_FILE_file, 'r') as LF:
-                for line in LF.readlines():
-                    line = line.strip()
-
-                    if re.match(r'^\s*#.*$', line) or re.match(r'^\s*$', line):
-                        continue
-                    else:
-                        if line not in LM_LICENSE_FILE_list:
-                            LM_LICENSE_FILE_list.append(line)
-
-            LM_LICENSE_FILE_string = ':'.join(LM_LICENSE_FILE_list)
-            os.environ['LM_LICENSE_FILE'] = LM_LICENSE_FILE_string
+            self.license_server_list = common_license.parse_lm_license_file(LM_LICENSE_FILE_file)
 
     def collect_feature_record_from_license_log(self, feature, license_server, license_log):
         """
@@ -196,8 +189,8 @@ class CollectFeatureRecord():
 # Main Process #
 ################
 def main():
-    (LM_LICENSE_FILE_file, license_log_config_file, output_file) = read_args()
-    my_collect_feature_record = CollectFeatureRecord(LM_LICENSE_FILE_file, license_log_config_file, output_file)
+    (LM_LICENSE_FILE_file, license_log_config_file, output_file, live) = read_args()
+    my_collect_feature_record = CollectFeatureRecord(LM_LICENSE_FILE_file, license_log_config_file, output_file, live)
     my_collect_feature_record.run()
 
 
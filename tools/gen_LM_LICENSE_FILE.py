@@ -35,6 +35,10 @@ def read_args():
     parser.add_argument('-f', '--LM_LICENSE_FILE_file',
                         default=str(CWD) + '/LM_LICENSE_FILE',
                         help='Specify output file, default is "' + str(CWD) + '/LM_LICENSE_FILE".')
+    parser.add_argument('--live',
+                        action='store_true',
+                        default=False,
+                        help='Always get license info with lmstat, instead of the license snapshot published by license_sample.')
 
     args = parser.parse_args()
 
@@ -43,10 +47,10 @@ def read_args():
             common.bprint('"' + str(args.module_files_dir) + '": No such directory.', level='Error')
             sys.exit(1)
 
-    return args.module_files_dirs, args.LM_LICENSE_FILE_file
+    return args.module_files_dirs, args.LM_LICENSE_FILE_file, args.live
 
 
-def get_LM_LICENSE_FILE_setting(module_files_dir_list):
+def get_LM_LICENSE_FILE_setting(module_files_dir_list, live=False):
     """
     Parse all fild on module files directory, get license server format string, and save them into LM_LICENSE_FILE_list.
     """
@@ -91,13 +95,16 @@ def get_LM_LICENSE_FILE_setting(module_files_dir_list):
         print('>>> Checking license server status ...')
 
         # Remove DOWN license servers.
-        os.environ['LM_LICENSE_FILE'] = ':'.join(LM_LICENSE_FILE_list)
-        my_get_license_info = common_license.GetLicenseInfo(lmstat_path=config.lmstat_path, bsub_command=config.lmstat_bsub_command)
+        snapshot_file = '' if live else common_license.get_license_snapshot_file(config)
+        fresh_interval = config.fresh_interval if hasattr(config, 'fresh_interval') else 0
+        my_get_license_info = common_license.GetLicenseInfo(lmstat_path=config.lmstat_path, bsub_command=config.lmstat_bsub_command, license_servers=LM_LICENSE_FILE_list, snapshot_file=snapshot_file, fresh_interval=fresh_interval)
         license_dic = my_get_license_info.get_license_info()
         LM_LICENSE_FILE_list = []
 
         for license_server in license_dic.keys():
-            if license_dic[license_server]['license_server_status'] == 'UP':
+            if license_dic[license_server].get('stale', False):
+                common.bprint('License server "' + str(license_server) + '" is failed on last sampling, ignore it.', level='Warning')
+            elif license_dic[license_server]['license_server_status'] == 'UP':
                 mark = False
 
                 for vendor_daemon in license_dic[license_server]['vendor_daemon'].keys():
@@ -140,8 +147,8 @@ def write_LM_LICENSE_FILE(LM_LICENSE_FILE_list, LM_LICENSE_FILE_file):
 # Main Process #
 ################
 def main():
-    (module_files_dir_list, LM_LICENSE_FILE_file) = read_args()
-    LM_LICENSE_FILE_list = get_LM_LICENSE_FILE_setting(module_files_dir_list)
+    (module_files_dir_list, LM_LICENSE_FILE_file, live) = read_args()
+    LM_LICENSE_FILE_list = get_LM_LICENSE_FILE_setting(module_files_dir_list, live)
     write_LM_LICENSE_FILE(LM_LICENSE_FILE_list, LM_LICENSE_FILE_file)
 
 
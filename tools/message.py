@@ -4,7 +4,7 @@ import sys
 import argparse
 
 from PyQt5.QtWidgets import QApplication, QMainWindow, QTabWidget, QFrame, QGridLayout, QLabel
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QEventLoop
 
 sys.path.insert(0, os.environ['LICENSE_MONITOR_INSTALL_PATH'])
 from common import common_pyqt5
@@ -35,6 +35,9 @@ def read_args():
 
 
 class ShowMessage(QMainWindow):
+    """
+    Non-modal message window, it is used by this tool and by other GUI tools on their own process (start/terminate).
+    """
     def __init__(self, title, message):
         super().__init__()
         self.title = title
@@ -72,6 +75,19 @@ class ShowMessage(QMainWindow):
         main_frame_grid.addWidget(self.message_label, 0, 0)
         self.main_frame.setLayout(main_frame_grid)
 
+    def start(self):
+        """
+        Show message window, paint it at once since the caller may block GUI thread after it.
+        """
+        self.show()
+        QApplication.processEvents(QEventLoop.ExcludeUserInputEvents)
+
+    def terminate(self):
+        """
+        Close message window.
+        """
+        self.close()
+
 
 ################
 # Main Process #
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+import os
+import re
+import sys
+import argparse
+
+sys.path.append(os.environ['LICENSE_MONITOR_INSTALL_PATH'])
+from common import common
+from common import common_sqlite3
+from common import common_license_db
+from config import config
+
+os.environ['PYTHONUNBUFFERED'] = '1'
+
+
+def read_args():
+    """
+    Read in arguments.
+    """
+    parser = argparse.ArgumentParser(description='Migrate legacy usage/utilization/utilization_day databases (one table per feature) into consolidated databases (one table per kind). It can be re-run safely, the rows which are already migrated are skipped.')
+
+    parser.add_argument('-d', '--db_path',
+                        default=config.db_path,
+                        help='Specify licenseMonitor database directory, default is "' + str(config.db_path) + '".')
+    parser.add_argument('-s', '--license_servers',
+                        nargs='+',
+                        default=[],
+                        help='Only migrate specified license server(s), format is "27020@lic_server".')
+    parser.add_argument('-k', '--kinds',
+                        nargs='+',
+                        default=common_license_db.DB_KIND_LIST,
+                        choices=common_license_db.DB_KIND_LIST,
+                        help='Only migrate specified database kind(s), default is "' + ' '.join(common_license_db.DB_KIND_LIST) + '".')
+    parser.add_argument('-c', '--chunk_size',
+                        type=int,
+                        default=10000,
+                        help='How many rows are read and written on one transaction, default is 10000.')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(str(args.db_path) + '/license_server'):
+        common.bprint('"' + str(args.db_path) + '/license_server": No such directory.', level='Error')
+        sys.exit(1)
+
+    if args.chunk_size <= 0:
+        common.bprint('"--chunk_size" must be a positive number.', level='Error')
+        sys.exit(1)
+
+    return args.db_path, args.license_servers, args.kinds, args.chunk_size
+
+
+class MigrateDbLayout():
+    """
+    Copy legacy feature tables into consolidated tables chunk by chunk.
+    """
+    def __init__(self, db_path, license_server_list, db_kind_list, chunk_size):
+        self.db_path = db_path
+        self.license_server_list = license_server_list
+        self.db_kind_list = db_kind_list
+        self.chunk_size = chunk_size
+
+        # Legacy primary key is used to read legacy table chunk by chunk.
+        self.legacy_primary_key_dic = {'usage': 'id', 'utilization': 'sample_second', 'utilization_day': 'sample_date'}
+
+    def migrate_feature_table(self, legacy_db_file, legacy_db_conn, consolidated_db_file, consolidated_db_conn, db_kind, feature):
+        """
+        Copy one legacy feature table into consolidated table, commit after every chunk.
+        """
+        primary_key = self.legacy_primary_key_dic[db_kind]
+        consolidated_key_list = common_license_db.CONSOLIDATED_TABLE_DIC[db_kind]['key_list']
+        last_value = ''
+        row_num = 0
+
+        while True:
+            if last_value == '':
+                select_condition = ''
+            elif db_kind == 'utilization_day':
+                select_condition = "WHERE " + str(primary_key) + ">'" + str(last_value) + "'"
+            else:
+                select_condition = "WHERE " + str(primary_key) + ">" + str(last_value)
+
+            select_condition = str(select_condition) + ' ORDER BY ' + str(primary_key) + ' LIMIT ' + str(self.chunk_size)
+            data_dic = common_sqlite3.get_sql_table_data(legacy_db_file, legacy_db_conn, feature, [], select_condition)
+
+            if not data_dic:
+                break
+
+            value_list_list = []
+
+            # Legacy table may be created by old version without some columns (like utilization_day running state), they are kept empty.
+            migrate_key_list = [key for key in consolidated_key_list[1:] if key in data_dic]
+
+            for i in range(len(data_dic[primary_key])):
+                if db_kind == 'usage':
+                    value_list_list.append([data_dic[key][i] for key in migrate_key_list])
+                else:
+                    value_list_list.append([feature] + [data_dic[key][i] for key in migrate_key_list])
+
+            if db_kind == 'usage':
+                common_sqlite3.upsert_into_sql_table(consolidated_db_file, consolidated_db_conn, 'usage', migrate_key_list, value_list_list, common_license_db.USAGE_CHECKOUT_KEY_LIST, ['sample_second', 'sample_time'], commit=False)
+            else:
+                common_sqlite3.insert_many_into_sql_table(consolidated_db_file, consolidated_db_conn, db_kind, ['feature'] + migrate_key_list, value_list_list, commit=False)
+
+            consolidated_db_conn.commit()
+            row_num += len(value_list_list)
+            last_value = data_dic[primary_key][-1]
+
+            if len(value_list_list) < self.chunk_size:
+                break
+
+        return row_num
+
+    def migrate_db(self, vendor_daemon_path, db_kind):
+        """
+        Migrate legacy db file into consolidated db file for specified db_kind.
+        """
+        legacy_db_file = common_license_db.get_legacy_db_file(vendor_daemon_path, db_kind)
+        consolidated_db_file = common_license_db.get_consolidated_db_file(vendor_daemon_path, db_kind)
+
+        if not os.path.exists(legacy_db_file):
+            return
+
+        print('>>> Migrating "' + str(legacy_db_file) + '" into "' + str(consolidated_db_file) + '" ...')
+
+        (legacy_result, legacy_db_conn) = common_sqlite3.connect_db_file(legacy_db_file, mode='read')
+
+        if legacy_result != 'passed':
+            return
+
+        (consolidated_result, consolidated_db_conn) = common_sqlite3.connect_db_file(consolidated_db_file, mode='write')
+
+        if consolidated_result != 'passed':
+            legacy_db_conn.close()
+            return
+
+        common_license_db.init_consolidated_db(consolidated_db_file, consolidated_db_conn, db_kind)
+        feature_list = common_license_db.get_feature_list(legacy_db_file, legacy_db_conn)
+        common_license_db.save_consolidated_feature_list(consolidated_db_file, consolidated_db_conn, feature_list)
+
+        for feature in feature_list:
+            row_num = self.migrate_feature_table(legacy_db_file, legacy_db_conn, consolidated_db_file, consolidated_db_conn, db_kind, feature)
+            print('    ' + str(feature) + ' : ' + str(row_num) + ' rows')
+
+        legacy_db_conn.close()
+        consolidated_db_conn.close()
+
+    def run(self):
+        license_server_db_path = str(self.db_path) + '/license_server'
+
+        for license_server in sorted(os.listdir(license_server_db_path)):
+            license_server_path = str(license_server_db_path) + '/' + str(license_server)
+
+            if (not re.match(r'^\d+@\S+$', license_server)) or (not os.path.isdir(license_server_path)):
+                continue
+
+            if self.license_server_list and (license_server not in self.license_server_list):
+                continue
+
+            for vendor_daemon in sorted(os.listdir(license_server_path)):
+                vendor_daemon_path = str(license_server_path) + '/' + str(vendor_daemon)
+
+                if os.path.isdir(vendor_daemon_path):
+                    for db_kind in self.db_kind_list:
+                        self.migrate_db(vendor_daemon_path, db_kind)
+
+        print('')
+        print('Done. Set db_layout = "consolidated" on config/config.py, then license_sample samples into (and licenseMonitor reads) the consolidated databases.')
+
+
+################
+# Main Process #
+################
+def main():
+    (db_path, license_server_list, db_kind_list, chunk_size) = read_args()
+    my_migrate_db_layout = MigrateDbLayout(db_path, license_server_list, db_kind_list, chunk_size)
+    my_migrate_db_layout.run()
+
+
+if __name__ == '__main__':
+    main()
@@ -2,17 +2,27 @@
 import os
 import re
 import sys
-import time
 import getpass
 import argparse
 
 from PyQt5.QtWidgets import QApplication, QWidget, QMainWindow, QFrame, QGridLayout, QTableWidget, QTableWidgetItem, QPushButton, QLabel, QLineEdit, QComboBox, QHeaderView
-from PyQt5.QtCore import Qt, QThread
+from PyQt5.QtCore import Qt
 
 sys.path.append(os.environ['LICENSE_MONITOR_INSTALL_PATH'])
 from common import common
 from common import common_pyqt5
-from config import config
+
+ShowMessage = common.load_tool_module('message').ShowMessage
+
+# Import local config file if exists (same as license_monitor, the window is also shown by license_monitor).
+local_config_dir = str(os.environ['HOME']) + '/.licenseMonitor/config'
+local_config = str(local_config_dir) + '/config.py'
+
+if os.path.exists(local_config):
+    sys.path.append(local_config_dir)
+    import config
+else:
+    from config import config
 
 os.environ['PYTHONUNBUFFERED'] = '1'
 USER = getpass.getuser()
@@ -365,24 +375,6 @@ class MainWindow(QMainWindow):
             self.status_combo.addItem(status)
 
 
-class ShowMessage(QThread):
-    """
-    Show message with tool message.
-    """
-    def __init__(self, title, message):
-        super(ShowMessage, self).__init__()
-        self.title = title
-        self.message = message
-
-    def run(self):
-        command = 'python3 ' + str(os.environ['LICENSE_MONITOR_INSTALL_PATH']) + '/tools/message.py --title "' + str(self.title) + '" --message "' + str(self.message) + '"'
-        os.system(command)
-
-    def terminate(self):
-        time.sleep(0.01)
-        QThread.terminate(self)
-
-
 #################
 # Main Function #
 #################
@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 import os
-import re
 import sys
 import yaml
 import copy
@@ -49,52 +48,44 @@ def read_args():
     parser.add_argument('-o', '--output_file',
                         default='./product_feature.' + str(CURRENT_TIME) + '.yaml',
                         help='Output file, default is "./product_feature.<CURRENT_TIME>.yaml".')
+    parser.add_argument('--live',
+                        action='store_true',
+                        default=False,
+                        help='Always get license info with lmstat, instead of the license snapshot published by license_sample.')
 
     args = parser.parse_args()
 
-    return args.LM_LICENSE_FILE_file, args.product_feature_relationship_file, args.product_format, args.incremental_mode, args.output_file
+    return args.LM_LICENSE_FILE_file, args.product_feature_relationship_file, args.product_format, args.incremental_mode, args.output_file, args.live
 
 
 class UpdateProductFeatureRelationship():
     """
     Update origianl product feature relationship file with new product feature relationship.
-    * Get LM_LICENSE_FILE from LM_LICENSE_FILE_file.
+    * Get license servers from LM_LICENSE_FILE_file.
     * Get license files information for vendors "cdslmd/snpslmd/mgcld".
     * Parse license files and get product feature relationship.
     * Update original product feature relationship file with new product feature relationship.
     """
-    def __init__(self, LM_LICENSE_FILE_file, orig_product_feature_relationship_file, product_format, incremental_mode, output_file):
+    def __init__(self, LM_LICENSE_FILE_file, orig_product_feature_relationship_file, product_format, incremental_mode, output_file, live=False):
         self.orig_product_feature_relationship_file = orig_product_feature_relationship_file
         self.product_format = product_format
         self.incremental_mode = incremental_mode
         self.output_file = output_file
+        self.live = live
 
-        self.setenv(LM_LICENSE_FILE_file)
+        self.load_LM_LICENSE_FILE(LM_LICENSE_FILE_file)
 
-    def setenv(self, LM_LICENSE_FILE_file):
+    def load_LM_LICENSE_FILE(self, LM_LICENSE_FILE_file):
         """
-        Setup environment variables LM_LICENSE_FILE with settings on LM_LICENSE_FILE file.
+        Get license server list (self.license_server_list) from LM_LICENSE_FILE file.
         """
-        print('>>> Setup Environment variable LM_LICENSE_FILE with "' + str(LM_LICENSE_FILE_file) + '"')
+        print('>>> Load license servers from "' + str(LM_LICENSE_FILE_file) + '"')
 
         if not os.path.exists(LM_LICENSE_FILE_file):
             common.bprint('"' + str(LM_LICENSE_FILE_file) + '": No such file.', level='Warning')
-            os.environ['LM_LICENSE_FILE'] = ''
+            self.license_server_list = []
         else:
-            LM_LICENSE_FILE_list = []
-
-            with open(LM_LICENSE_FILE_file, 'r') as LF:
-                for line in LF.readlines():
-                    line = line.strip()
-
-                    if re.match(r'^\s*#.*$', line) or re.match(r'^\s*$', line):
-                        continue
-                    else:
-                        if line not in LM_LICENSE_FILE_list:
-                            LM_LICENSE_FILE_list.append(line)
-
-            LM_LICENSE_FILE_string = ':'.join(LM_LICENSE_FILE_list)
-            os.environ['LM_LICENSE_FILE'] = LM_LICENSE_FILE_string
+            self.license_server_list = common_license.parse_lm_license_file(LM_LICENSE_FILE_file)
 
     def get_license_file_info(self):
         """
@@ -103,7 +94,9 @@ class UpdateProductFeatureRelationship():
         print('>>> Get vendor daemon license files information')
 
         license_file_dic = {}
-        my_get_license_info = common_license.GetLicenseInfo(lmstat_path=config.lmstat_path, bsub_command=config.lmstat_bsub_command)
+        snapshot_file = '' if self.live else common_license.get_license_snapshot_file(config)
+        fresh_interval = config.fresh_interval if hasattr(config, 'fresh_interval') else 0
+        my_get_license_info = common_license.GetLicenseInfo(lmstat_path=config.lmstat_path, bsub_command=config.lmstat_bsub_command, license_servers=self.license_server_list, snapshot_file=snapshot_file, fresh_interval=fresh_interval)
         license_dic = my_get_license_info.get_license_info()
         valid_vendor_daemon_list = ['cdslmd', 'snpslmd', 'mgcld']
 
@@ -136,7 +129,7 @@ class UpdateProductFeatureRelationship():
         Update self.orig_product_feature_relationship_file with new product feature relationship from latest license files.
         Write final product feature relationship into self.output_file.
         """
-        if os.environ['LM_LICENSE_FILE']:
+        if self.license_server_list:
             license_file_dic = self.get_license_file_info()
 
             if license_file_dic:
@@ -187,8 +180,8 @@ class UpdateProductFeatureRelationship():
 # Main Process #
 ################
 def main():
-    (LM_LICENSE_FILE_file, product_feature_relationship_file, product_format, incremental_mode, output_file) = read_args()
-    my_update_product_feature_relationship = UpdateProductFeatureRelationship(LM_LICENSE_FILE_file, product_feature_relationship_file, product_format, incremental_mode, output_file)
+    (LM_LICENSE_FILE_file, product_feature_relationship_file, product_format, incremental_mode, output_file, live) = read_args()
+    my_update_product_feature_relationship = UpdateProductFeatureRelationship(LM_LICENSE_FILE_file, product_feature_relationship_file, product_format, incremental_mode, output_file, live)
     my_update_product_feature_relationship.run()
 
 